@@ -7,7 +7,7 @@ case $1 in
     ;;
   "start")
     echo "Starting local development environment with Daphne ASGI server (WebSocket support)..."
-    docker-compose up web redis
+    docker-compose up web maintenance redis
     ;;
   "runserver")
     echo "Starting local development environment with Django runserver (no WebSocket support)..."
@@ -31,7 +31,7 @@ case $1 in
   "restart")
     echo "Restarting local development environment with Daphne..."
     docker-compose down
-    docker-compose up web redis --build
+    docker-compose up web maintenance redis --build
     ;;
   "migrate")
     echo "Running migrations..."
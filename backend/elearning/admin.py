@@ -10,6 +10,7 @@ from .models import (
     StudentRestriction,
     Notification,
     Status,
+    DeletionJob,
 )
 
 # Register your models here.
@@ -24,3 +25,4 @@ admin.site.register(CourseLesson)
 admin.site.register(StudentRestriction)
 admin.site.register(Notification)
 admin.site.register(Status)
+admin.site.register(DeletionJob)
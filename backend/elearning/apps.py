@@ -7,3 +7,7 @@ class ElearningConfig(AppConfig):
 
     def ready(self):
         import elearning.signals  # noqa F401
+        from elearning import metrics
+        from elearning.db_pool import pool_stats
+
+        metrics.register_collector("db_pools", pool_stats)
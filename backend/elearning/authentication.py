@@ -0,0 +1,132 @@
+"""
+Authentication backends for sessions and API tokens over HTTP and websockets.
+"""
+
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import AnonymousUser
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from drf_spectacular.plumbing import build_bearer_security_scheme_object
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    BaseAuthentication,
+    get_authorization_header,
+)
+
+
+# Backend path stored in sessions started by the login views
+SESSION_BACKEND = "elearning.authentication.CachedModelBackend"
+
+
+def _authenticate_token(raw_token):
+    # Imported lazily: DRF loads this module while the service layer's own
+    # imports (exceptions -> rest_framework) are still initializing
+    from elearning.services.api_token_service import APITokenService
+
+    return APITokenService.authenticate(raw_token)
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that loads session users through the shared cache.
+
+    Used for both HTTP requests and websocket handshakes, which resolve the
+    session user through the configured authentication backends.
+    """
+
+    def get_user(self, user_id):
+        from elearning.services.user_service import UserService
+
+        user = UserService.get_auth_user(user_id)
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        # ModelBackend.aget_user would query the database directly
+        return await sync_to_async(self.get_user)(user_id)
+
+
+class APITokenAuthentication(BaseAuthentication):
+    """
+    Authenticate requests with an ``Authorization: Bearer <token>`` header.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header")
+
+        try:
+            raw_token = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("Invalid token header")
+
+        result = _authenticate_token(raw_token)
+        if result is None:
+            raise exceptions.AuthenticationFailed("Invalid or expired token")
+        return result
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class APITokenAuthenticationScheme(OpenApiAuthenticationExtension):
+    target_class = "elearning.authentication.APITokenAuthentication"
+    name = "apiTokenAuth"
+
+    def get_security_definition(self, auto_schema):
+        return build_bearer_security_scheme_object(
+            header_name="Authorization", token_prefix="Bearer"
+        )
+
+
+async def aget_request_user(request):
+    """
+    Resolve the user for a plain async Django view.
+
+    Accepts the same credentials as the DRF views: a bearer API token, or
+    otherwise the session.
+    """
+    auth = get_authorization_header(request).split()
+    keyword = APITokenAuthentication.keyword.lower().encode()
+    if not auth or auth[0].lower() != keyword:
+        return await request.auser()
+
+    if len(auth) != 2:
+        return AnonymousUser()
+    try:
+        raw_token = auth[1].decode()
+    except UnicodeError:
+        return AnonymousUser()
+    result = await sync_to_async(_authenticate_token)(raw_token)
+    return result[0] if result else AnonymousUser()
+
+
+class APITokenAuthMiddleware:
+    """
+    Websocket middleware authenticating connections from ``?token=``.
+
+    Connections carrying a token never touch the session table; all others
+    fall through to the regular session based ``AuthMiddlewareStack``.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.session_auth = AuthMiddlewareStack(inner)
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get("query_string", b"").decode())
+        raw_token = (query.get("token") or [None])[0]
+        if not raw_token:
+            return await self.session_auth(scope, receive, send)
+
+        result = await database_sync_to_async(_authenticate_token)(raw_token)
+        user = result[0] if result else AnonymousUser()
+        return await self.inner(dict(scope, user=user), receive, send)
@@ -0,0 +1,102 @@
+"""
+SQLite backend with in-process write serialization.
+
+SQLite allows one writer at a time. With WAL, ``busy_timeout`` and
+``BEGIN IMMEDIATE`` (set through ``OPTIONS`` in settings) writers from
+different processes wait for each other instead of failing. Within one
+process, Daphne's threads additionally queue on a per-database lock before
+writing, so they take turns in order rather than all polling SQLite's
+lock. Reads never take the lock and stay concurrent.
+
+The lock is held from ``BEGIN`` to ``COMMIT``/``ROLLBACK`` for
+transactions, and around the statement for autocommit writes.
+"""
+
+import threading
+from collections import defaultdict
+
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+# Statements that never write, run without the writer lock
+_READ_PREFIXES = ("SELECT", "PRAGMA", "EXPLAIN")
+
+# Database NAME -> lock shared by every connection of this process
+_writer_locks = defaultdict(threading.Lock)
+_writer_locks_guard = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        options = self.settings_dict.get("OPTIONS", {})
+        self.serialize_writes = options.get("serialize_writes", True)
+        self.writer_lock_timeout = options.get("timeout", 5)
+        self.holds_writer_lock = False
+        if self.serialize_writes:
+            self.execute_wrappers.append(self._serialize_autocommit_writes)
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("serialize_writes", None)
+        return params
+
+    # --- Writer lock ---
+
+    @property
+    def writer_lock(self):
+        with _writer_locks_guard:
+            return _writer_locks[self.settings_dict["NAME"]]
+
+    def acquire_writer_lock(self):
+        if not self.serialize_writes or self.holds_writer_lock:
+            return
+        if not self.writer_lock.acquire(timeout=self.writer_lock_timeout):
+            raise OperationalError(
+                "database is locked: timed out waiting for the writer lock"
+            )
+        self.holds_writer_lock = True
+
+    def release_writer_lock(self):
+        if self.holds_writer_lock:
+            self.holds_writer_lock = False
+            self.writer_lock.release()
+
+    def _serialize_autocommit_writes(self, execute, sql, params, many, ctx):
+        if self.holds_writer_lock or sql.lstrip()[:7].upper().startswith(
+            _READ_PREFIXES
+        ):
+            return execute(sql, params, many, ctx)
+        self.acquire_writer_lock()
+        try:
+            return execute(sql, params, many, ctx)
+        finally:
+            self.release_writer_lock()
+
+    # --- Transactions ---
+
+    def _start_transaction_under_autocommit(self):
+        self.acquire_writer_lock()
+        try:
+            super()._start_transaction_under_autocommit()
+        except BaseException:
+            self.release_writer_lock()
+            raise
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self.release_writer_lock()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self.release_writer_lock()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self.release_writer_lock()
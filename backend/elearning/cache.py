@@ -0,0 +1,247 @@
+"""
+Shared cache layer for the eLearning platform.
+
+Wraps the configured Django cache (Redis in production, local memory in
+tests) with:
+- namespaced keys with a per-namespace version for bulk invalidation
+- per-object invalidation wired to model save/delete signals, repeated
+  when the writer's transaction commits
+- probabilistic early refresh (XFetch) and single-flight recomputation
+  to protect the database against cache stampedes
+- hit/miss/refresh counters published through ``elearning.metrics``
+- recomputation on the primary database, so a lagging read replica
+  can't refill a key with the data its invalidation just replaced
+
+Example:
+    >>> COURSE_STATS = CacheNamespace(
+    ...     "course_stats",
+    ...     ttl=300,
+    ...     depends_on={Enrollment: lambda e: [e.course_id]},
+    ... )
+    >>> @COURSE_STATS.cached(key=lambda course_id: course_id)
+    ... def load_course_stats(course_id):
+    ...     ...
+"""
+
+import functools
+import math
+import random
+import time
+import uuid
+from typing import Callable, Iterable, Optional
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from elearning import metrics
+from elearning.db_routing import use_primary
+
+_MISSING = object()
+
+
+class CacheNamespace:
+    """
+    A group of related cache keys sharing a TTL and invalidation rules.
+
+    Args:
+        name: Namespace prefix used in every key
+        ttl: Default time-to-live in seconds
+        depends_on: Mapping of model class to a callable returning the key
+            parts to invalidate when an instance is saved or deleted.
+            A callable returning ``None`` invalidates the whole namespace.
+        beta: XFetch aggressiveness; higher values refresh earlier
+        lock_timeout: Seconds a recomputation lock is held at most
+        lock_wait: Seconds a caller without the lock waits for a value
+        alias: Django cache alias to use
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: int = 300,
+        depends_on: Optional[dict] = None,
+        beta: float = 1.0,
+        lock_timeout: int = 10,
+        lock_wait: float = 2.0,
+        alias: str = "default",
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.beta = beta
+        self.lock_timeout = lock_timeout
+        self.lock_wait = lock_wait
+        self.alias = alias
+
+        for model, resolver in (depends_on or {}).items():
+            self._connect(model, resolver)
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    # --- Keys & versions ---
+
+    def _version_key(self) -> str:
+        return f"{self.name}:version"
+
+    def _version(self) -> int:
+        return self.backend.get_or_set(self._version_key(), 1, timeout=None)
+
+    def make_key(self, *parts) -> str:
+        """Build a versioned key for the given parts"""
+        suffix = ":".join(str(part) for part in parts)
+        return f"{self.name}:v{self._version()}:{suffix}"
+
+    # --- Invalidation ---
+
+    def invalidate(self, *parts):
+        """Drop a single entry"""
+        self.backend.delete(self.make_key(*parts))
+        metrics.increment(f"cache.{self.name}.invalidations")
+
+    def invalidate_many(self, keys: Iterable):
+        """Drop several entries, each given as a part or tuple of parts"""
+        keys = [k if isinstance(k, tuple) else (k,) for k in keys]
+        if not keys:
+            return
+        self.backend.delete_many([self.make_key(*k) for k in keys])
+        metrics.increment(f"cache.{self.name}.invalidations", len(keys))
+
+    def invalidate_all(self):
+        """Invalidate every entry by bumping the namespace version"""
+        try:
+            self.backend.incr(self._version_key())
+        except ValueError:
+            self.backend.set(self._version_key(), 2, timeout=None)
+        metrics.increment(f"cache.{self.name}.invalidations")
+
+    def _connect(self, model, resolver: Callable):
+        def receiver(sender, instance, using=None, **kwargs):
+            parts = resolver(instance)
+            if parts is None:
+                invalidate = self.invalidate_all
+            else:
+                keys = [p for p in parts if p is not None]
+
+                def invalidate():
+                    self.invalidate_many(keys)
+
+            # Drop the entries now so the writer reads its own change, and
+            # again once the transaction commits: a reader that missed in
+            # between may have refilled them from the pre-commit rows
+            invalidate()
+            transaction.on_commit(invalidate, using=using)
+
+        uid = f"cache:{self.name}:{model._meta.label}"
+        post_save.connect(
+            receiver, sender=model, weak=False, dispatch_uid=f"{uid}:save"
+        )
+        post_delete.connect(
+            receiver, sender=model, weak=False, dispatch_uid=f"{uid}:delete"
+        )
+
+    # --- Reads ---
+
+    def get(self, *parts, default=None):
+        """Return a cached value without triggering recomputation"""
+        envelope = self.backend.get(self.make_key(*parts))
+        if envelope is None:
+            return default
+        return envelope[0]
+
+    def set(self, parts: tuple, value, ttl: Optional[int] = None):
+        """Store a value, recording its compute time of zero"""
+        self._store(self.make_key(*parts), value, 0.0, ttl or self.ttl)
+
+    def _store(self, key: str, value, delta: float, ttl: int):
+        expires_at = time.time() + ttl
+        self.backend.set(key, (value, delta, expires_at), timeout=ttl)
+
+    def _should_refresh_early(self, delta: float, expires_at: float) -> bool:
+        """XFetch: refresh with rising probability as expiry approaches"""
+        if delta <= 0:
+            return False
+        jitter = -delta * self.beta * math.log(random.random() or 1e-12)
+        return time.time() + jitter >= expires_at
+
+    def get_or_set(
+        self, parts: tuple, loader: Callable, ttl: Optional[int] = None
+    ):
+        """
+        Return the cached value for ``parts``, computing it with ``loader``
+        on a miss. Only one caller recomputes a given key at a time; others
+        serve the previous value or briefly wait for the winner.
+        """
+        ttl = ttl or self.ttl
+        key = self.make_key(*parts)
+        envelope = self.backend.get(key)
+
+        if envelope is not None:
+            value, delta, expires_at = envelope
+            if not self._should_refresh_early(delta, expires_at):
+                metrics.increment(f"cache.{self.name}.hits")
+                return value
+            metrics.increment(f"cache.{self.name}.early_refreshes")
+        else:
+            metrics.increment(f"cache.{self.name}.misses")
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        if not self.backend.add(lock_key, token, timeout=self.lock_timeout):
+            # Someone else is recomputing this key
+            if envelope is not None:
+                metrics.increment(f"cache.{self.name}.stale_served")
+                return envelope[0]
+            value = self._wait_for_value(key)
+            if value is not _MISSING:
+                return value
+            metrics.increment(f"cache.{self.name}.lock_timeouts")
+            with use_primary():
+                return loader()
+
+        try:
+            started = time.monotonic()
+            with use_primary():
+                value = loader()
+            self._store(key, value, time.monotonic() - started, ttl)
+            metrics.increment(f"cache.{self.name}.recomputes")
+            return value
+        finally:
+            if self.backend.get(lock_key) == token:
+                self.backend.delete(lock_key)
+
+    def _wait_for_value(self, key: str):
+        deadline = time.monotonic() + self.lock_wait
+        sleep = 0.01
+        while time.monotonic() < deadline:
+            time.sleep(sleep)
+            sleep = min(sleep * 2, 0.2)
+            envelope = self.backend.get(key)
+            if envelope is not None:
+                metrics.increment(f"cache.{self.name}.lock_waits")
+                return envelope[0]
+        return _MISSING
+
+    # --- Declarative use ---
+
+    def cached(self, key: Callable, ttl: Optional[int] = None):
+        """
+        Decorator caching a function's result under ``key(*args, **kwargs)``.
+        The key callable may return a single part or a tuple of parts.
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                parts = key(*args, **kwargs)
+                if not isinstance(parts, tuple):
+                    parts = (parts,)
+                return self.get_or_set(
+                    parts, lambda: func(*args, **kwargs), ttl=ttl
+                )
+
+            wrapper.uncached = func
+            return wrapper
+
+        return decorator
@@ -1,5 +1,6 @@
 from .chat_consumer import ChatConsumer
 from .notification_consumer import NotificationConsumer
+from .stream_consumer import StreamConsumer
 
 
-__all__ = ["NotificationConsumer", "ChatConsumer"]
+__all__ = ["NotificationConsumer", "ChatConsumer", "StreamConsumer"]
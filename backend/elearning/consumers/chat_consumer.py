@@ -1,13 +1,30 @@
 from channels.generic.websocket import AsyncWebsocketConsumer
-from channels.db import database_sync_to_async
+from asgiref.sync import sync_to_async
 import json
-from django.core.exceptions import ObjectDoesNotExist
 
+from elearning.consumers.outbound import (
+    OutboundQueueMixin,
+    merge_presence_diff,
+)
+from elearning.consumers.relay import RoomGroupMixin
+from elearning.exceptions import ServiceError
+from elearning.services.presence_service import PresenceService
+from elearning.services.chats.chat_service import ChatService
+from elearning.services.chats.chat_ephemeral_service import (
+    ChatEphemeralService,
+)
+from elearning.services.chats.chat_websocket_service import (
+    ChatWebSocketService,
+)
 
-class ChatConsumer(AsyncWebsocketConsumer):
+
+class ChatConsumer(
+    RoomGroupMixin, OutboundQueueMixin, AsyncWebsocketConsumer
+):
     async def connect(self):
         self.chat_room_id = self.scope["url_route"]["kwargs"]["chat_room_id"]
         self.chat_group_name = f"chat_{self.chat_room_id}"
+        self.presence_tracked = False
         user = self.scope["user"]
 
         # Check if user is authenticated
@@ -15,53 +32,158 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.close(code=4001)  # Custom code for auth failure
             return
 
-        # Fetch chat room safely
+        # Fetch the room and check access in a single async query
         try:
-            chat_room = await self.get_chat_room(self.chat_room_id)
-        except ObjectDoesNotExist:
-            await self.close(code=4004)
-            return
-
-        # Check access policy
-        allowed = await self.can_access_chat(user, chat_room)
-        if not allowed:
-            await self.close(code=4003)
+            chat_room = await ChatService.aget_chat_with_permission_check(
+                self.chat_room_id, user
+            )
+        except ServiceError as e:
+            await self.close(code=4004 if e.status_code == 404 else 4003)
             return
 
         # Join chat room group
-        await self.channel_layer.group_add(
-            self.chat_group_name, self.channel_name
-        )
+        await self.join_room_group(self.chat_group_name)
         await self.accept()
 
+        # Track presence and send the current online list
+        self.user_id = user.id
+        self.chat_room_pk = chat_room.id
+        await PresenceService.connect(
+            self.chat_room_pk,
+            self.user_id,
+            self.channel_name,
+            group_name=self.chat_group_name,
+        )
+        self.presence_tracked = True
+        online = await PresenceService.aget_online_user_ids(self.chat_room_pk)
+        await self.enqueue(
+            {"type": "presence_state", "online": online},
+            policy=self.RESUME,
+        )
+
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.chat_group_name, self.channel_name
+        await self.stop_outbound()
+        await self.leave_room_group(self.chat_group_name)
+        if self.presence_tracked:
+            await PresenceService.disconnect(
+                self.chat_room_pk,
+                self.user_id,
+                self.channel_name,
+                group_name=self.chat_group_name,
+                chat_room_id=self.chat_room_pk,
+            )
+            ChatEphemeralService.forget(self.chat_room_pk, self.channel_name)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        """Handle control frames sent by the client"""
+        try:
+            data = json.loads(text_data or "")
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+
+        if data.get("type") == "heartbeat":
+            await PresenceService.heartbeat(
+                self.chat_room_pk,
+                self.user_id,
+                self.channel_name,
+                chat_room_id=self.chat_room_pk,
+            )
+            await self.send(text_data=json.dumps({"type": "heartbeat_ack"}))
+        elif data.get("type") == "resume":
+            await self.resume(data.get("last_seq"))
+        elif data.get("type") in ChatEphemeralService.EVENT_TYPES:
+            # Typing, read receipts and pings never touch the database
+            await ChatEphemeralService.publish(
+                self.chat_room_pk,
+                self.user_id,
+                data["type"],
+                data,
+                sender_channel=self.channel_name,
+            )
+
+    async def resume(self, last_seq):
+        """
+        Replay events the client missed since ``last_seq``.
+
+        Events may also arrive live while replaying; clients drop anything
+        with a sequence number they have already seen. If the gap can't be
+        replayed from the log (too large, expired, or the sequence was
+        reset), the client gets ``resync_required`` and must reload the
+        room's messages over REST. An ``?updated_since=`` delta is not
+        enough there, as it can't report deleted messages.
+        """
+        # Replayed frames queue behind live ones already waiting to be sent
+        if not isinstance(last_seq, int) or last_seq < 0:
+            await self.enqueue(
+                {"type": "error", "message": "Invalid last_seq"},
+                policy=self.RESUME,
+            )
+            return
+
+        events = await sync_to_async(ChatWebSocketService.get_events_since)(
+            self.chat_room_pk, last_seq
         )
+        current = await sync_to_async(
+            ChatWebSocketService.get_current_sequence
+        )(self.chat_room_pk)
 
-    async def chat_message(self, event):
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": event["event_type"],
-                    "message": event["message"],
-                }
+        if events is None:
+            await self.enqueue(
+                {"type": "resync_required", "seq": current},
+                policy=self.RESUME,
             )
+            return
+
+        for event in events:
+            await self.enqueue(self._chat_frame(event), policy=self.RESUME)
+        await self.enqueue(
+            {
+                "type": "resume_complete",
+                "replayed": len(events),
+                "seq": current,
+            },
+            policy=self.RESUME,
         )
 
-    # --- Async DB wrappers ---
-    @database_sync_to_async
-    def get_chat_room(self, chat_room_id):
-        from elearning.models import (
-            ChatRoom,
-        )  # Import here to avoid app not ready error
+    @staticmethod
+    def _chat_frame(event) -> dict:
+        return {
+            "type": event["event_type"],
+            "message": event["message"],
+            "seq": event.get("seq"),
+            "sent_at": event.get("sent_at"),
+        }
 
-        return ChatRoom.objects.get(id=chat_room_id)
+    # Channel layer events go through the outbound queue, so a slow client
+    # only backs up its own connection
 
-    @database_sync_to_async
-    def can_access_chat(self, user, chat_room):
-        from elearning.permissions.chats.chat_room_permissions import (
-            ChatPolicy,
-        )  # Import here to avoid app not ready error
+    async def chat_message(self, event):
+        await self.enqueue(self._chat_frame(event), policy=self.RESUME)
 
-        return ChatPolicy.check_can_access_chat_room(user, chat_room)
+    async def presence_diff(self, event):
+        online, offline = event["online"], event["offline"]
+        pending = self.pending_frame("presence")
+        if pending:
+            online, offline = merge_presence_diff(pending, online, offline)
+        await self.enqueue(
+            {"type": "presence", "online": online, "offline": offline},
+            policy=self.COALESCE,
+            key="presence",
+        )
+
+    async def ephemeral_event(self, event):
+        # Don't echo a client's own signals back to it
+        if event.get("sender_channel") == self.channel_name:
+            return
+        await self.enqueue(
+            {
+                "type": "ephemeral",
+                "event": event["event"],
+                "user_id": event["user_id"],
+                "data": event["data"],
+            },
+            policy=self.COALESCE,
+            key=(event["event"], event["user_id"]),
+        )
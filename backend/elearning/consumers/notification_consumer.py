@@ -1,15 +1,20 @@
 from channels.generic.websocket import AsyncWebsocketConsumer
 import json
 
+from elearning.consumers.outbound import OutboundQueueMixin
+from elearning.services.presence_service import PresenceService
 
-class NotificationConsumer(AsyncWebsocketConsumer):
+
+class NotificationConsumer(OutboundQueueMixin, AsyncWebsocketConsumer):
     """
     WebSocket consumer for real-time notifications.
     Each user gets their own notification room.
+    The connection also marks the user as globally online.
     """
 
     async def connect(self):
         """Handle WebSocket connection"""
+        self.presence_tracked = False
         try:
             # Get user from scope (should be authenticated via
             # AuthMiddlewareStack)
@@ -30,6 +35,11 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
             await self.accept()
 
+            await PresenceService.connect(
+                PresenceService.GLOBAL_ROOM, self.user_id, self.channel_name
+            )
+            self.presence_tracked = True
+
             # Send connection confirmation
             await self.send(
                 text_data=json.dumps(
@@ -48,19 +58,39 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection"""
+        await self.stop_outbound()
         if hasattr(self, "room_group_name"):
             await self.channel_layer.group_discard(
                 self.room_group_name, self.channel_name
             )
+        if self.presence_tracked:
+            await PresenceService.disconnect(
+                PresenceService.GLOBAL_ROOM, self.user_id, self.channel_name
+            )
+
+    async def receive(self, text_data=None, bytes_data=None):
+        """Handle heartbeat frames keeping the user marked online"""
+        try:
+            data = json.loads(text_data or "")
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+
+        if data.get("type") == "heartbeat":
+            await PresenceService.heartbeat(
+                PresenceService.GLOBAL_ROOM, self.user_id, self.channel_name
+            )
+            await self.send(text_data=json.dumps({"type": "heartbeat_ack"}))
 
     async def notification_message(self, event):
         """
         Handle notification messages sent to the group.
         This method is called when a notification is created.
         """
-        # Send notification to WebSocket
-        await self.send(
-            text_data=json.dumps(
-                {"type": "notification", "notification": event["message"]}
-            )
+        # Queued for the socket; a client too slow to keep up is told to
+        # reload its notifications over REST
+        await self.enqueue(
+            {"type": "notification", "notification": event["message"]},
+            policy=self.RESUME,
         )
@@ -0,0 +1,174 @@
+import asyncio
+import itertools
+import json
+import time
+
+from django.conf import settings
+
+from elearning import metrics
+
+
+class OutboundQueueMixin:
+    """
+    Bounded per-connection outbound queue for websocket consumers.
+
+    Channel layer handlers enqueue frames and return immediately, and a
+    writer task sends them in order, so a slow client backs up its own
+    queue instead of the channel layer. Each frame has a drop policy used
+    once the queue holds ``WEBSOCKET_OUTBOUND_QUEUE_SIZE`` frames:
+
+    - ``COALESCE``: a pending frame with the same key is replaced in place,
+      otherwise the frame is treated like ``DROP_OLDEST``
+    - ``DROP_OLDEST``: the oldest droppable frame is discarded
+    - ``RESUME``: the frame must not be lost. If nothing droppable is
+      left, the queue is cleared, the client gets a ``slow_consumer``
+      frame with the last sequence numbers it received, and the socket is
+      closed with code 4008 so it reconnects and resumes.
+
+    Frames whose order matters relative to queued ones (state snapshots,
+    replays) must also be sent with ``enqueue`` rather than ``send``.
+    Consumers call ``stop_outbound`` from ``disconnect``.
+    """
+
+    COALESCE = "coalesce"
+    DROP_OLDEST = "drop_oldest"
+    RESUME = "resume"
+
+    SLOW_CONSUMER_CLOSE_CODE = 4008
+
+    # Frames queued across every consumer class in this process
+    _queued_total = 0
+    _ids = itertools.count()
+
+    def _outbound_state(self):
+        if not hasattr(self, "_outbound"):
+            # key -> (policy, content)
+            self._outbound = {}
+            self._outbound_ready = asyncio.Event()
+            self._outbound_task = None
+            self._outbound_closing = False
+            self._outbound_slow = False
+            # stream (None for single-stream sockets) -> last sent seq
+            self.delivered_seqs = {}
+        return self._outbound
+
+    @staticmethod
+    def _track_queued(delta: int):
+        # Assigning through a subclass would give it its own subtotal
+        OutboundQueueMixin._queued_total += delta
+        metrics.set_gauge(
+            "websocket.outbound_queued", OutboundQueueMixin._queued_total
+        )
+
+    async def enqueue(self, content: dict, policy=DROP_OLDEST, key=None):
+        """Queue a JSON frame for sending, applying its drop policy"""
+        queue = self._outbound_state()
+        if self._outbound_closing:
+            return
+
+        if policy == self.COALESCE and key is not None:
+            key = ("coalesce", key)
+            if key in queue:
+                queue[key] = (policy, content)
+                metrics.increment("websocket.frames_coalesced")
+                return
+        else:
+            key = next(self._ids)
+
+        max_size = settings.WEBSOCKET_OUTBOUND_QUEUE_SIZE
+        if len(queue) >= max_size and not self._evict_oldest(queue):
+            if policy != self.RESUME:
+                metrics.increment("websocket.frames_dropped")
+                return
+            self._close_slow_consumer(queue)
+            return
+
+        queue[key] = (policy, content)
+        self._track_queued(1)
+        metrics.increment("websocket.frames_queued")
+        if not self._outbound_slow and len(queue) > max_size // 2:
+            self._outbound_slow = True
+            metrics.increment("websocket.slow_clients")
+
+        self._outbound_ready.set()
+        if self._outbound_task is None:
+            self._outbound_task = asyncio.ensure_future(self._drain_outbound())
+
+    def _evict_oldest(self, queue) -> bool:
+        for key, (policy, _) in queue.items():
+            if policy != self.RESUME:
+                del queue[key]
+                self._track_queued(-1)
+                metrics.increment("websocket.frames_dropped")
+                return True
+        return False
+
+    def _close_slow_consumer(self, queue):
+        self._track_queued(-len(queue))
+        queue.clear()
+        self._outbound_closing = True
+        metrics.increment("websocket.slow_disconnects")
+
+        hint = {"type": "slow_consumer"}
+        if None in self.delivered_seqs:
+            hint["last_seq"] = self.delivered_seqs[None]
+        streams = {
+            stream: seq
+            for stream, seq in self.delivered_seqs.items()
+            if stream is not None
+        }
+        if streams:
+            hint["last_seq_by_stream"] = streams
+        queue["slow_consumer"] = (self.RESUME, hint)
+        self._track_queued(1)
+        self._outbound_ready.set()
+
+    async def _drain_outbound(self):
+        queue = self._outbound
+        slow_send = settings.WEBSOCKET_SLOW_SEND_SECONDS
+        while True:
+            await self._outbound_ready.wait()
+            while queue:
+                key = next(iter(queue))
+                _, content = queue.pop(key)
+                self._track_queued(-1)
+
+                started = time.monotonic()
+                await self.send(text_data=json.dumps(content))
+                if time.monotonic() - started > slow_send:
+                    metrics.increment("websocket.slow_sends")
+                if content.get("seq") is not None:
+                    self.delivered_seqs[content.get("stream")] = content["seq"]
+
+            self._outbound_ready.clear()
+            if self._outbound_closing:
+                await self.close(code=self.SLOW_CONSUMER_CLOSE_CODE)
+                return
+            if self._outbound_slow and len(queue) == 0:
+                self._outbound_slow = False
+
+    async def stop_outbound(self):
+        """Stop the writer task and drop anything queued now or later"""
+        queue = self._outbound_state()
+        self._outbound_closing = True
+        task, self._outbound_task = self._outbound_task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._track_queued(-len(queue))
+        queue.clear()
+
+    def pending_frame(self, key):
+        """Get the queued frame for a coalesce key, if any"""
+        entry = self._outbound_state().get(("coalesce", key))
+        return entry[1] if entry else None
+
+
+def merge_presence_diff(pending: dict, online, offline) -> tuple[list, list]:
+    """Fold a newer presence diff into one still waiting to be sent"""
+    merged_online = (set(pending["online"]) - set(offline)) | set(online)
+    merged_offline = (set(pending["offline"]) - set(online)) | set(offline)
+    return sorted(merged_online), sorted(merged_offline)
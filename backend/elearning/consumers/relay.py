@@ -0,0 +1,168 @@
+import asyncio
+import functools
+import logging
+
+from channels.consumer import get_handler_name
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from elearning import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class _RelayRoom:
+    def __init__(self):
+        self.members = set()
+        self.channel = None
+        self.task = None
+        self.ready = None
+
+
+class RoomRelay:
+    """
+    Per-process fan-out for chat room groups.
+
+    Instead of every consumer joining the room's channel layer group, the
+    first consumer in this process to join a room opens a single relay
+    channel and adds it to the group. Events arriving on it are handed to
+    every consumer in this process attached to the room. A ``group_send``
+    then costs one channel layer message per worker process in the room
+    rather than one per member.
+    """
+
+    # Backoff between failed channel layer receives
+    RETRY_DELAY = 0.1
+    MAX_RETRY_DELAY = 5.0
+
+    def __init__(self):
+        # group name -> _RelayRoom
+        self.rooms = {}
+
+    async def join(self, group_name: str, consumer):
+        room = self.rooms.get(group_name)
+        if room is None:
+            room = _RelayRoom()
+            self.rooms[group_name] = room
+            room.ready = asyncio.ensure_future(self._open(group_name, room))
+            metrics.set_gauge("relay.rooms", len(self.rooms))
+        room.members.add(consumer)
+        await room.ready
+
+    async def leave(self, group_name: str, consumer):
+        room = self.rooms.get(group_name)
+        if room is None:
+            return
+        room.members.discard(consumer)
+        try:
+            await room.ready
+        except Exception:
+            # _open already tore the room down
+            return
+        if room.members or self.rooms.get(group_name) is not room:
+            return
+        await self._close(group_name, room)
+
+    def member_count(self, group_name: str) -> int:
+        room = self.rooms.get(group_name)
+        return len(room.members) if room else 0
+
+    async def _open(self, group_name: str, room: _RelayRoom):
+        channel_layer = get_channel_layer()
+        try:
+            room.channel = await channel_layer.new_channel("relay.")
+            await channel_layer.group_add(group_name, room.channel)
+        except Exception:
+            # Don't leave a half-open room behind for the next join
+            logger.exception("Relay for %s failed to open", group_name)
+            metrics.increment("relay.open_errors")
+            await self._close(group_name, room)
+            raise
+        room.task = asyncio.ensure_future(self._pump(group_name, room))
+        room.task.add_done_callback(
+            functools.partial(self._pump_done, group_name, room)
+        )
+
+    async def _close(self, group_name: str, room: _RelayRoom):
+        """Unregister ``room`` and take its channel out of the group"""
+        if self.rooms.get(group_name) is room:
+            del self.rooms[group_name]
+            metrics.set_gauge("relay.rooms", len(self.rooms))
+        if room.task is not None:
+            room.task.cancel()
+        if room.channel is None:
+            return
+        try:
+            await get_channel_layer().group_discard(group_name, room.channel)
+        except Exception:
+            logger.exception("Relay for %s failed to leave", group_name)
+
+    def _pump_done(self, group_name: str, room: _RelayRoom, task):
+        if task.cancelled() or self.rooms.get(group_name) is not room:
+            return
+        # The pump only stops on errors it can't retry; drop the room so
+        # the next join opens a fresh one
+        logger.error(
+            "Relay for %s stopped", group_name, exc_info=task.exception()
+        )
+        metrics.increment("relay.pump_failures")
+        asyncio.ensure_future(self._close(group_name, room))
+
+    async def _pump(self, group_name: str, room: _RelayRoom):
+        channel_layer = get_channel_layer()
+        delay = self.RETRY_DELAY
+        while True:
+            try:
+                message = await channel_layer.receive(room.channel)
+            except Exception:
+                logger.exception("Relay for %s failed to receive", group_name)
+                metrics.increment("relay.receive_errors")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RETRY_DELAY)
+                continue
+            delay = self.RETRY_DELAY
+            metrics.increment("relay.messages_received")
+            try:
+                handler_name = get_handler_name(message)
+            except ValueError:
+                metrics.increment("relay.handler_errors")
+                continue
+            for consumer in list(room.members):
+                handler = getattr(consumer, handler_name, None)
+                if handler is None:
+                    continue
+                try:
+                    # Handlers only enqueue onto the consumer's outbound
+                    # queue, so one slow socket can't hold up the room
+                    await handler(message)
+                except Exception:
+                    metrics.increment("relay.handler_errors")
+            metrics.increment("relay.local_deliveries", len(room.members))
+
+
+relay = RoomRelay()
+
+
+class RoomGroupMixin:
+    """
+    Join and leave chat room groups directly or through the process relay,
+    depending on ``CHAT_RELAY_ENABLED``.
+    """
+
+    async def join_room_group(self, group_name: str):
+        if not hasattr(self, "relayed_groups"):
+            self.relayed_groups = set()
+        if settings.CHAT_RELAY_ENABLED:
+            self.relayed_groups.add(group_name)
+            await relay.join(group_name, self)
+        else:
+            await self.channel_layer.group_add(group_name, self.channel_name)
+
+    async def leave_room_group(self, group_name: str):
+        if group_name in getattr(self, "relayed_groups", ()):
+            self.relayed_groups.discard(group_name)
+            await relay.leave(group_name, self)
+        else:
+            await self.channel_layer.group_discard(
+                group_name, self.channel_name
+            )
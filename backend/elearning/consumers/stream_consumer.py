@@ -0,0 +1,336 @@
+from channels.generic.websocket import AsyncWebsocketConsumer
+from asgiref.sync import sync_to_async
+from django.conf import settings
+import json
+
+from elearning import metrics
+from elearning.consumers.outbound import (
+    OutboundQueueMixin,
+    merge_presence_diff,
+)
+from elearning.consumers.relay import RoomGroupMixin
+from elearning.exceptions import ServiceError
+from elearning.services.presence_service import PresenceService
+from elearning.services.chats.chat_service import ChatService
+from elearning.services.chats.chat_ephemeral_service import (
+    ChatEphemeralService,
+)
+from elearning.services.chats.chat_websocket_service import (
+    ChatWebSocketService,
+)
+
+
+class StreamConsumer(
+    RoomGroupMixin, OutboundQueueMixin, AsyncWebsocketConsumer
+):
+    """
+    Multiplexed WebSocket consumer for chats and notifications.
+
+    One authenticated socket per client replaces the notification socket
+    and the per-room chat sockets. Clients send control frames naming a
+    stream, either ``"notifications"`` or ``"chat:<room id>"``:
+
+    - ``{"type": "subscribe", "stream": ...}``
+    - ``{"type": "unsubscribe", "stream": ...}``
+    - ``{"type": "heartbeat"}`` refreshes presence on every subscription
+    - ``{"type": "resume", "stream": "chat:<id>", "last_seq": n}``
+    - ephemeral chat events (typing, read receipts) with a ``stream``
+
+    Access is checked per subscription. Every server frame for a stream
+    carries its ``stream`` name. All server frames go through the
+    outbound queue; a ``slow_consumer`` frame lists the last ``seq`` sent
+    per chat stream.
+    """
+
+    NOTIFICATIONS = "notifications"
+    CHAT_PREFIX = "chat:"
+
+    async def connect(self):
+        self.user = self.scope.get("user")
+        # stream name -> channel layer group name
+        self.subscriptions = {}
+
+        if not self.user or not self.user.is_authenticated:
+            await self.close(code=4001)  # Custom code for auth failure
+            return
+
+        await self.accept()
+        metrics.increment("stream.connections")
+        await self.send_json(
+            {"type": "connection.established", "user_id": self.user.id}
+        )
+
+    async def disconnect(self, close_code):
+        await self.stop_outbound()
+        for stream in list(self.subscriptions):
+            await self.unsubscribe(stream)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        """Dispatch control frames sent by the client"""
+        try:
+            data = json.loads(text_data or "")
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+
+        frame_type = data.get("type")
+        stream = data.get("stream")
+        if frame_type == "subscribe":
+            await self.subscribe(stream)
+        elif frame_type == "unsubscribe":
+            if stream in self.subscriptions:
+                await self.unsubscribe(stream)
+            await self.send_json({"type": "unsubscribed", "stream": stream})
+        elif frame_type == "heartbeat":
+            await self.heartbeat()
+        elif frame_type == "resume":
+            room_id = self._subscribed_room(stream)
+            if room_id is None:
+                await self.send_error(stream, "Not subscribed")
+                return
+            await self.resume(stream, room_id, data.get("last_seq"))
+        elif frame_type in ChatEphemeralService.EVENT_TYPES:
+            room_id = self._subscribed_room(stream)
+            if room_id is None:
+                await self.send_error(stream, "Not subscribed")
+                return
+            # Typing, read receipts and pings never touch the database
+            await ChatEphemeralService.publish(
+                room_id,
+                self.user.id,
+                frame_type,
+                data,
+                sender_channel=self.channel_name,
+            )
+
+    # --- Subscriptions ---
+
+    def _parse_room(self, stream):
+        """Get the room id of a chat stream name, or None"""
+        if not isinstance(stream, str) or not stream.startswith(
+            self.CHAT_PREFIX
+        ):
+            return None
+        room_id = stream[len(self.CHAT_PREFIX) :]
+        # Only canonical ASCII ids, so each room has exactly one stream
+        # name and a subscription is keyed on its room alone
+        if not (room_id.isascii() and room_id.isdecimal()):
+            return None
+        if len(room_id) > 1 and room_id.startswith("0"):
+            return None
+        return int(room_id)
+
+    def _subscribed_room(self, stream):
+        if stream not in self.subscriptions:
+            return None
+        return self._parse_room(stream)
+
+    async def subscribe(self, stream):
+        if stream in self.subscriptions:
+            await self.send_json({"type": "subscribed", "stream": stream})
+            return
+        if len(self.subscriptions) >= settings.STREAM_MAX_SUBSCRIPTIONS:
+            await self.send_error(stream, "Too many subscriptions")
+            return
+
+        if stream == self.NOTIFICATIONS:
+            group_name = f"notifications_{self.user.id}"
+            await self.channel_layer.group_add(group_name, self.channel_name)
+            self.subscriptions[stream] = group_name
+            await PresenceService.connect(
+                PresenceService.GLOBAL_ROOM, self.user.id, self.channel_name
+            )
+            await self.send_json({"type": "subscribed", "stream": stream})
+            return
+
+        room_id = self._parse_room(stream)
+        if room_id is None:
+            await self.send_error(stream, "Unknown stream")
+            return
+        try:
+            chat_room = await ChatService.aget_chat_with_permission_check(
+                room_id, self.user
+            )
+        except ServiceError as e:
+            await self.send_error(stream, e.message, code=e.status_code)
+            return
+
+        group_name = f"chat_{chat_room.id}"
+        await self.join_room_group(group_name)
+        self.subscriptions[stream] = group_name
+        await PresenceService.connect(
+            chat_room.id,
+            self.user.id,
+            self.channel_name,
+            group_name=group_name,
+        )
+        online = await PresenceService.aget_online_user_ids(chat_room.id)
+        await self.send_json(
+            {"type": "subscribed", "stream": stream, "online": online}
+        )
+
+    async def unsubscribe(self, stream):
+        group_name = self.subscriptions.pop(stream)
+        room_id = self._parse_room(stream)
+        if room_id is None:
+            await self.channel_layer.group_discard(
+                group_name, self.channel_name
+            )
+            await PresenceService.disconnect(
+                PresenceService.GLOBAL_ROOM, self.user.id, self.channel_name
+            )
+            return
+        await self.leave_room_group(group_name)
+        await PresenceService.disconnect(
+            room_id,
+            self.user.id,
+            self.channel_name,
+            group_name=group_name,
+            chat_room_id=room_id,
+        )
+        ChatEphemeralService.forget(room_id, self.channel_name)
+
+    async def heartbeat(self):
+        for stream in self.subscriptions:
+            room_id = self._parse_room(stream)
+            if room_id is None:
+                await PresenceService.heartbeat(
+                    PresenceService.GLOBAL_ROOM,
+                    self.user.id,
+                    self.channel_name,
+                )
+            else:
+                await PresenceService.heartbeat(
+                    room_id,
+                    self.user.id,
+                    self.channel_name,
+                    chat_room_id=room_id,
+                )
+        await self.send_json({"type": "heartbeat_ack"})
+
+    async def resume(self, stream, room_id, last_seq):
+        """
+        Replay chat events missed since ``last_seq``.
+
+        Same semantics as the ``resume`` frame of ``ws/chat/<id>/``.
+        """
+        if not isinstance(last_seq, int) or last_seq < 0:
+            await self.send_error(stream, "Invalid last_seq")
+            return
+
+        events = await sync_to_async(ChatWebSocketService.get_events_since)(
+            room_id, last_seq
+        )
+        current = await sync_to_async(
+            ChatWebSocketService.get_current_sequence
+        )(room_id)
+
+        if events is None:
+            await self.send_json(
+                {"type": "resync_required", "stream": stream, "seq": current}
+            )
+            return
+
+        for event in events:
+            await self.send_json(self._chat_frame(stream, event))
+        await self.send_json(
+            {
+                "type": "resume_complete",
+                "stream": stream,
+                "replayed": len(events),
+                "seq": current,
+            }
+        )
+
+    # --- Outgoing frames ---
+
+    async def send_json(self, content):
+        # Control frames and replays stay in order with queued events
+        await self.enqueue(content, policy=self.RESUME)
+
+    async def send_error(self, stream, message, code=400):
+        await self.send_json(
+            {
+                "type": "error",
+                "stream": stream,
+                "code": code,
+                "message": message,
+            }
+        )
+
+    def _stream_for_group(self, group_name):
+        for stream, subscribed_group in self.subscriptions.items():
+            if subscribed_group == group_name:
+                return stream
+        return None
+
+    @staticmethod
+    def _chat_frame(stream, event) -> dict:
+        return {
+            "type": event["event_type"],
+            "stream": stream,
+            "message": event["message"],
+            "seq": event.get("seq"),
+            "sent_at": event.get("sent_at"),
+        }
+
+    # --- Channel layer handlers ---
+
+    async def chat_message(self, event):
+        stream = self._stream_for_group(event.get("group"))
+        if stream is not None:
+            await self.enqueue(
+                self._chat_frame(stream, event), policy=self.RESUME
+            )
+
+    async def presence_diff(self, event):
+        stream = self._stream_for_group(event.get("group"))
+        if stream is None:
+            return
+        online, offline = event["online"], event["offline"]
+        key = ("presence", stream)
+        pending = self.pending_frame(key)
+        if pending:
+            online, offline = merge_presence_diff(pending, online, offline)
+        await self.enqueue(
+            {
+                "type": "presence",
+                "stream": stream,
+                "online": online,
+                "offline": offline,
+            },
+            policy=self.COALESCE,
+            key=key,
+        )
+
+    async def ephemeral_event(self, event):
+        # Don't echo a client's own signals back to it
+        if event.get("sender_channel") == self.channel_name:
+            return
+        stream = self._stream_for_group(event.get("group"))
+        if stream is None:
+            return
+        await self.enqueue(
+            {
+                "type": "ephemeral",
+                "stream": stream,
+                "event": event["event"],
+                "user_id": event["user_id"],
+                "data": event["data"],
+            },
+            policy=self.COALESCE,
+            key=(stream, event["event"], event["user_id"]),
+        )
+
+    async def notification_message(self, event):
+        if self.NOTIFICATIONS not in self.subscriptions:
+            return
+        await self.enqueue(
+            {
+                "type": "notification",
+                "stream": self.NOTIFICATIONS,
+                "notification": event["message"],
+            },
+            policy=self.RESUME,
+        )
@@ -0,0 +1,36 @@
+"""
+Database connection pool statistics.
+
+On PostgreSQL every alias with ``OPTIONS["pool"]`` is served from a
+psycopg ``ConnectionPool``: checking a connection out replaces opening
+one, so the open/close Django does around each request and each
+``database_sync_to_async`` call in consumers stays cheap. ``pool_stats``
+reports each pool's size and its checkout, wait and timeout counters and
+is registered as the ``db_pools`` metrics collector.
+"""
+
+from django.db import connections
+
+
+def pool_stats() -> dict:
+    """Get usage stats of every pooled database alias"""
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            continue
+        raw = pool.get_stats()
+        stats[alias] = {
+            "size": raw.get("pool_size", 0),
+            "available": raw.get("pool_available", 0),
+            "max_size": raw.get("pool_max", 0),
+            "waiting": raw.get("requests_waiting", 0),
+            "checkouts": raw.get("requests_num", 0),
+            "waits": raw.get("requests_queued", 0),
+            "wait_ms": raw.get("requests_wait_ms", 0),
+            "timeouts": raw.get("requests_errors", 0),
+            "bad_returns": raw.get("returns_bad", 0),
+            "connections_opened": raw.get("connections_num", 0),
+            "connections_lost": raw.get("connections_lost", 0),
+        }
+    return stats
@@ -0,0 +1,133 @@
+"""
+Read-replica routing for the eLearning platform.
+
+When ``DATABASES`` has a ``DATABASE_REPLICA_ALIAS`` entry (configured from
+``DATABASE_REPLICA_URL``), read-heavy viewsets can opt in to serving
+their safe (GET/HEAD/OPTIONS) requests from it:
+- ``ReplicaRouter`` sends reads to the replica while ``use_replica()`` is
+  active in the current context, and all writes to ``default``
+- ``ReplicaReadMixin`` wraps a viewset's safe requests in ``use_replica()``
+- ``ReplicaStickinessMiddleware`` gives a client that just wrote a short
+  lived cookie; while it is present that client reads from ``default``,
+  so it always sees its own writes despite replication lag
+
+Without a replica alias every helper is a no-op and all queries go to
+``default``. Locally the replica can be a copy of the SQLite file or a
+second Postgres database fed by logical replication.
+
+Example:
+    >>> class CourseViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    ...     ...
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+# Whether reads in this context may go to the replica
+_reading_from_replica = ContextVar("reading_from_replica", default=False)
+# Whether this context's client wrote recently and must read its writes
+_pinned_to_primary = ContextVar("pinned_to_primary", default=False)
+
+
+def replica_alias():
+    """Get the configured replica alias, or None if there is no replica"""
+    alias = settings.DATABASE_REPLICA_ALIAS
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def use_replica():
+    """Send reads in this block to the replica, unless pinned"""
+    token = _reading_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _reading_from_replica.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Send reads in this block to ``default``, e.g. to refill a cache"""
+    token = _reading_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _reading_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Route reads to the replica inside ``use_replica()`` blocks"""
+
+    def db_for_read(self, model, **hints):
+        if _reading_from_replica.get() and not _pinned_to_primary.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        aliases = {"default", replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Serve a viewset's safe requests from the replica.
+
+    ``replica_actions`` limits this to some actions (e.g. ``{"list"}``);
+    by default every safe request is served from the replica.
+    """
+
+    replica_actions = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and (
+            self.replica_actions is None
+            or getattr(self, "action", None) in self.replica_actions
+        ):
+            # Reset in finalize_response, which always runs after the
+            # handler, even when it raises
+            self._replica_token = _reading_from_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            _reading_from_replica.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pin a client to ``default`` for ``REPLICA_STICKY_SECONDS`` after a
+    successful write, using the ``REPLICA_STICKY_COOKIE`` cookie.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        cookie = settings.REPLICA_STICKY_COOKIE
+        token = _pinned_to_primary.set(cookie in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pinned_to_primary.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                cookie,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
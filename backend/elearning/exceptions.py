@@ -33,6 +33,11 @@ class ServiceError(Exception):
         """Create a conflict error (409)"""
         return cls(message, status_code=409)
 
+    @classmethod
+    def unavailable(cls, message="Service temporarily unavailable"):
+        """Create a service unavailable error (503)"""
+        return cls(message, status_code=503, code="service_unavailable")
+
 
 def custom_exception_handler(exc, context):
     """Custom exception handler to handle ServiceError and common exceptions"""
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...services.chats import ChatArchiveService
+
+
+class Command(BaseCommand):
+    help = (
+        "Move chat messages older than CHAT_ARCHIVE_AFTER_DAYS into the "
+        "archive table, one small transaction per batch. Safe to run "
+        "repeatedly; history reads page across both tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            help="Minimum message age (default CHAT_ARCHIVE_AFTER_DAYS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Messages per batch (default CHAT_ARCHIVE_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this many batches",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches to limit load",
+        )
+
+    def handle(self, *args, **options):
+        def on_batch(archived):
+            if options["verbosity"] >= 2:
+                self.stdout.write(f"  archived {archived} messages")
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        started = time.monotonic()
+        total = ChatArchiveService.archive(
+            older_than_days=options["older_than_days"],
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+            on_batch=on_batch,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {total} messages in "
+                f"{time.monotonic() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,96 @@
+import asyncio
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+
+from ...models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare latency of the sync DRF read endpoints with their async "
+        "counterparts under concurrent load, through the ASGI handler"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username", required=True, help="User to authenticate as"
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument(
+            "--chat-room", type=int, help="Chat room id to benchmark"
+        )
+        parser.add_argument(
+            "--course", type=int, help="Course id to benchmark"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' not found")
+
+        pairs = [("notifications", "/api/notifications/")]
+        if options["chat_room"]:
+            pairs.append(
+                (
+                    "chat messages",
+                    f"/api/chats/{options['chat_room']}/messages/",
+                )
+            )
+        if options["course"]:
+            pairs.append(
+                ("course detail", f"/api/courses/{options['course']}/")
+            )
+
+        # The in-process client always sends Host: testserver
+        hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+        with override_settings(ALLOWED_HOSTS=hosts):
+            asyncio.run(self._run(user, pairs, options))
+
+    async def _run(self, user, pairs, options):
+        client = AsyncClient()
+        await client.aforce_login(user)
+
+        self.stdout.write(
+            f"{'endpoint':<16}{'mode':<7}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'req/s':>9}"
+        )
+        for label, path in pairs:
+            async_path = "/api/async/" + path[len("/api/") :]
+            for mode, url in (("sync", path), ("async", async_path)):
+                latencies, elapsed = await self._load(client, url, options)
+                latencies.sort()
+                p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+                self.stdout.write(
+                    f"{label:<16}{mode:<7}"
+                    f"{statistics.median(latencies) * 1000:>9.1f}"
+                    f"{p95 * 1000:>9.1f}"
+                    f"{len(latencies) / elapsed:>9.0f}"
+                )
+
+    async def _load(self, client, url, options):
+        semaphore = asyncio.Semaphore(options["concurrency"])
+        latencies = []
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise CommandError(
+                        f"GET {url} returned {response.status_code}"
+                    )
+
+        # Warm caches and connections before measuring
+        await one()
+        latencies.clear()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(options["requests"])))
+        return latencies, time.perf_counter() - started
@@ -0,0 +1,112 @@
+import asyncio
+import time
+import uuid
+
+from channels.layers import get_channel_layer
+from django.core.management.base import BaseCommand
+
+from ...consumers.relay import RoomRelay
+
+
+class _Member:
+    """Stands in for a consumer attached to the room"""
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.received = 0
+        self.done = asyncio.Event()
+
+    async def chat_message(self, event):
+        self.received += 1
+        if self.received >= self.expected:
+            self.done.set()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare direct group fan-out with per-process relay fan-out for "
+        "one large chat room on the configured channel layer. Worker "
+        "processes are simulated in this process, one relay each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--members", type=int, default=2000)
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--messages", type=int, default=50)
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options))
+
+    async def _run(self, options):
+        self.stdout.write(
+            f"{'mode':<8}{'members':>9}{'layer msgs':>12}{'ms':>10}"
+            f"{'events/s':>12}"
+        )
+        for mode in ("direct", "relay"):
+            layer_messages, elapsed = await getattr(self, f"_{mode}")(
+                options
+            )
+            delivered = options["members"] * options["messages"]
+            self.stdout.write(
+                f"{mode:<8}{options['members']:>9}{layer_messages:>12}"
+                f"{elapsed * 1000:>10.0f}{delivered / elapsed:>12.0f}"
+            )
+
+    async def _send(self, group_name, members, options):
+        channel_layer = get_channel_layer()
+        started = time.perf_counter()
+        for i in range(options["messages"]):
+            await channel_layer.group_send(
+                group_name,
+                {"type": "chat_message", "group": group_name, "seq": i},
+            )
+        await asyncio.gather(*(member.done.wait() for member in members))
+        return time.perf_counter() - started
+
+    async def _direct(self, options):
+        """Every member channel joins the group, as without the relay"""
+        channel_layer = get_channel_layer()
+        group_name = f"bench_{uuid.uuid4().hex}"
+        members = [
+            _Member(options["messages"]) for _ in range(options["members"])
+        ]
+        channels = []
+        for _ in members:
+            channel = await channel_layer.new_channel()
+            await channel_layer.group_add(group_name, channel)
+            channels.append(channel)
+
+        async def pump(channel, member):
+            while not member.done.is_set():
+                message = await channel_layer.receive(channel)
+                await member.chat_message(message)
+
+        tasks = [
+            asyncio.ensure_future(pump(channel, member))
+            for channel, member in zip(channels, members)
+        ]
+        try:
+            elapsed = await self._send(group_name, members, options)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for channel in channels:
+                await channel_layer.group_discard(group_name, channel)
+        return len(channels) * options["messages"], elapsed
+
+    async def _relay(self, options):
+        """Members are spread across workers, each with one relay channel"""
+        group_name = f"bench_{uuid.uuid4().hex}"
+        relays = [RoomRelay() for _ in range(options["workers"])]
+        members = [
+            _Member(options["messages"]) for _ in range(options["members"])
+        ]
+        for i, member in enumerate(members):
+            await relays[i % len(relays)].join(group_name, member)
+
+        try:
+            elapsed = await self._send(group_name, members, options)
+        finally:
+            for i, member in enumerate(members):
+                await relays[i % len(relays)].leave(group_name, member)
+        return len(relays) * options["messages"], elapsed
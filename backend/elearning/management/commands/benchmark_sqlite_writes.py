@@ -0,0 +1,175 @@
+import os
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.db.utils import load_backend
+
+
+@contextmanager
+def _transaction(connection):
+    """transaction.atomic() for a connection outside ``connections``"""
+    connection.set_autocommit(
+        False, force_begin_transaction_with_broken_autocommit=True
+    )
+    try:
+        yield
+    except BaseException:
+        connection.rollback()
+        raise
+    else:
+        connection.commit()
+    finally:
+        connection.set_autocommit(True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress a scratch SQLite file with concurrent writer and reader "
+        "threads using the configured SQLite settings, and report the "
+        "achieved write rate, latency and 'database is locked' errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument(
+            "--rate", type=int, default=200, help="Target writes per second"
+        )
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument(
+            "--stock",
+            action="store_true",
+            help="Use Django's stock SQLite backend and options to compare",
+        )
+
+    def handle(self, *args, **options):
+        default = connections["default"].settings_dict
+        if "sqlite3" not in default["ENGINE"]:
+            raise CommandError("The default database is not SQLite")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            settings_dict = {
+                **default,
+                "NAME": os.path.join(tmp, "benchmark.sqlite3"),
+            }
+            if options["stock"]:
+                settings_dict["ENGINE"] = "django.db.backends.sqlite3"
+                settings_dict["OPTIONS"] = {}
+            stats = self._run(settings_dict, options)
+
+        latencies = sorted(stats["latencies"]) or [0]
+        self.stdout.write(
+            f"{settings_dict['ENGINE']}: {stats['committed']} writes in "
+            f"{options['seconds']:.1f}s "
+            f"({stats['committed'] / options['seconds']:.0f}/s, target "
+            f"{options['rate']}/s), {stats['reads']} reads"
+        )
+        self.stdout.write(
+            f"write latency p50 {statistics.median(latencies) * 1000:.1f}ms "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms"
+        )
+        style = self.style.ERROR if stats["locked"] else self.style.SUCCESS
+        self.stdout.write(style(f"{stats['locked']} lock errors"))
+
+    def _run(self, settings_dict, options):
+        backend = load_backend(settings_dict["ENGINE"])
+
+        def connect():
+            # Each thread gets its own connection, as under Daphne
+            return backend.DatabaseWrapper(settings_dict, alias="benchmark")
+
+        setup = connect()
+        with setup.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE counters (id INTEGER PRIMARY KEY, value INT)"
+            )
+            cursor.execute(
+                "CREATE TABLE events (id INTEGER PRIMARY KEY, worker INT, "
+                "value INT)"
+            )
+            cursor.execute("INSERT INTO counters (id, value) VALUES (1, 0)")
+        setup.close()
+
+        stats = {"committed": 0, "reads": 0, "locked": 0, "latencies": []}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options["seconds"]
+        interval = options["writers"] / options["rate"]
+
+        def count_error(error):
+            if "locked" not in str(error):
+                raise error
+            with lock:
+                stats["locked"] += 1
+
+        def writer(worker):
+            connection = connect()
+            next_at = time.monotonic()
+            try:
+                while next_at < deadline:
+                    time.sleep(max(0, next_at - time.monotonic()))
+                    next_at += interval
+                    started = time.monotonic()
+                    try:
+                        # Read-then-write, the pattern that deadlocks
+                        # under deferred transactions
+                        with _transaction(connection):
+                            with connection.cursor() as cursor:
+                                cursor.execute(
+                                    "SELECT value FROM counters WHERE id = 1"
+                                )
+                                value = cursor.fetchone()[0]
+                                cursor.execute(
+                                    "UPDATE counters SET value = %s "
+                                    "WHERE id = 1",
+                                    [value + 1],
+                                )
+                                cursor.execute(
+                                    "INSERT INTO events (worker, value) "
+                                    "VALUES (%s, %s)",
+                                    [worker, value + 1],
+                                )
+                    except OperationalError as e:
+                        count_error(e)
+                        continue
+                    with lock:
+                        stats["committed"] += 1
+                        stats["latencies"].append(
+                            time.monotonic() - started
+                        )
+            finally:
+                connection.close()
+
+        def reader():
+            connection = connect()
+            try:
+                while time.monotonic() < deadline:
+                    try:
+                        with connection.cursor() as cursor:
+                            cursor.execute("SELECT COUNT(*) FROM events")
+                            cursor.fetchone()
+                    except OperationalError as e:
+                        count_error(e)
+                        continue
+                    with lock:
+                        stats["reads"] += 1
+                    time.sleep(0.001)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=writer, args=(i,))
+            for i in range(options["writers"])
+        ]
+        threads += [
+            threading.Thread(target=reader) for _ in range(options["readers"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats
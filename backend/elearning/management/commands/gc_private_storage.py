@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...services import StorageGCService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete private course files that no File row references and that "
+        "are older than the grace period. Runs incrementally: with "
+        "--max-files the sweep stops early and the next run resumes from "
+        "the saved checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report orphaned files without deleting them",
+        )
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            help="Minimum file age (default STORAGE_GC_GRACE_SECONDS)",
+        )
+        parser.add_argument(
+            "--max-files",
+            type=int,
+            help="Stop after scanning about this many files",
+        )
+        parser.add_argument(
+            "--reset-checkpoint",
+            action="store_true",
+            help="Start a new pass from the top of the tree",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset_checkpoint"]:
+            StorageGCService.save_checkpoint(None)
+
+        resumed_from = StorageGCService.load_checkpoint()
+        if resumed_from:
+            self.stdout.write(f"Resuming after {'/'.join(resumed_from)}/")
+
+        def on_orphan(name, size, deleted):
+            if options["verbosity"] >= 2:
+                action = "deleted" if deleted else "would delete"
+                self.stdout.write(f"  {action} {name} ({size} bytes)")
+
+        grace_hours = options["grace_hours"]
+        started = time.monotonic()
+        stats = StorageGCService.sweep(
+            dry_run=options["dry_run"],
+            grace_seconds=None if grace_hours is None else grace_hours * 3600,
+            max_files=options["max_files"],
+            on_orphan=on_orphan,
+        )
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            f"Scanned {stats['scanned']} files in {stats['directories']} "
+            f"directories in {time.monotonic() - started:.1f}s: "
+            f"{stats['live']} live, {stats['recent']} within grace period"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {stats['orphaned']} orphaned files "
+                f"({stats['orphaned_bytes']} bytes)"
+            )
+        )
+        if not stats["complete"]:
+            self.stdout.write("Stopped early; run again to continue")
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services import NotificationService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete notifications past the retention policy: older than "
+        "NOTIFICATION_MAX_AGE_DAYS, or beyond each user's newest "
+        "NOTIFICATION_MAX_PER_USER. Unread notifications are kept unless "
+        "--include-unread is given. Deletes in bounded primary key batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age-days",
+            type=int,
+            help="Maximum age (default NOTIFICATION_MAX_AGE_DAYS)",
+        )
+        parser.add_argument(
+            "--max-per-user",
+            type=int,
+            help="Notifications kept per user "
+            "(default NOTIFICATION_MAX_PER_USER)",
+        )
+        parser.add_argument(
+            "--include-unread",
+            action="store_true",
+            help="Also prune unread notifications",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Rows per delete (default NOTIFICATION_PRUNE_BATCH_SIZE)",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("max_age_days", "max_per_user"):
+            if options[name] is not None and options[name] < 0:
+                raise CommandError(
+                    f"--{name.replace('_', '-')} must not be negative"
+                )
+
+        started = time.monotonic()
+        stats = NotificationService.prune_notifications(
+            max_age_days=options["max_age_days"],
+            max_per_user=options["max_per_user"],
+            keep_unread=False if options["include_unread"] else None,
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Pruned {stats['expired'] + stats['over_limit']} "
+                f"notifications in {time.monotonic() - started:.1f}s: "
+                f"{stats['expired']} expired, {stats['over_limit']} over "
+                "the per-user limit"
+            )
+        )
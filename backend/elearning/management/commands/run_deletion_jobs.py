@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...services import DeletionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued deletion jobs for courses, chat rooms and users. "
+        "Dependents are removed in chunks; interrupted jobs resume at the "
+        "step they reached."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows deleted per transaction (default DELETION_CHUNK_SIZE)",
+        )
+        parser.add_argument(
+            "--max-jobs", type=int, help="Stop after this many jobs"
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Re-queue failed jobs before starting",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between chunks to ease database load",
+        )
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            retried = DeletionService.retry_failed_jobs()
+            self.stdout.write(f"Re-queued {retried} failed job(s)")
+
+        def on_progress(job):
+            if options["verbosity"] >= 2:
+                self.stdout.write(
+                    f"  job {job.pk} step {job.step}: {job.progress}"
+                )
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        finished = 0
+        while options["max_jobs"] is None or finished < options["max_jobs"]:
+            job = DeletionService.claim_next_job()
+            if job is None:
+                break
+
+            self.stdout.write(
+                f"Deleting {job.target_type} {job.target_id} (job {job.pk})"
+            )
+            started = time.monotonic()
+            try:
+                DeletionService.run_job(
+                    job,
+                    chunk_size=options["chunk_size"],
+                    on_progress=on_progress,
+                )
+            except Exception as e:
+                self.stderr.write(f"  job {job.pk} failed: {e}")
+            else:
+                removed = sum(job.progress.values())
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"  removed {removed} rows in "
+                        f"{time.monotonic() - started:.1f}s: {job.progress}"
+                    )
+                )
+            finished += 1
+
+        self.stdout.write(f"Processed {finished} job(s)")
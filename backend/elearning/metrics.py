@@ -0,0 +1,64 @@
+"""
+In-process metrics registry.
+
+Counters and gauges are kept per worker process and exposed through the
+metrics endpoint. Subsystems that own their own statistics (connection
+pools, caches) can register a collector that is called on every snapshot.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Callable
+
+_lock = threading.Lock()
+_counters: dict[str, int] = defaultdict(int)
+_gauges: dict[str, float] = {}
+_collectors: dict[str, Callable[[], dict]] = {}
+
+
+def increment(name: str, amount: int = 1):
+    """Increase a counter by ``amount``"""
+    with _lock:
+        _counters[name] += amount
+
+
+def set_gauge(name: str, value: float):
+    """Set a gauge to an absolute value"""
+    with _lock:
+        _gauges[name] = value
+
+
+def register_collector(name: str, collector: Callable[[], dict]):
+    """Register a callable returning extra stats for every snapshot"""
+    with _lock:
+        _collectors[name] = collector
+
+
+def get_counter(name: str) -> int:
+    """Return the current value of a counter"""
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot() -> dict:
+    """Return a point-in-time copy of all metrics"""
+    with _lock:
+        data = {
+            "counters": dict(sorted(_counters.items())),
+            "gauges": dict(sorted(_gauges.items())),
+        }
+        collectors = dict(_collectors)
+
+    for name, collector in collectors.items():
+        try:
+            data[name] = collector()
+        except Exception as e:
+            data[name] = {"error": str(e)}
+    return data
+
+
+def reset():
+    """Clear counters and gauges (used by tests)"""
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:34
+
+import elearning.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elearning', '0029_soft_delete_and_deletion_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='file',
+            name='file',
+            field=models.FileField(db_index=True, storage=elearning.storage.PrivateCourseStorage(), upload_to='course_materials/%Y/%m/%d'),
+        ),
+    ]
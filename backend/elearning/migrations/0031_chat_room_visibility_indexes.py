@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-19 05:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('elearning', '0030_file_path_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatparticipant',
+            index=models.Index(fields=['user', 'is_active', 'chat_room'], name='chat_partic_user_id_233562_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatroom',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['is_public'], name='chat_rooms_public_idx'),
+        ),
+    ]
@@ -42,6 +42,13 @@ class User(AbstractUser):
         db_table = "users"
 
 
+class SoftDeleteManager(models.Manager):
+    """Default manager hiding rows waiting for background deletion"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Course(models.Model):
     """
     Model for courses.
@@ -55,6 +62,22 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
+    # Set when the course is hidden and queued for deletion
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so cache invalidation can reach a replaced teacher
+        instance._loaded_teacher_id = instance.__dict__.get("teacher_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_teacher_id = self.teacher_id
 
     def __str__(self):
         return self.title
@@ -68,7 +91,10 @@ class File(models.Model):
     """Simple file model for course materials"""
 
     file = models.FileField(
-        storage=PrivateCourseStorage(), upload_to="course_materials/%Y/%m/%d"
+        storage=PrivateCourseStorage(),
+        upload_to="course_materials/%Y/%m/%d",
+        # Storage GC looks up live files by directory prefix
+        db_index=True,
     )
     original_name = models.CharField(max_length=255)
     is_previewable = models.BooleanField(default=False)
@@ -243,6 +269,11 @@ class ChatRoom(models.Model):
     is_public = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set when the room is hidden and queued for deletion
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.name + " (" + self.get_chat_type_display() + ")"
@@ -256,6 +287,14 @@ class ChatRoom(models.Model):
                 name="unique_course_chat_type",
             )
         ]
+        indexes = [
+            # Public branch of the visible-room union; few rooms are public
+            models.Index(
+                fields=["is_public"],
+                condition=models.Q(is_public=True),
+                name="chat_rooms_public_idx",
+            ),
+        ]
 
 
 class ChatMessage(models.Model):
@@ -283,6 +322,35 @@ class ChatMessage(models.Model):
         ]
 
 
+class ArchivedChatMessage(models.Model):
+    """
+    Model for chat messages moved out of ``chat_messages`` by
+    ``archive_chat_messages``. Rows keep their original ids and are
+    read-only; history reads page across both tables.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    chat_room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE)
+    sender = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    content = models.TextField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        sender_name = self.sender.username if self.sender else "Deleted User"
+        return f"{sender_name} in {self.chat_room.name} (archived)"
+
+    class Meta:
+        db_table = "chat_messages_archive"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["chat_room", "created_at"]),
+        ]
+
+
 class ChatParticipant(models.Model):
     """
     Model for chat participants.
@@ -322,6 +390,8 @@ class ChatParticipant(models.Model):
         indexes = [
             # Only index for active participant filtering
             models.Index(fields=["chat_room", "is_active"]),
+            # A user's active rooms, answered from the index alone
+            models.Index(fields=["user", "is_active", "chat_room"]),
         ]
 
 
@@ -373,3 +443,87 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=["user", "is_read", "created_at"]),
         ]
+
+
+class APIToken(models.Model):
+    """
+    API token for programmatic access.
+
+    Only a SHA-256 digest of the secret is stored; the plain token is shown
+    once on creation. ``prefix`` keeps the first characters so users can
+    tell their tokens apart.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="api_tokens"
+    )
+    name = models.CharField(max_length=100, blank=True)
+    prefix = models.CharField(max_length=8)
+    token_hash = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user.username}: {self.prefix}..."
+
+    class Meta:
+        db_table = "api_tokens"
+        ordering = ["-created_at"]
+
+
+class DeletionJob(models.Model):
+    """
+    Background cascade deletion of a course, chat room or user.
+
+    The target is hidden when the job is created (``deleted_at`` or, for
+    users, ``is_active``) and its dependents are removed in chunks by the
+    ``run_deletion_jobs`` command. ``step`` and ``progress`` record how
+    far the job got, so an interrupted job resumes where it stopped.
+    """
+
+    TARGET_CHOICES = [
+        ("course", "Course"),
+        ("chat_room", "Chat room"),
+        ("user", "User"),
+    ]
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    target_type = models.CharField(max_length=10, choices=TARGET_CHOICES)
+    target_id = models.BigIntegerField()
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default="pending"
+    )
+    step = models.PositiveIntegerField(default=0)
+    # Rows removed so far, by step label
+    progress = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Delete {self.target_type} {self.target_id} ({self.status})"
+
+    class Meta:
+        db_table = "deletion_jobs"
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
@@ -5,6 +5,7 @@ This module contains permission classes that control access to chat
 room operations including creation, access, and modification.
 """
 
+from django.db.models import Exists, OuterRef, Value
 from rest_framework.permissions import BasePermission
 from elearning.models import ChatRoom, ChatParticipant, User, Course
 from elearning.exceptions import ServiceError
@@ -102,6 +103,68 @@ class ChatPolicy:
             raise ServiceError.permission_denied(error_msg)
         return False
 
+    @staticmethod
+    def annotate_access(queryset, user: User):
+        """
+        Annotate chat rooms with the facts acheck_can_access_chat_room needs
+        for ``user``, so a room can be fetched and checked in one query.
+        """
+        if not user.is_authenticated:
+            return queryset
+        return queryset.annotate(
+            _access_user_id=Value(user.id),
+            _is_active_participant=Exists(
+                ChatParticipant.objects.filter(
+                    chat_room=OuterRef("pk"), user=user, is_active=True
+                )
+            ),
+            _is_course_teacher=Exists(
+                Course.objects.filter(pk=OuterRef("course_id"), teacher=user)
+            ),
+        )
+
+    @staticmethod
+    async def acheck_can_access_chat_room(
+        user: User,
+        chat_room: ChatRoom,
+        raise_exception=False,
+    ) -> bool:
+        """
+        Async version of check_can_access_chat_room.
+
+        Uses the annotations from annotate_access when the room was loaded
+        for the same user, otherwise queries with the async ORM.
+        """
+        if chat_room.is_public:
+            return True
+
+        if not user.is_authenticated:
+            error_msg = "You must be logged in to access private chat rooms"
+            if raise_exception:
+                raise ServiceError.permission_denied(error_msg)
+            return False
+
+        if getattr(chat_room, "_access_user_id", None) == user.id:
+            is_participant = chat_room._is_active_participant
+            is_course_teacher = chat_room._is_course_teacher
+        else:
+            is_participant = await chat_room.participants.filter(
+                user=user, is_active=True
+            ).aexists()
+            is_course_teacher = bool(chat_room.course_id) and (
+                await Course.objects.filter(
+                    id=chat_room.course_id, teacher=user
+                ).aexists()
+            )
+
+        if is_participant or is_course_teacher:
+            return True
+
+        error_msg = "You do not have access to this chat room"
+        if raise_exception:
+            raise ServiceError.permission_denied(error_msg)
+        return False
+
     @staticmethod
     def check_can_modify_chat_room(
         user: User,
@@ -4,6 +4,8 @@ from .user_serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
     UserUpdateSerializer,
+    APITokenReadOnlySerializer,
+    APITokenCreateSerializer,
 )
 from .status_serializers import (
     StatusReadOnlySerializer,
@@ -26,4 +28,6 @@ __all__ = [
     "UserRegistrationSerializer",
     "UserLoginSerializer",
     "UserUpdateSerializer",
+    "APITokenReadOnlySerializer",
+    "APITokenCreateSerializer",
 ]
@@ -6,19 +6,31 @@ course lessons with proper validation and file handling.
 """
 
 from typing import Optional
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
 from elearning.models import CourseLesson, File
+from elearning.services.courses import CourseLessonService
 import base64
 from django.utils import timezone
 
 
 class FileSerializer(serializers.ModelSerializer):
     """
-    Serializer for handling file metadata and inline content.
+    Serializer for file metadata.
+
+    Lesson detail only returns metadata and URLs; file bytes are fetched
+    from ``download_url``, a signed link that expires after
+    ``FILE_DOWNLOAD_TOKEN_TTL`` seconds. Inline base64 content is opt-in
+    with ``?include_content=true`` and limited to previewable files no
+    larger than ``LESSON_INLINE_CONTENT_MAX_BYTES``.
     """
 
     download_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
     file_content = serializers.SerializerMethodField()
+    size = serializers.SerializerMethodField()
+    mime_type = serializers.CharField(read_only=True)
 
     class Meta:
         model = File
@@ -27,41 +39,53 @@ class FileSerializer(serializers.ModelSerializer):
             "file_content",
             "original_name",
             "is_previewable",
+            "mime_type",
+            "size",
             "download_url",
+            "preview_url",
         ]
         read_only_fields = fields
 
     def get_download_url(self, obj) -> Optional[str]:
         request = self.context.get("request")
-        if not request:
+        if not request or not obj.file:
             return None
 
-        if obj.lessons.exists():
-            lesson = obj.lessons.first()
-            course_id = lesson.course.id
-            lesson_id = lesson.id
-            download_path = (
-                f"/api/courses/{course_id}/lessons/{lesson_id}/download/"
-            )
-            return request.build_absolute_uri(download_path)
-        return None
+        # Serializing the file implies the lesson permission check passed
+        token = CourseLessonService.create_file_download_token(obj)
+        download_path = reverse(
+            "elearning:signed-file-download", kwargs={"token": token}
+        )
+        return request.build_absolute_uri(download_path)
+
+    def get_preview_url(self, obj) -> Optional[str]:
+        if not obj.is_previewable:
+            return None
+        download_url = self.get_download_url(obj)
+        return f"{download_url}?inline=1" if download_url else None
+
+    def get_size(self, obj) -> Optional[int]:
+        try:
+            return obj.file.size if obj.file else None
+        except (IOError, OSError):
+            return None
 
     def get_file_content(self, obj) -> Optional[str]:
-        if obj.file:
-            try:
-                # if file is a path, open it and return the content
-                if hasattr(obj.file, "path"):
-                    with open(obj.file.path, "rb") as f:
-                        return base64.b64encode(f.read()).decode("utf-8")
-                # if file is a file object, read it and return the content
-                elif hasattr(obj.file, "read"):
-                    content = obj.file.read()
-                    if hasattr(obj.file, "seek"):
-                        obj.file.seek(0)
-                    return base64.b64encode(content).decode("utf-8")
-            except (IOError, OSError):
-                return None
-        return None
+        request = self.context.get("request")
+        if not request or not obj.file or not obj.is_previewable:
+            return None
+        if request.query_params.get("include_content") != "true":
+            return None
+
+        max_bytes = settings.LESSON_INLINE_CONTENT_MAX_BYTES
+        size = self.get_size(obj)
+        if size is None or size > max_bytes:
+            return None
+        try:
+            with obj.file.open("rb") as f:
+                return base64.b64encode(f.read(max_bytes)).decode("utf-8")
+        except (IOError, OSError):
+            return None
 
 
 class CourseLessonReadOnlySerializer(serializers.ModelSerializer):
@@ -69,7 +93,7 @@ class CourseLessonReadOnlySerializer(serializers.ModelSerializer):
     Read only serializer for detail view
     """
 
-    file = FileSerializer(read_only=True)
+    file = FileSerializer(read_only=True, allow_null=True)
 
     class Meta:
         model = CourseLesson
@@ -86,16 +110,6 @@ class CourseLessonReadOnlySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        if instance.file:
-            # Use the file serializer with request context
-            file_serializer = FileSerializer(
-                instance.file, context=self.context
-            )
-            data["file"] = file_serializer.data
-        return data
-
 
 class CourseLessonListReadOnlySerializer(CourseLessonReadOnlySerializer):
     """
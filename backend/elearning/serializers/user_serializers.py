@@ -5,7 +5,7 @@ This module contains serializers for user registration, authentication,
 and profile management with proper validation and data handling.
 """
 
-from ..models import User
+from ..models import APIToken, User
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 
@@ -135,3 +135,34 @@ class UserUpdateSerializer(serializers.ModelSerializer):
         if value:
             validate_password(value)
         return value
+
+
+class APITokenReadOnlySerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for API tokens. Never exposes the secret.
+    """
+
+    class Meta:
+        model = APIToken
+        fields = [
+            "id",
+            "name",
+            "prefix",
+            "created_at",
+            "expires_at",
+            "last_used_at",
+        ]
+        read_only_fields = fields
+
+
+class APITokenCreateSerializer(serializers.Serializer):
+    """
+    Serializer for creating an API token.
+    """
+
+    name = serializers.CharField(
+        max_length=100, required=False, allow_blank=True, default=""
+    )
+    expires_in_days = serializers.IntegerField(
+        required=False, allow_null=True, min_value=1, max_value=365
+    )
@@ -5,14 +5,24 @@ This package contains all business logic services organized by domain:
 - courses: Course, enrollment, lesson, and restriction services
 - chats: Chat room, message, and participant services
 - users: User management and profile services
-- notifications: Notification and messaging services
+- notifications: Notification, messaging and retention pruning services
 - status: User status update services
+- presence: Online presence tracking for websocket connections
+- api tokens: API token issuance and verification
+- auth: Async login and registration with off-loop password hashing
+- deletion: Soft delete and chunked background cascade deletion
+- storage gc: Sweeping of unreferenced private course files
 """
 
 # Import all service classes for easy access
 from .user_service import UserService
 from .notification_service import NotificationService
 from .status_service import StatusService
+from .presence_service import PresenceService
+from .api_token_service import APITokenService
+from .auth_service import AuthService
+from .deletion_service import DeletionService
+from .storage_gc_service import StorageGCService
 
 __all__ = [
     # User services
@@ -20,4 +30,9 @@ __all__ = [
     # Other services
     "NotificationService",
     "StatusService",
+    "PresenceService",
+    "APITokenService",
+    "AuthService",
+    "DeletionService",
+    "StorageGCService",
 ]
@@ -0,0 +1,199 @@
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from elearning import metrics
+from elearning.cache import CacheNamespace
+from elearning.exceptions import ServiceError
+from elearning.models import APIToken, User
+from elearning.services.user_service import UserService
+
+# token digest -> (token_id, user_id, expires_ts); unknown tokens aren't
+# stored, so random guesses can't fill the shared cache
+API_TOKEN_CACHE = CacheNamespace(
+    "api_tokens",
+    ttl=300,
+    depends_on={APIToken: lambda token: [token.token_hash]},
+)
+
+
+class _VerifiedTokens:
+    """
+    Small per-process LRU of recently verified tokens, so hot clients skip
+    the shared token cache and the ``last_used_at`` write. Only ids are
+    kept; the user is loaded per request, so no instance is shared
+    between requests and deactivation applies at once.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # digest -> (token_id, user_id, expires_ts, cached_until)
+        self.entries = OrderedDict()
+
+    def get(self, digest):
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is None:
+                return None
+            if entry[3] <= time.monotonic():
+                del self.entries[digest]
+                return None
+            self.entries.move_to_end(digest)
+            return entry
+
+    def put(self, digest, token_id, user_id, expires_ts):
+        ttl = settings.API_TOKEN_LOCAL_CACHE_TTL
+        max_size = settings.API_TOKEN_LOCAL_CACHE_SIZE
+        with self.lock:
+            self.entries[digest] = (
+                token_id,
+                user_id,
+                expires_ts,
+                time.monotonic() + ttl,
+            )
+            self.entries.move_to_end(digest)
+            while len(self.entries) > max_size:
+                self.entries.popitem(last=False)
+
+    def discard(self, digest):
+        with self.lock:
+            self.entries.pop(digest, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_verified = _VerifiedTokens()
+
+
+class APITokenService:
+    """
+    Service for API token issuance, verification and revocation.
+
+    Tokens are random secrets stored as SHA-256 digests, so verifying one
+    costs a single hash instead of a full password hash. Verification goes
+    through a per-process cache (``API_TOKEN_LOCAL_CACHE_TTL`` seconds) and
+    then the shared cache before reaching the database. A revoked token may
+    keep working on other workers until their local entry expires.
+    """
+
+    PREFIX_LENGTH = 8
+
+    @staticmethod
+    def hash_token(raw_token: str) -> str:
+        return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def create_token(
+        user: User, name: str = "", expires_in_days: int = None
+    ) -> tuple[APIToken, str]:
+        """
+        Create a new API token for a user.
+
+        Returns:
+            Tuple of (token object, plain token). The plain token can't be
+            recovered later.
+        """
+        raw_token = secrets.token_urlsafe(32)
+        expires_at = None
+        if expires_in_days:
+            expires_at = timezone.now() + timedelta(days=expires_in_days)
+
+        token = APIToken.objects.create(
+            user=user,
+            name=name,
+            prefix=raw_token[: APITokenService.PREFIX_LENGTH],
+            token_hash=APITokenService.hash_token(raw_token),
+            expires_at=expires_at,
+        )
+        return token, raw_token
+
+    @staticmethod
+    def get_user_tokens(user: User):
+        """Get a user's tokens that are not revoked"""
+        return APIToken.objects.filter(user=user, revoked_at__isnull=True)
+
+    @staticmethod
+    def revoke_token(user: User, token_id: int) -> APIToken:
+        """Revoke one of the user's tokens"""
+        try:
+            token = APIToken.objects.get(
+                id=token_id, user=user, revoked_at__isnull=True
+            )
+        except APIToken.DoesNotExist:
+            raise ServiceError.not_found("Token not found")
+
+        token.revoked_at = timezone.now()
+        # Saving drops the shared cache entry through the model signal
+        token.save(update_fields=["revoked_at"])
+        _verified.discard(token.token_hash)
+        return token
+
+    @staticmethod
+    def _load_token(digest: str):
+        token = (
+            APIToken.objects.filter(token_hash=digest, revoked_at__isnull=True)
+            .values_list("id", "user_id", "expires_at")
+            .first()
+        )
+        if token is None:
+            return None
+        token_id, user_id, expires_at = token
+        expires_ts = expires_at.timestamp() if expires_at else None
+        return token_id, user_id, expires_ts
+
+    @staticmethod
+    def authenticate(raw_token: str):
+        """
+        Resolve a plain token to its active user.
+
+        Returns:
+            Tuple of (user, token id), or None if the token is unknown,
+            revoked, expired or belongs to an inactive user
+        """
+        digest = APITokenService.hash_token(raw_token)
+        now = time.time()
+
+        entry = _verified.get(digest)
+        if entry is not None:
+            token_id, user_id, expires_ts, _ = entry
+            if expires_ts is not None and expires_ts <= now:
+                _verified.discard(digest)
+                return None
+            metrics.increment("api_tokens.local_hits")
+            user = UserService.get_auth_user(user_id)
+            if user is None or not user.is_active:
+                _verified.discard(digest)
+                return None
+            return user, token_id
+
+        cached = API_TOKEN_CACHE.get(digest)
+        if cached is None:
+            cached = APITokenService._load_token(digest)
+            if cached is not None:
+                API_TOKEN_CACHE.set((digest,), cached)
+        if cached is None:
+            metrics.increment("api_tokens.rejected")
+            return None
+        token_id, user_id, expires_ts = cached
+        if expires_ts is not None and expires_ts <= now:
+            metrics.increment("api_tokens.rejected")
+            return None
+
+        user = UserService.get_auth_user(user_id)
+        if user is None or not user.is_active:
+            return None
+
+        # Written at most once per local cache period per worker
+        APIToken.objects.filter(pk=token_id).update(
+            last_used_at=timezone.now()
+        )
+        _verified.put(digest, token_id, user_id, expires_ts)
+        return user, token_id
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import alogin
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import IntegrityError, transaction
+
+from elearning import metrics
+from elearning.authentication import SESSION_BACKEND
+from elearning.exceptions import ServiceError
+from elearning.models import User
+from elearning.services.user_service import UserService
+
+
+class _HashingPool:
+    """
+    Bounded thread pool for password hashing.
+
+    hashlib releases the GIL while deriving keys, so threads hash in
+    parallel without tying up the event loop or Django's sync thread.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor = None
+        self.slots = None
+        self.in_flight = 0
+
+    def acquire(self) -> bool:
+        with self.lock:
+            if self.executor is None:
+                workers = settings.PASSWORD_HASH_WORKERS
+                queue = settings.PASSWORD_HASH_QUEUE
+                self.executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="password-hash"
+                )
+                self.slots = threading.BoundedSemaphore(workers + queue)
+            if not self.slots.acquire(blocking=False):
+                return False
+            self.in_flight += 1
+        metrics.set_gauge("auth.hashing_in_flight", self.in_flight)
+        return True
+
+    def release(self, _future=None):
+        with self.lock:
+            self.in_flight -= 1
+            self.slots.release()
+        metrics.set_gauge("auth.hashing_in_flight", self.in_flight)
+
+
+_pool = _HashingPool()
+
+
+def _verify_password(raw_password: str, encoded: str):
+    """Check a password, re-hashing it if the preferred hasher changed"""
+    rehashed = []
+    is_correct = check_password(
+        raw_password,
+        encoded,
+        setter=lambda raw: rehashed.append(make_password(raw)),
+    )
+    return is_correct, (rehashed[0] if rehashed else None)
+
+
+def _insert_user(user: User):
+    # A savepoint keeps a duplicate from breaking an enclosing transaction
+    with transaction.atomic():
+        user.save(force_insert=True)
+
+
+class AuthService:
+    """
+    Service for async login and registration.
+
+    Password hashing runs on a bounded thread pool. When every worker is
+    busy and ``PASSWORD_HASH_QUEUE`` more calls are waiting, new calls are
+    rejected with a 503 instead of piling up, and a call that doesn't finish
+    within ``PASSWORD_HASH_TIMEOUT`` seconds fails the same way.
+    """
+
+    @staticmethod
+    async def run_hashing(func, *args):
+        """Run a password hashing function on the hashing pool"""
+        if not _pool.acquire():
+            metrics.increment("auth.hashing_rejected")
+            raise ServiceError.unavailable(
+                "Too many authentication requests, please retry shortly"
+            )
+
+        # The slot is held until the thread finishes, even after a timeout
+        future = _pool.executor.submit(func, *args)
+        future.add_done_callback(_pool.release)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=settings.PASSWORD_HASH_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            metrics.increment("auth.hashing_timeouts")
+            raise ServiceError.unavailable(
+                "Authentication timed out, please retry shortly"
+            )
+
+    @staticmethod
+    async def aauthenticate(email: str, password: str) -> User:
+        """
+        Verify credentials, upgrading the stored hash when the preferred
+        password hasher has changed.
+        """
+        user = await User.objects.filter(email=email).afirst()
+        if user is None:
+            # Hash anyway so unknown emails take as long as wrong passwords
+            await AuthService.run_hashing(make_password, password)
+            raise ServiceError("User does not exist", code="unknown_email")
+
+        is_correct, rehashed = await AuthService.run_hashing(
+            _verify_password, password, user.password
+        )
+        if not is_correct:
+            raise ServiceError.bad_request("Invalid credentials")
+        if not user.is_active:
+            raise ServiceError.bad_request("User account is disabled")
+
+        if rehashed:
+            user.password = rehashed
+            await user.asave(update_fields=["password"])
+            metrics.increment("auth.passwords_rehashed")
+        return user
+
+    @staticmethod
+    async def aregister(validated_data: dict) -> User:
+        """
+        Create a user from validated registration data.
+
+        Raises:
+            ServiceError: 409 when a concurrent registration took the
+                username or email after validation
+        """
+        data = dict(validated_data)
+        password = data.pop("password")
+        user = User(**data)
+        user.email = User.objects.normalize_email(user.email)
+        user.password = await AuthService.run_hashing(make_password, password)
+        try:
+            await sync_to_async(_insert_user)(user)
+        except IntegrityError:
+            raise ServiceError.conflict(
+                "A user with this username or email already exists"
+            )
+        return user
+
+    @staticmethod
+    async def alogin(request, user: User):
+        """Start a session for the user and warm the auth user cache"""
+        await alogin(request, user, backend=SESSION_BACKEND)
+        await sync_to_async(UserService.cache_auth_user)(user)
@@ -2,6 +2,8 @@ from .chat_messages_service import ChatMessagesService
 from .chat_participants_service import ChatParticipantsService
 from .chat_service import ChatService
 from .chat_websocket_service import ChatWebSocketService
+from .chat_ephemeral_service import ChatEphemeralService
+from .chat_archive_service import ChatArchiveService
 
 
 __all__ = [
@@ -9,4 +11,6 @@ __all__ = [
     "ChatParticipantsService",
     "ChatService",
     "ChatWebSocketService",
+    "ChatEphemeralService",
+    "ChatArchiveService",
 ]
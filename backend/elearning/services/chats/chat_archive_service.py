@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from elearning import metrics
+from elearning.models import ArchivedChatMessage, ChatMessage, ChatParticipant
+
+
+class ChatArchiveService:
+    """
+    Moves cold chat messages into the ``chat_messages_archive`` table.
+
+    Messages older than ``CHAT_ARCHIVE_AFTER_DAYS`` are copied and deleted
+    in primary key batches of ``CHAT_ARCHIVE_BATCH_SIZE``, one short
+    transaction per batch, so the hot table and its ``(chat_room,
+    created_at)`` index stay small without long locks. Messages a
+    participant's read marker points at stay hot.
+    """
+
+    _FIELDS = (
+        "id",
+        "chat_room_id",
+        "sender_id",
+        "content",
+        "created_at",
+        "updated_at",
+    )
+
+    @staticmethod
+    def cutoff(older_than_days=None):
+        """Get the creation time before which messages are archived"""
+        if older_than_days is None:
+            older_than_days = settings.CHAT_ARCHIVE_AFTER_DAYS
+        return timezone.now() - timedelta(days=older_than_days)
+
+    @staticmethod
+    def archive_batch(cutoff, batch_size=None) -> int:
+        """
+        Archive the next batch of messages created before ``cutoff``.
+
+        Returns:
+            Number of messages archived, 0 when there are none left
+        """
+        if batch_size is None:
+            batch_size = settings.CHAT_ARCHIVE_BATCH_SIZE
+
+        with transaction.atomic():
+            rows = list(
+                ChatMessage.objects.filter(created_at__lt=cutoff)
+                .exclude(
+                    id__in=ChatParticipant.objects.filter(
+                        last_read_message__isnull=False
+                    ).values("last_read_message_id")
+                )
+                .order_by("id")
+                .select_for_update(skip_locked=True)
+                .values(*ChatArchiveService._FIELDS)[:batch_size]
+            )
+            if not rows:
+                return 0
+
+            # Rows already copied by an interrupted run are skipped
+            ArchivedChatMessage.objects.bulk_create(
+                [ArchivedChatMessage(**row) for row in rows],
+                ignore_conflicts=True,
+            )
+            ChatMessage.objects.filter(
+                id__in=[row["id"] for row in rows]
+            ).delete()
+
+        metrics.increment("chat_archive.messages_archived", len(rows))
+        return len(rows)
+
+    @staticmethod
+    def archive(
+        older_than_days=None, batch_size=None, max_batches=None, on_batch=None
+    ) -> int:
+        """
+        Archive messages batch by batch until none are left.
+
+        Args:
+            older_than_days: Minimum message age (default
+                CHAT_ARCHIVE_AFTER_DAYS)
+            batch_size: Messages per transaction (default
+                CHAT_ARCHIVE_BATCH_SIZE)
+            max_batches: Optional limit on batches for this run
+            on_batch: Optional callback receiving each batch's size
+
+        Returns:
+            Number of messages archived
+        """
+        cutoff = ChatArchiveService.cutoff(older_than_days)
+        total = batches = 0
+        while max_batches is None or batches < max_batches:
+            archived = ChatArchiveService.archive_batch(cutoff, batch_size)
+            if not archived:
+                break
+            total += archived
+            batches += 1
+            if on_batch:
+                on_batch(archived)
+        return total
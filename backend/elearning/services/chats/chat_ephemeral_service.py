@@ -0,0 +1,186 @@
+import time
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from elearning import metrics
+
+
+class _TokenBucket:
+    """Simple token bucket refilled continuously at ``rate`` per second"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class _SenderState:
+    """Limiter and last sent states of one connection in one room"""
+
+    def __init__(self, bucket: _TokenBucket):
+        self.bucket = bucket
+        # event type -> (payload, sent at)
+        self.sent = {}
+        self.used = time.monotonic()
+
+
+class ChatEphemeralService:
+    """
+    Service for ephemeral chat signalling (typing, read receipts, pings).
+
+    Events go straight through the channel layer and are never persisted.
+    Each connection is rate limited per room with a token bucket, repeated
+    states are debounced, and events are dropped rather than queued when
+    too many broadcasts are already in flight from this process. State
+    idle long enough to have no effect any more is evicted.
+    """
+
+    EVENT_TYPES = ("typing", "read_receipt", "ping")
+
+    # (room_id, sender) -> _SenderState
+    _states: dict = {}
+    _last_sweep = 0.0
+    _in_flight = 0
+
+    @staticmethod
+    def _normalize(event_type: str, data: dict):
+        """Return the payload to forward, or None if the frame is invalid"""
+        if event_type == "typing":
+            return {"is_typing": bool(data.get("is_typing", True))}
+        if event_type == "read_receipt":
+            message_id = data.get("message_id")
+            if not isinstance(message_id, int):
+                return None
+            return {"message_id": message_id}
+        if event_type == "ping":
+            return {}
+        return None
+
+    @staticmethod
+    def _idle_limit() -> float:
+        """Seconds after which a sender's state no longer matters"""
+        # By then the bucket has refilled and the debounce window passed
+        return max(
+            settings.EPHEMERAL_DEBOUNCE,
+            settings.EPHEMERAL_BURST / settings.EPHEMERAL_RATE,
+        )
+
+    @staticmethod
+    def _state(key) -> _SenderState:
+        now = time.monotonic()
+        idle_limit = ChatEphemeralService._idle_limit()
+        if now - ChatEphemeralService._last_sweep >= idle_limit:
+            ChatEphemeralService._last_sweep = now
+            states = ChatEphemeralService._states
+            stale = [
+                key
+                for key, state in states.items()
+                if now - state.used >= idle_limit
+            ]
+            for stale_key in stale:
+                del states[stale_key]
+
+        state = ChatEphemeralService._states.get(key)
+        if state is None:
+            state = _SenderState(
+                _TokenBucket(
+                    rate=settings.EPHEMERAL_RATE,
+                    burst=settings.EPHEMERAL_BURST,
+                )
+            )
+            ChatEphemeralService._states[key] = state
+        state.used = now
+        return state
+
+    @staticmethod
+    def _is_duplicate(
+        state: _SenderState, event_type: str, payload: dict
+    ) -> bool:
+        """Debounce: skip repeats of the last sent state within the window"""
+        window = settings.EPHEMERAL_DEBOUNCE
+        previous = state.sent.get(event_type)
+        return bool(
+            previous
+            and previous[0] == payload
+            and time.monotonic() - previous[1] < window
+        )
+
+    @staticmethod
+    async def publish(
+        chat_room_id: int,
+        user_id: int,
+        event_type: str,
+        data: dict,
+        sender_channel: str = None,
+    ) -> bool:
+        """
+        Broadcast an ephemeral event to a chat room.
+
+        Returns:
+            bool: True if the event was sent, False if it was dropped
+        """
+        if event_type not in ChatEphemeralService.EVENT_TYPES:
+            return False
+        payload = ChatEphemeralService._normalize(event_type, data or {})
+        if payload is None:
+            return False
+
+        # Limits apply per connection, so one tab can't throttle another
+        sender = sender_channel or f"user:{user_id}"
+        state = ChatEphemeralService._state((chat_room_id, sender))
+        if ChatEphemeralService._is_duplicate(state, event_type, payload):
+            metrics.increment("ephemeral.debounced")
+            return False
+        if not state.bucket.take():
+            metrics.increment("ephemeral.rate_limited")
+            return False
+
+        max_in_flight = settings.EPHEMERAL_MAX_IN_FLIGHT
+        if ChatEphemeralService._in_flight >= max_in_flight:
+            metrics.increment("ephemeral.dropped_backpressure")
+            return False
+
+        ChatEphemeralService._in_flight += 1
+        try:
+            group_name = f"chat_{chat_room_id}"
+            await get_channel_layer().group_send(
+                group_name,
+                {
+                    "type": "ephemeral_event",
+                    "group": group_name,
+                    "event": event_type,
+                    "user_id": user_id,
+                    "data": payload,
+                    "sender_channel": sender_channel,
+                },
+            )
+        except Exception:
+            # Best effort: a channel layer failure drops the signal instead
+            # of closing the sender's socket
+            metrics.increment("ephemeral.send_errors")
+            return False
+        finally:
+            ChatEphemeralService._in_flight -= 1
+
+        # Only sent states count, so a dropped frame can be retried
+        state.sent[event_type] = (payload, time.monotonic())
+        metrics.increment("ephemeral.sent")
+        return True
+
+    @staticmethod
+    def forget(chat_room_id: int, sender_channel: str):
+        """Drop a connection's limiter state once it leaves a room"""
+        ChatEphemeralService._states.pop((chat_room_id, sender_channel), None)
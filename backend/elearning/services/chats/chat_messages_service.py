@@ -1,8 +1,66 @@
-from elearning.models import ChatMessage, User, ChatRoom
+from elearning.models import ArchivedChatMessage, ChatMessage, User, ChatRoom
 from elearning.exceptions import ServiceError
 from elearning.permissions.chats import ChatMessagePolicy, ChatPolicy
 
 
+class ChatHistory:
+    """
+    A room's hot and archived messages as one newest-first sequence.
+
+    Supports ``count()`` and slicing, so paginators page across both
+    tables, and ``acount()``/``aslice()`` for async views. A page is
+    resolved in three queries: the page's ids from a ``UNION ALL`` of both
+    ``(chat_room, created_at)`` indexes, then the rows from each table.
+    """
+
+    def __init__(self, hot, archived):
+        self.hot = hot
+        self.archived = archived
+
+    def _keys(self, index: slice):
+        return (
+            self.hot.order_by()
+            .values_list("created_at", "id")
+            .union(
+                self.archived.order_by().values_list("created_at", "id"),
+                all=True,
+            )
+            .order_by("-created_at", "-id")[index]
+        )
+
+    def count(self):
+        return self.hot.count() + self.archived.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            page = self[index : index + 1]
+            if not page:
+                raise IndexError(index)
+            return page[0]
+
+        ids = [message_id for _, message_id in self._keys(index)]
+        # Ids are unique across tiers, archiving keeps them
+        rows = {m.id: m for m in self.hot.filter(id__in=ids)}
+        rows.update((m.id, m) for m in self.archived.filter(id__in=ids))
+        return [rows[i] for i in ids if i in rows]
+
+    async def acount(self):
+        return await self.hot.acount() + await self.archived.acount()
+
+    async def aslice(self, start: int, stop: int) -> list:
+        """Async version of ``self[start:stop]``"""
+        keys = self._keys(slice(start, stop))
+        ids = [message_id async for _, message_id in keys]
+        rows = {m.id: m async for m in self.hot.filter(id__in=ids)}
+        rows.update(
+            [(m.id, m) async for m in self.archived.filter(id__in=ids)]
+        )
+        return [rows[i] for i in ids if i in rows]
+
+
 class ChatMessagesService:
     def __init__(self, chat_room_id: int):
         self.chat_room_id = chat_room_id
@@ -56,8 +114,19 @@ class ChatMessagesService:
 
         chat_message.delete()
 
-    def get_chat_messages(self, user: User):
-        """Get chat messages with permission check"""
+    def get_chat_messages(
+        self, user: User, updated_since=None, include_archived=False
+    ):
+        """
+        Get chat messages with permission check.
+
+        Args:
+            user: User requesting the messages
+            updated_since: Optional datetime; only messages created or
+                edited at or after it are returned (websocket resync delta)
+            include_archived: Return a ChatHistory paging across hot and
+                archived messages instead of a queryset of hot ones
+        """
         # Check if user can access this chat room
         try:
             chat_room = ChatRoom.objects.get(id=self.chat_room_id)
@@ -68,8 +137,45 @@ class ChatMessagesService:
             user, chat_room, raise_exception=True
         )
 
-        return (
-            ChatMessage.objects.filter(chat_room_id=self.chat_room_id)
-            .select_related("sender")
-            .order_by("-created_at")
+        return self._messages(updated_since, include_archived)
+
+    def _messages(self, updated_since, include_archived):
+        """The room's messages, newest first, optionally across tiers"""
+        messages = ChatMessage.objects.filter(chat_room_id=self.chat_room_id)
+        if updated_since is not None:
+            messages = messages.filter(updated_at__gte=updated_since)
+        messages = messages.select_related("sender").order_by("-created_at")
+
+        if not include_archived:
+            return messages
+
+        archived = ArchivedChatMessage.objects.filter(
+            chat_room_id=self.chat_room_id
+        )
+        if updated_since is not None:
+            archived = archived.filter(updated_at__gte=updated_since)
+        return ChatHistory(messages, archived.select_related("sender"))
+
+    async def aget_chat_messages(
+        self, user: User, updated_since=None, include_archived=False
+    ):
+        """
+        Async version of get_chat_messages.
+
+        Loads the room and checks access in one async query. Returns the
+        same lazy queryset, to be evaluated with ``async for``, or with
+        ``include_archived`` a ChatHistory to page with ``acount()`` and
+        ``aslice()``.
+        """
+        try:
+            chat_room = await ChatPolicy.annotate_access(
+                ChatRoom.objects.all(), user
+            ).aget(id=self.chat_room_id)
+        except ChatRoom.DoesNotExist:
+            raise ServiceError.not_found("Chat room not found")
+
+        await ChatPolicy.acheck_can_access_chat_room(
+            user, chat_room, raise_exception=True
         )
+
+        return self._messages(updated_since, include_archived)
@@ -1,5 +1,6 @@
 from elearning.models import ChatParticipant, ChatRoom, User
 from elearning.exceptions import ServiceError
+from elearning.upsert import upsert
 from elearning.permissions.chats import ChatParticipantPolicy
 from elearning.services.notification_service import NotificationService
 
@@ -37,22 +38,15 @@ class ChatParticipantsService:
                     f"to participate in course chat"
                 )
 
-        # Check if user is already a participant
-        if ChatParticipant.objects.filter(
-            chat_room=chat_room, user=user
-        ).exists():
-            # Reactivate participant
-            participant = ChatParticipant.objects.filter(
-                chat_room=chat_room, user=user
-            ).first()
-            participant.is_active = True
-            participant.save()
-        else:
-            # Create new participant
-            participant = ChatParticipant.objects.create(
-                chat_room=chat_room, user=user, role="participant"
-            )
-        
+        # Create the participant, or reactivate one who left, keeping their
+        # role
+        participant = upsert(
+            ChatParticipant,
+            match={"chat_room": chat_room, "user": user},
+            values={"role": "participant", "is_active": True},
+            update_fields=["is_active"],
+        )
+
         # Send notification to user
         NotificationService.create_notifications_and_send(
             [user.id],
@@ -142,20 +136,14 @@ class ChatParticipantsService:
                     "You must be enrolled in this course to join course chat"
                 )
 
-        # Check if already a participant
-        participant, created = ChatParticipant.objects.get_or_create(
-            chat_room=chat_room,
-            user=user,
-            defaults={"role": "participant", "is_active": True},
+        # Create the participant, or reactivate one who left
+        return upsert(
+            ChatParticipant,
+            match={"chat_room": chat_room, "user": user},
+            values={"role": "participant", "is_active": True},
+            update_fields=["is_active"],
         )
 
-        if not created and not participant.is_active:
-            # Reactivate existing participant
-            participant.is_active = True
-            participant.save()
-
-        return participant
-
     @staticmethod
     def leave_chat(chat_room: ChatRoom, user: User):
         """Leave a chat room"""
@@ -268,6 +256,7 @@ class ChatParticipantsService:
         return ChatParticipant.objects.filter(
             chat_room=chat_room,
             is_active=True,
+            user__is_active=True,
         ).select_related("user")
 
     @staticmethod
@@ -279,5 +268,5 @@ class ChatParticipantsService:
         )
 
         return ChatParticipant.objects.filter(
-            chat_room=chat_room, is_active=True
+            chat_room=chat_room, is_active=True, user__is_active=True
         ).select_related("user")
@@ -1,7 +1,8 @@
-from django.db import transaction, models
+from django.db import transaction
 from elearning.models import ChatParticipant, ChatRoom, User
 from elearning.services.chats import ChatParticipantsService
 from elearning.exceptions import ServiceError
+from elearning.services.deletion_service import DeletionService
 from elearning.permissions.chats import ChatPolicy
 
 
@@ -125,6 +126,25 @@ class ChatService:
         except ChatRoom.DoesNotExist:
             raise ServiceError.not_found("Chat room not found")
 
+    @staticmethod
+    async def aget_chat_with_permission_check(chat_id, user: User):
+        """
+        Async version of get_chat_with_permission_check.
+
+        The room and the user's access to it are loaded in a single query.
+        """
+        try:
+            chat_room = await ChatPolicy.annotate_access(
+                ChatRoom.objects.all(), user
+            ).aget(id=chat_id)
+        except (ChatRoom.DoesNotExist, ValueError):
+            raise ServiceError.not_found("Chat room not found")
+
+        await ChatPolicy.acheck_can_access_chat_room(
+            user, chat_room, raise_exception=True
+        )
+        return chat_room
+
     @staticmethod
     def update_chat_room(chat_room: ChatRoom, user: User, **kwargs):
         """Update chat room with permission check"""
@@ -149,8 +169,10 @@ class ChatService:
             user, chat_room, raise_exception=True
         )
 
-        # Delete the chat room (this will cascade to related objects)
-        chat_room.delete()
+        # Hide the room now; a worker deletes it and its messages
+        DeletionService.schedule_chat_room_deletion(
+            chat_room, requested_by=user
+        )
 
     @staticmethod
     def populate_chat_computed_fields(chat_room: ChatRoom, user: User = None):
@@ -201,8 +223,19 @@ class ChatService:
         # 1. Public chats
         # 2. Private chats they participate in
         # 3. Course chats they teach
-        return ChatRoom.objects.filter(
-            models.Q(is_public=True)
-            | models.Q(participants__user=user, participants__is_active=True)
-            | models.Q(course__teacher=user)
-        ).distinct()
+        # Each branch is its own index lookup and UNION removes duplicates,
+        # instead of ORing across joins and deduplicating with DISTINCT
+        # (order_by() drops default orderings, which compound statements
+        # don't allow)
+        public = ChatRoom.objects.filter(is_public=True)
+        joined = ChatParticipant.objects.filter(user=user, is_active=True)
+        taught = ChatRoom.objects.filter(course__teacher=user)
+        visible_ids = (
+            public.order_by()
+            .values("pk")
+            .union(
+                joined.order_by().values("chat_room_id"),
+                taught.order_by().values("pk"),
+            )
+        )
+        return ChatRoom.objects.filter(pk__in=visible_ids)
@@ -1,19 +1,93 @@
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 
 
 class ChatWebSocketService:
+    """
+    Service for broadcasting chat events over websockets.
+
+    Every event gets a monotonically increasing per-room sequence number
+    and is kept in a bounded replay log, so reconnecting clients can resume
+    from the last sequence they saw instead of reloading the whole history.
+    """
+
+    @staticmethod
+    def _seq_key(chat_room_id) -> str:
+        return f"chat_seq:{chat_room_id}"
+
+    @staticmethod
+    def _log_key(chat_room_id, seq: int) -> str:
+        return f"chat_log:{chat_room_id}:{seq}"
+
+    @staticmethod
+    def next_sequence(chat_room_id) -> int:
+        """Atomically allocate the next sequence number for a room"""
+        key = ChatWebSocketService._seq_key(chat_room_id)
+        cache.add(key, 0, timeout=None)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Evicted between add and incr
+            cache.add(key, 0, timeout=None)
+            return cache.incr(key)
+
+    @staticmethod
+    def get_current_sequence(chat_room_id) -> int:
+        """Get the last sequence number allocated for a room"""
+        return cache.get(ChatWebSocketService._seq_key(chat_room_id), 0)
+
+    @staticmethod
+    def get_events_since(chat_room_id, last_seq: int):
+        """
+        Get logged events after ``last_seq`` in order.
+
+        Returns:
+            List of events, or None if the gap can't be replayed from the
+            log and the client must reload the room's messages over REST
+        """
+        current = ChatWebSocketService.get_current_sequence(chat_room_id)
+        if last_seq > current:
+            # The counter was evicted or reset, so there's no telling what
+            # the client missed
+            return None
+        if last_seq == current:
+            return []
+        if current - last_seq > settings.CHAT_EVENT_LOG_SIZE:
+            return None
+
+        keys = [
+            ChatWebSocketService._log_key(chat_room_id, seq)
+            for seq in range(last_seq + 1, current + 1)
+        ]
+        found = cache.get_many(keys)
+        if len(found) != len(keys):
+            # Part of the gap already expired from the log
+            return None
+        return [found[key] for key in keys]
+
     @staticmethod
     def broadcast_message(message, event_type):
         """Broadcast message to all users in the chat room"""
         channel_layer = get_channel_layer()
-        chat_group_name = f"chat_{message['chat_room']}"
-
-        async_to_sync(channel_layer.group_send)(
-            chat_group_name,
-            {
-                "type": "chat_message",
-                "event_type": event_type,
-                "message": message,
-            },
+        chat_room_id = message["chat_room"]
+        chat_group_name = f"chat_{chat_room_id}"
+
+        seq = ChatWebSocketService.next_sequence(chat_room_id)
+        event = {
+            "type": "chat_message",
+            "group": chat_group_name,
+            "event_type": event_type,
+            "message": message,
+            "seq": seq,
+            "sent_at": timezone.now().isoformat(),
+        }
+        cache.set(
+            ChatWebSocketService._log_key(chat_room_id, seq),
+            event,
+            timeout=settings.CHAT_EVENT_LOG_TTL,
         )
+
+        async_to_sync(channel_layer.group_send)(chat_group_name, event)
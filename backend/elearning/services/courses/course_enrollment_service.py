@@ -1,6 +1,7 @@
 from elearning.models import Enrollment, Course, User
 from elearning.services.notification_service import NotificationService
 from elearning.exceptions import ServiceError
+from elearning.upsert import upsert
 from elearning.permissions.courses import (
     CourseEnrollmentPolicy,
 )
@@ -37,30 +38,12 @@ class CourseEnrollmentService:
             student, course, raise_exception=True
         )
 
-        # Check if already enrolled
-        existing_enrollment = (
-            Enrollment.objects.select_related(
-                "course", "course__teacher", "user"
-            )
-            .filter(course=course, user=student)
-            .first()
-        )
-
-        if existing_enrollment:
-            if existing_enrollment.is_active:
-                raise ServiceError.conflict(
-                    "Student is already enrolled in this course"
-                )
-            else:
-                # Reactivate existing enrollment
-                existing_enrollment.is_active = True
-                existing_enrollment.unenrolled_at = None
-                existing_enrollment.save()
-                return existing_enrollment
-
-        # Create new enrollment
-        enrollment = Enrollment.objects.create(
-            course=course, user=student, is_active=True
+        # The policy rejects active enrollments; an inactive one left by an
+        # earlier unenrollment is reactivated in the same statement
+        enrollment = upsert(
+            Enrollment,
+            match={"course": course, "user": student},
+            values={"is_active": True, "unenrolled_at": None},
         )
 
         # Notify teacher about new enrollment
@@ -182,7 +165,7 @@ class CourseEnrollmentService:
         if user.is_authenticated and course.teacher == user:
             return Enrollment.objects.select_related(
                 "user", "course", "course__teacher"
-            ).filter(course=course)
+            ).filter(course=course, user__is_active=True)
 
         # Students see only their own enrollment for this course
         if user.is_authenticated:
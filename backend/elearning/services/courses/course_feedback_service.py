@@ -1,4 +1,4 @@
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from elearning.models import CourseFeedback, Course, User
 from elearning.exceptions import ServiceError
 from elearning.permissions.courses import (
@@ -60,10 +60,17 @@ class CourseFeedbackService:
             user, course, raise_exception=True
         )
 
-        # Create the feedback
-        feedback = CourseFeedback.objects.create(
-            user=user, course=course, rating=rating, text=text
-        )
+        # The policy rejects duplicates; a concurrent duplicate that slips
+        # past it fails on the constraint with the same error
+        try:
+            with transaction.atomic():
+                feedback = CourseFeedback.objects.create(
+                    user=user, course=course, rating=rating, text=text
+                )
+        except IntegrityError:
+            raise ServiceError.conflict(
+                "You have already left feedback for this course"
+            )
 
         return feedback
 
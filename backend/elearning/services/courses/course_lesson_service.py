@@ -1,3 +1,7 @@
+import time
+
+from django.conf import settings
+from django.core import signing
 from django.db import transaction
 from elearning.models import CourseLesson, Course, File, User
 from elearning.exceptions import ServiceError
@@ -11,6 +15,8 @@ from elearning.services.courses.course_service import CourseService
 class CourseLessonService:
     """Service for managing course lessons"""
 
+    FILE_TOKEN_SALT = "elearning.lesson-file-download"
+
     @staticmethod
     @transaction.atomic
     def create_lesson_with_file(
@@ -126,7 +132,9 @@ class CourseLessonService:
         Get lesson with permission check including course access validation
         """
         try:
-            lesson = CourseLesson.objects.get(id=lesson_id)
+            lesson = CourseLesson.objects.select_related(
+                "course", "file"
+            ).get(id=lesson_id)
 
             # First check if user can access the course this lesson belongs to
             CourseService.get_course_with_permission_check(
@@ -164,6 +172,49 @@ class CourseLessonService:
         except CourseLesson.DoesNotExist:
             raise ServiceError.not_found("Lesson not found")
 
+    @staticmethod
+    def create_file_download_token(file_obj: File) -> str:
+        """
+        Mint a signed, expiring download token for a lesson file.
+
+        Callers must already have checked that the user can view the lesson.
+        The expiry is rounded up to a ``FILE_DOWNLOAD_TOKEN_TTL`` boundary so
+        repeated requests get the same URL, which keeps it cacheable.
+        """
+        ttl = settings.FILE_DOWNLOAD_TOKEN_TTL
+        expires_at = (int(time.time()) // ttl + 2) * ttl
+        payload = {
+            "f": file_obj.id,
+            "p": file_obj.file.name,
+            "n": file_obj.original_name,
+            "m": file_obj.mime_type,
+            "v": file_obj.is_previewable,
+            "e": expires_at,
+        }
+        return signing.dumps(
+            payload, salt=CourseLessonService.FILE_TOKEN_SALT, compress=True
+        )
+
+    @staticmethod
+    def resolve_file_download_token(token: str) -> dict:
+        """
+        Verify a download token without touching the database.
+
+        Returns:
+            dict: Token payload with storage path ``p``, original name ``n``,
+            mime type ``m``, previewable flag ``v`` and expiry ``e``
+        """
+        try:
+            payload = signing.loads(
+                token, salt=CourseLessonService.FILE_TOKEN_SALT
+            )
+        except signing.BadSignature:
+            raise ServiceError.permission_denied("Invalid download link")
+
+        if payload["e"] <= time.time():
+            raise ServiceError.permission_denied("Download link has expired")
+        return payload
+
     @staticmethod
     def get_lessons_for_course(course: Course, user: User):
         """Get lessons for a course with permission filtering.
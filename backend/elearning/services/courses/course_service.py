@@ -1,9 +1,29 @@
+from asgiref.sync import sync_to_async
 from django.db import transaction
 from django.db.models import Q
-from elearning.models import Course, ChatRoom, ChatParticipant, User
+from elearning.cache import CacheNamespace
+from elearning.models import (
+    Course,
+    ChatRoom,
+    ChatParticipant,
+    Enrollment,
+    User,
+)
 from elearning.exceptions import ServiceError
+from elearning.services.deletion_service import DeletionService
 from elearning.permissions.courses import CoursePolicy
 
+# Per-course stats shown on course detail, independent of the viewer
+COURSE_STATS_CACHE = CacheNamespace(
+    "course_stats",
+    ttl=300,
+    depends_on={
+        Course: lambda course: [course.pk],
+        Enrollment: lambda enrollment: [enrollment.course_id],
+        ChatRoom: lambda chat_room: [chat_room.course_id],
+    },
+)
+
 
 class CourseService:
     """
@@ -128,8 +148,8 @@ class CourseService:
             user, course, raise_exception=True
         )
 
-        # Delete the course (this will cascade to related objects)
-        course.delete()
+        # Hide the course now; a worker deletes it and its dependents
+        DeletionService.schedule_course_deletion(course, requested_by=user)
 
     @staticmethod
     def get_course_with_permission_check(course_id: int, user: User):
@@ -144,14 +164,71 @@ class CourseService:
         except Course.DoesNotExist:
             raise ServiceError.not_found("Course not found")
 
+    @staticmethod
+    async def aget_course_with_permission_check(course_id: int, user: User):
+        """
+        Async version of get_course_with_permission_check.
+
+        The teacher is loaded with the course so the policy check runs
+        without further queries.
+        """
+        try:
+            course = await Course.objects.select_related("teacher").aget(
+                id=course_id
+            )
+        except Course.DoesNotExist:
+            raise ServiceError.not_found("Course not found")
+
+        CoursePolicy.check_can_access_course(
+            user, course, raise_exception=True
+        )
+        return course
+
+    @staticmethod
+    async def apopulate_course_computed_fields(
+        course: Course, user: User = None
+    ):
+        """Async version of populate_course_computed_fields"""
+        # Stats are usually a cache hit, so one short thread hop is cheaper
+        # than duplicating the cached loader
+        stats = await sync_to_async(CourseService.get_course_stats)(
+            course.id
+        )
+        course._enrollment_count = stats["enrollment_count"]
+        course._total_enrollments = stats["total_enrollments"]
+        course._course_chat_id = stats["course_chat_id"]
+
+        if user and user.is_authenticated:
+            course._is_enrolled = await course.enrollments.filter(
+                user=user, is_active=True
+            ).aexists()
+        else:
+            course._is_enrolled = False
+        return course
+
+    @staticmethod
+    @COURSE_STATS_CACHE.cached(key=lambda course_id: course_id)
+    def get_course_stats(course_id: int) -> dict:
+        """Get (cached) enrollment counts and chat id for a course"""
+        enrollments = Enrollment.objects.filter(course_id=course_id)
+        course_chat_id = (
+            ChatRoom.objects.filter(chat_type="course", course_id=course_id)
+            .values_list("id", flat=True)
+            .first()
+        )
+        return {
+            "enrollment_count": enrollments.filter(is_active=True).count(),
+            "total_enrollments": enrollments.count(),
+            "course_chat_id": course_chat_id,
+        }
+
     @staticmethod
     def populate_course_computed_fields(course: Course, user: User = None):
         """Populate computed fields for course serialization"""
-        # Get enrollment counts
-        course._enrollment_count = course.enrollments.filter(
-            is_active=True
-        ).count()
-        course._total_enrollments = course.enrollments.count()
+        stats = CourseService.get_course_stats(course.id)
+        course._enrollment_count = stats["enrollment_count"]
+        course._total_enrollments = stats["total_enrollments"]
+        course._course_chat_id = stats["course_chat_id"]
 
         # Check if user is enrolled
         if user and user.is_authenticated:
@@ -161,15 +238,6 @@ class CourseService:
         else:
             course._is_enrolled = False
 
-        # Get course chat ID
-        try:
-            course_chat = ChatRoom.objects.get(
-                chat_type="course", course=course
-            )
-            course._course_chat_id = course_chat.id
-        except ChatRoom.DoesNotExist:
-            course._course_chat_id = None
-
         return course
 
     @staticmethod
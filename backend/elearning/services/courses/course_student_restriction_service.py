@@ -3,11 +3,11 @@ from elearning.models import (
     StudentRestriction,
     Enrollment,
     User,
-    Course,
-    ChatRoom,
     ChatParticipant,
 )
 from elearning.services.notification_service import NotificationService
+from elearning.services.courses.course_service import COURSE_STATS_CACHE
+from elearning.services.user_service import USER_STATS_CACHE
 from elearning.exceptions import ServiceError
 from elearning.permissions.courses import (
     CourseStudentRestrictionPolicy,
@@ -147,46 +147,66 @@ class CourseStudentRestrictionService:
         # Delete the restriction
         restriction.delete()
 
-    # CALLED BY SIGNAL
     @staticmethod
-    def apply_restriction_effects(restriction):
+    def _set_restriction_effects(restriction, is_active: bool):
         """
-        Apply a restriction:
-        - Deactivate enrollments
-        - Deactivate chat participants
+        Flip a restricted student's enrollments and course chat
+        memberships in the courses a restriction covers.
+
+        Runs a fixed number of statements however many courses are
+        affected: one SELECT for the affected course ids, the enrollment
+        UPDATE, and the participant UPDATE joined through ChatRoom.course.
+
+        Returns:
+            List of affected course ids
         """
-        
-        if restriction.course:
-            # Course-specific restriction
-            enrollments = Enrollment.objects.filter(
-                course=restriction.course,
-                user=restriction.student,
-                is_active=True,
-            )
+        if restriction.course_id:
+            course_filter = {"course_id": restriction.course_id}
         else:
-            # Teacher all-courses restriction
-            teacher_courses = Course.objects.filter(
-                teacher=restriction.teacher
-            )
-            enrollments = Enrollment.objects.filter(
-                course__in=teacher_courses,
-                user=restriction.student,
-                is_active=True,
-            )
+            course_filter = {"course__teacher_id": restriction.teacher_id}
 
-        # Get chat rooms ids before updating enrollments
-        # .update updates the queryset in place, so we need to get the ids
-        chat_rooms_ids = [e.course.id for e in enrollments]
-
-        # Bulk update enrollments
-        enrollments.update(is_active=False, unenrolled_at=timezone.now())
+        enrollments = Enrollment.objects.filter(
+            user_id=restriction.student_id,
+            is_active=not is_active,
+            **course_filter,
+        )
+        # .update() changes what the queryset matches, so the ids are
+        # read first
+        course_ids = list(enrollments.values_list("course_id", flat=True))
+        if not course_ids:
+            return []
+
+        Enrollment.objects.filter(
+            user_id=restriction.student_id,
+            course_id__in=course_ids,
+            is_active=not is_active,
+        ).update(
+            is_active=is_active,
+            unenrolled_at=None if is_active else timezone.now(),
+        )
+        ChatParticipant.objects.filter(
+            chat_room__course_id__in=course_ids,
+            chat_room__chat_type="course",
+            user_id=restriction.student_id,
+            is_active=not is_active,
+        ).update(is_active=is_active)
 
-        # Bulk update corresponding chat participants
-        chatrooms = ChatRoom.objects.filter(id__in=chat_rooms_ids)
+        # Bulk updates skip model signals, so drop cached stats explicitly
+        COURSE_STATS_CACHE.invalidate_many(course_ids)
+        USER_STATS_CACHE.invalidate(restriction.student_id)
+        return course_ids
 
-        ChatParticipant.objects.filter(
-            chat_room__in=chatrooms, user=restriction.student, is_active=True
-        ).update(is_active=False)
+    # CALLED BY SIGNAL
+    @staticmethod
+    def apply_restriction_effects(restriction):
+        """
+        Apply a restriction:
+        - Deactivate enrollments
+        - Deactivate course chat participants
+        """
+        CourseStudentRestrictionService._set_restriction_effects(
+            restriction, is_active=False
+        )
 
     # CALLED BY SIGNAL
     @staticmethod
@@ -194,41 +214,18 @@ class CourseStudentRestrictionService:
         """
         Remove a restriction:
         - Reactivate enrollments if no other restrictions apply
-        - Reactivate chat participants
+        - Reactivate course chat participants
         """
-        if restriction.course:
-            # Course-specific restriction
-            if not CourseStudentRestrictionPolicy.is_restricted(
+        if restriction.course_id and (
+            CourseStudentRestrictionPolicy.is_restricted(
                 restriction.student, restriction.course
-            ):
-                enrollments = Enrollment.objects.filter(
-                    course=restriction.course,
-                    user=restriction.student,
-                    is_active=False,
-                )
-            else:
-                return
-        else:
-            # Teacher all-courses restriction
-            teacher_courses = Course.objects.filter(
-                teacher=restriction.teacher
-            )
-            enrollments = Enrollment.objects.filter(
-                course__in=teacher_courses,
-                user=restriction.student,
-                is_active=False,
             )
+        ):
+            return
 
-        # Bulk update enrollments
-        enrollments.update(is_active=True, unenrolled_at=None)
-
-        # Bulk update corresponding chat participants
-        chatrooms = ChatRoom.objects.filter(
-            course__in=[e.course for e in enrollments], chat_type="course"
+        CourseStudentRestrictionService._set_restriction_effects(
+            restriction, is_active=True
         )
-        ChatParticipant.objects.filter(
-            chat_room__in=chatrooms, user=restriction.student, is_active=False
-        ).update(is_active=True)
 
     @staticmethod
     def get_teacher_restrictions(teacher):
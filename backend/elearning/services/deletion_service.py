@@ -0,0 +1,354 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from elearning import metrics
+from elearning.models import (
+    APIToken,
+    ArchivedChatMessage,
+    ChatMessage,
+    ChatParticipant,
+    ChatRoom,
+    Course,
+    CourseFeedback,
+    CourseLesson,
+    DeletionJob,
+    Enrollment,
+    File,
+    Notification,
+    Status,
+    StudentRestriction,
+    User,
+)
+
+
+class _Step:
+    """
+    One stage of a cascade: delete (or null a foreign key on) every
+    ``model`` row matching ``condition``, a chunk at a time.
+    """
+
+    def __init__(self, label, model, condition: Q, set_null: str = None):
+        self.label = label
+        self.model = model
+        self.condition = condition
+        self.set_null = set_null
+
+    def run_chunk(self, chunk_size: int) -> int:
+        # _base_manager also sees soft-deleted courses and rooms
+        manager = self.model._base_manager
+        ids = list(
+            manager.filter(self.condition)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return 0
+
+        chunk = manager.filter(pk__in=ids)
+        if self.set_null:
+            chunk.update(**{self.set_null: None})
+        else:
+            # Signals and SET_NULL handling run, but only for this chunk
+            chunk.delete()
+        return len(ids)
+
+
+class DeletionService:
+    """
+    Service for deleting courses, chat rooms and users in the background.
+
+    Deleting a root with ``.delete()`` makes Django's collector load every
+    dependent row and send per-object signals inside one request. Instead
+    the root is hidden immediately and a ``DeletionJob`` is queued. A worker
+    then removes dependents deepest-first in chunks of
+    ``DELETION_CHUNK_SIZE`` rows, one short transaction each, and deletes
+    the root last, when nothing is left to cascade.
+    """
+
+    # --- Scheduling ---
+
+    @staticmethod
+    def _queue(target_type: str, target_id: int, requested_by=None):
+        return DeletionJob.objects.create(
+            target_type=target_type,
+            target_id=target_id,
+            requested_by=requested_by,
+        )
+
+    @staticmethod
+    def _invalidate_stats(course_ids: list):
+        """
+        Drop cached stats of hidden courses and of their enrolled users,
+        whose enrollment counts skip deleted courses.
+        """
+        # Imported lazily: both service modules import this one
+        from elearning.services.courses.course_service import (
+            COURSE_STATS_CACHE,
+        )
+        from elearning.services.user_service import USER_STATS_CACHE
+
+        COURSE_STATS_CACHE.invalidate_many(course_ids)
+        USER_STATS_CACHE.invalidate_many(
+            Enrollment.objects.filter(course_id__in=course_ids)
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def schedule_course_deletion(course: Course, requested_by=None):
+        """Hide a course and its chat rooms, and queue their deletion"""
+        now = timezone.now()
+        course.deleted_at = now
+        # A save so model signals drop cached stats for the course
+        course.save(update_fields=["deleted_at"])
+        ChatRoom.objects.filter(course=course).update(deleted_at=now)
+        DeletionService._invalidate_stats([course.pk])
+        return DeletionService._queue("course", course.pk, requested_by)
+
+    @staticmethod
+    @transaction.atomic
+    def schedule_chat_room_deletion(chat_room: ChatRoom, requested_by=None):
+        """Hide a chat room and queue its deletion"""
+        chat_room.deleted_at = timezone.now()
+        chat_room.save(update_fields=["deleted_at"])
+        return DeletionService._queue("chat_room", chat_room.pk, requested_by)
+
+    @staticmethod
+    @transaction.atomic
+    def schedule_user_deletion(user: User, requested_by=None):
+        """
+        Deactivate a user, hide their courses and rooms, and queue the
+        deletion of everything they own.
+        """
+        now = timezone.now()
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        course_ids = list(
+            Course.objects.filter(teacher=user).values_list("pk", flat=True)
+        )
+        Course.objects.filter(pk__in=course_ids).update(deleted_at=now)
+        ChatRoom.objects.filter(
+            Q(created_by=user) | Q(course__teacher=user)
+        ).update(deleted_at=now)
+        # The bulk update skips model signals
+        DeletionService._invalidate_stats(course_ids)
+        return DeletionService._queue("user", user.pk, requested_by)
+
+    # --- Plans ---
+
+    @staticmethod
+    def _course_steps(course_lookups: dict, room_lookups: dict) -> list:
+        """
+        Steps removing the courses matching ``course_lookups`` and the chat
+        rooms matching ``room_lookups``, with everything that hangs off
+        them.
+        """
+
+        def via(relation, lookups):
+            return Q(
+                **{
+                    f"{relation}__{lookup}": value
+                    for lookup, value in lookups.items()
+                }
+            )
+
+        return [
+            _Step(
+                "chat_participants",
+                ChatParticipant,
+                via("chat_room", room_lookups),
+            ),
+            _Step(
+                "chat_messages", ChatMessage, via("chat_room", room_lookups)
+            ),
+            _Step(
+                "archived_chat_messages",
+                ArchivedChatMessage,
+                via("chat_room", room_lookups),
+            ),
+            _Step("chat_rooms", ChatRoom, Q(**room_lookups)),
+            _Step("enrollments", Enrollment, via("course", course_lookups)),
+            _Step("feedback", CourseFeedback, via("course", course_lookups)),
+            _Step("lessons", CourseLesson, via("course", course_lookups)),
+            _Step(
+                "restrictions",
+                StudentRestriction,
+                via("course", course_lookups),
+            ),
+            _Step("courses", Course, Q(**course_lookups)),
+        ]
+
+    @staticmethod
+    def get_steps(job: DeletionJob) -> list:
+        """Get the ordered deletion steps for a job's target"""
+        target_id = job.target_id
+        if job.target_type == "chat_room":
+            return [
+                _Step(
+                    "chat_participants",
+                    ChatParticipant,
+                    Q(chat_room_id=target_id),
+                ),
+                _Step("chat_messages", ChatMessage, Q(chat_room_id=target_id)),
+                _Step(
+                    "archived_chat_messages",
+                    ArchivedChatMessage,
+                    Q(chat_room_id=target_id),
+                ),
+                _Step("chat_rooms", ChatRoom, Q(pk=target_id)),
+            ]
+
+        if job.target_type == "course":
+            return DeletionService._course_steps(
+                {"pk": target_id}, {"course_id": target_id}
+            )
+
+        # Users: their own rows first, then rooms and courses they own
+        return [
+            _Step("notifications", Notification, Q(user_id=target_id)),
+            _Step("statuses", Status, Q(user_id=target_id)),
+            _Step("api_tokens", APIToken, Q(user_id=target_id)),
+            _Step("user_enrollments", Enrollment, Q(user_id=target_id)),
+            _Step(
+                "user_chat_participants",
+                ChatParticipant,
+                Q(user_id=target_id),
+            ),
+            _Step(
+                "user_restrictions",
+                StudentRestriction,
+                Q(student_id=target_id) | Q(teacher_id=target_id),
+            ),
+            _Step(
+                "sent_messages",
+                ChatMessage,
+                Q(sender_id=target_id),
+                set_null="sender",
+            ),
+            _Step(
+                "sent_archived_messages",
+                ArchivedChatMessage,
+                Q(sender_id=target_id),
+                set_null="sender",
+            ),
+            _Step(
+                "written_feedback",
+                CourseFeedback,
+                Q(user_id=target_id),
+                set_null="user",
+            ),
+            _Step(
+                "room_participants",
+                ChatParticipant,
+                Q(chat_room__created_by_id=target_id),
+            ),
+            _Step(
+                "room_messages",
+                ChatMessage,
+                Q(chat_room__created_by_id=target_id),
+            ),
+            _Step(
+                "room_archived_messages",
+                ArchivedChatMessage,
+                Q(chat_room__created_by_id=target_id),
+            ),
+            _Step("rooms", ChatRoom, Q(created_by_id=target_id)),
+            *DeletionService._course_steps(
+                {"teacher_id": target_id}, {"course__teacher_id": target_id}
+            ),
+            _Step("files", File, Q(uploaded_by_id=target_id)),
+            _Step("users", User, Q(pk=target_id)),
+        ]
+
+    # --- Worker ---
+
+    @staticmethod
+    def claim_next_job():
+        """
+        Claim the oldest pending job, or a running one whose worker
+        stopped renewing its lease.
+
+        Returns:
+            The claimed DeletionJob, or None if there is nothing to do
+        """
+        now = timezone.now()
+        lease = timedelta(seconds=settings.DELETION_JOB_LEASE)
+        candidates = DeletionJob.objects.filter(
+            Q(status="pending") | Q(status="running", lease_expires_at__lt=now)
+        ).values_list("pk", flat=True)
+
+        for job_id in candidates[:10]:
+            claimed = DeletionJob.objects.filter(
+                Q(status="pending")
+                | Q(status="running", lease_expires_at__lt=now),
+                pk=job_id,
+            ).update(status="running", lease_expires_at=now + lease)
+            if claimed:
+                return DeletionJob.objects.get(pk=job_id)
+        return None
+
+    @staticmethod
+    def run_job(job: DeletionJob, chunk_size: int = None, on_progress=None):
+        """
+        Run a claimed job to completion, resuming at ``job.step``.
+
+        Each chunk runs in its own transaction and is followed by a
+        progress save that renews the job's lease.
+
+        Args:
+            job: Job claimed by claim_next_job
+            chunk_size: Rows per chunk (default ``DELETION_CHUNK_SIZE``)
+            on_progress: Optional callable receiving the job after each
+                chunk
+        """
+        chunk_size = chunk_size or settings.DELETION_CHUNK_SIZE
+        lease = timedelta(seconds=settings.DELETION_JOB_LEASE)
+        steps = DeletionService.get_steps(job)
+
+        job.attempts += 1
+        job.started_at = job.started_at or timezone.now()
+        job.save(update_fields=["attempts", "started_at"])
+
+        try:
+            while job.step < len(steps):
+                step = steps[job.step]
+                with transaction.atomic():
+                    removed = step.run_chunk(chunk_size)
+                if removed:
+                    job.progress[step.label] = (
+                        job.progress.get(step.label, 0) + removed
+                    )
+                    metrics.increment("deletion.rows_removed", removed)
+                else:
+                    job.step += 1
+                job.lease_expires_at = timezone.now() + lease
+                job.save(
+                    update_fields=["step", "progress", "lease_expires_at"]
+                )
+                if on_progress:
+                    on_progress(job)
+        except Exception as e:
+            job.status = "failed"
+            job.last_error = str(e)
+            job.save(update_fields=["status", "last_error"])
+            metrics.increment("deletion.jobs_failed")
+            raise
+
+        job.status = "done"
+        job.finished_at = timezone.now()
+        job.lease_expires_at = None
+        job.save(update_fields=["status", "finished_at", "lease_expires_at"])
+        metrics.increment("deletion.jobs_done")
+        return job
+
+    @staticmethod
+    def retry_failed_jobs() -> int:
+        """Put failed jobs back in the queue; they resume at their step"""
+        return DeletionJob.objects.filter(status="failed").update(
+            status="pending", lease_expires_at=None
+        )
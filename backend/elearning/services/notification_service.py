@@ -1,5 +1,11 @@
+from datetime import timedelta
+
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from elearning import metrics
 from elearning.models import Notification, User
 from elearning.exceptions import ServiceError
 from elearning.permissions import NotificationPolicy
@@ -115,3 +121,99 @@ class NotificationService:
     def get_user_notifications(user: User):
         """Get all notifications for a user"""
         return Notification.objects.filter(user=user).order_by("-created_at")
+
+    # --- Retention ---
+
+    @staticmethod
+    def _delete_in_batches(condition: Q, batch_size: int) -> int:
+        """
+        Delete notifications matching ``condition`` a batch at a time.
+
+        Each batch is one short statement over at most ``batch_size``
+        primary keys, and the next batch continues after the last key,
+        so the table is read in a single pass.
+        """
+        deleted = 0
+        last_id = 0
+        while True:
+            ids = list(
+                Notification.objects.filter(condition, pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            last_id = ids[-1]
+            deleted += Notification.objects.filter(pk__in=ids).delete()[0]
+
+    @staticmethod
+    def prune_notifications(
+        max_age_days: int = None,
+        max_per_user: int = None,
+        keep_unread: bool = None,
+        batch_size: int = None,
+    ) -> dict:
+        """
+        Enforce the notification retention policy.
+
+        Deletes notifications older than ``max_age_days``, and each user's
+        notifications beyond their newest ``max_per_user``. With
+        ``keep_unread`` unread notifications are never deleted; a
+        ``max_per_user`` of 0 prunes all of them. Arguments default to the
+        ``NOTIFICATION_*`` settings; a setting of None disables that rule.
+
+        Returns:
+            Rows deleted per rule: ``{"expired": ..., "over_limit": ...}``
+        """
+        if max_age_days is None:
+            max_age_days = settings.NOTIFICATION_MAX_AGE_DAYS
+        if max_per_user is None:
+            max_per_user = settings.NOTIFICATION_MAX_PER_USER
+        if keep_unread is None:
+            keep_unread = settings.NOTIFICATION_KEEP_UNREAD
+        batch_size = batch_size or settings.NOTIFICATION_PRUNE_BATCH_SIZE
+        prunable = Q(is_read=True) if keep_unread else Q()
+        stats = {"expired": 0, "over_limit": 0}
+
+        if max_age_days is not None:
+            cutoff = timezone.now() - timedelta(days=max_age_days)
+            stats["expired"] = NotificationService._delete_in_batches(
+                prunable & Q(created_at__lt=cutoff), batch_size
+            )
+
+        if max_per_user is not None:
+            if max_per_user < 0:
+                raise ValueError("max_per_user must not be negative")
+            heavy_users = (
+                Notification.objects.order_by()
+                .values("user_id")
+                .annotate(total=Count("pk"))
+                .filter(total__gt=max_per_user)
+                .values_list("user_id", flat=True)
+            )
+            for user_id in list(heavy_users):
+                older = Q()
+                if max_per_user:
+                    # The oldest notification the user keeps
+                    created_at, pk = (
+                        Notification.objects.filter(user_id=user_id)
+                        .order_by("-created_at", "-pk")
+                        .values_list("created_at", "pk")[max_per_user - 1]
+                    )
+                    older = Q(created_at__lt=created_at) | Q(
+                        created_at=created_at, pk__lt=pk
+                    )
+                condition = prunable & Q(user_id=user_id) & older
+                stats["over_limit"] += NotificationService._delete_in_batches(
+                    condition, batch_size
+                )
+
+        metrics.increment("notifications.pruned_expired", stats["expired"])
+        metrics.increment(
+            "notifications.pruned_over_limit", stats["over_limit"]
+        )
+        metrics.set_gauge(
+            "notifications.pruned_last_run",
+            stats["expired"] + stats["over_limit"],
+        )
+        return stats
@@ -0,0 +1,376 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, DateTimeField, Q, Value, When
+from django.utils import timezone
+
+from elearning import metrics
+from elearning.models import ChatParticipant
+
+
+class _PresenceBuffers:
+    """
+    Per-process buffers for presence diffs and pending last_seen_at writes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (chat_room_id, user_id) -> datetime
+        self.last_seen = {}
+        # group_name -> {user_id: is_online}
+        self.diffs = {}
+        self.diff_tasks = {}
+        self.flush_task = None
+        self.local_connections = 0
+
+
+_buffers = _PresenceBuffers()
+
+
+class PresenceService:
+    """
+    Service for tracking online presence in chat rooms.
+
+    Live state is kept in the shared cache so every worker sees the same
+    presence. Each websocket channel has its own key expiring after
+    ``PRESENCE_TTL`` seconds without a heartbeat, so a heartbeat only
+    extends that key. The room's channel -> user map is rewritten, under a
+    short per-room lock, only when a channel joins or leaves; members whose
+    key expired are pruned then and ignored on reads.
+
+    Presence changes are coalesced per room for ``PRESENCE_DIFF_WINDOW``
+    seconds and broadcast as a single diff. ``ChatParticipant.last_seen_at``
+    is buffered in memory and written in one bulk UPDATE every
+    ``PRESENCE_FLUSH_INTERVAL`` seconds instead of once per event.
+    """
+
+    GLOBAL_ROOM = "global"
+
+    # --- Live state ---
+
+    @staticmethod
+    def _room_key(room_key) -> str:
+        return f"presence:{room_key}"
+
+    @staticmethod
+    def _member_key(room_key, channel_name: str) -> str:
+        return f"presence:{room_key}:channel:{channel_name}"
+
+    @staticmethod
+    def _alive(room_key, members: dict) -> dict:
+        """Keep the channels of ``members`` whose key hasn't expired"""
+        if not members:
+            return {}
+        keys = {
+            PresenceService._member_key(room_key, channel): channel
+            for channel in members
+        }
+        live = cache.get_many(list(keys))
+        return {keys[key]: members[keys[key]] for key in live}
+
+    @staticmethod
+    def _online_ids(members: dict) -> set:
+        return set(members.values())
+
+    @staticmethod
+    def _update_room(room_key, mutate) -> tuple[set, set]:
+        """
+        Read-modify-write a room's member map under a short cache lock.
+
+        Returns:
+            Tuple of (online user ids before, online user ids after)
+
+        Raises:
+            TimeoutError: If the lock stays busy for ``PRESENCE_LOCK_WAIT``
+                seconds; the map is left unchanged
+        """
+        key = PresenceService._room_key(room_key)
+        lock_key = f"{key}:lock"
+        # Wait past the lock's own timeout, so a lock left by a crashed
+        # worker expires; never write without it, or updates get lost
+        deadline = time.monotonic() + settings.PRESENCE_LOCK_WAIT
+        delay = 0.005
+        while not cache.add(lock_key, 1, timeout=2):
+            if time.monotonic() >= deadline:
+                metrics.increment("presence.lock_timeouts")
+                raise TimeoutError(f"Presence lock for {room_key} is busy")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+        try:
+            members = PresenceService._alive(room_key, cache.get(key) or {})
+            before = PresenceService._online_ids(members)
+            mutate(members)
+            after = PresenceService._online_ids(members)
+            if members:
+                ttl = settings.PRESENCE_TTL * 2
+                cache.set(key, members, timeout=ttl)
+            else:
+                cache.delete(key)
+            return before, after
+        finally:
+            cache.delete(lock_key)
+
+    @staticmethod
+    def mark_online(room_key, user_id: int, channel_name: str) -> bool:
+        """
+        Register a channel's presence in a room.
+
+        Returns:
+            bool: True if the user was not online before
+        """
+        member_key = PresenceService._member_key(room_key, channel_name)
+
+        def mutate(members):
+            # Set under the lock, after an expired key was pruned
+            ttl = settings.PRESENCE_TTL
+            cache.set(member_key, user_id, timeout=ttl)
+            members[channel_name] = user_id
+
+        before, after = PresenceService._update_room(room_key, mutate)
+        return user_id not in before
+
+    @staticmethod
+    def refresh(room_key, user_id: int, channel_name: str) -> bool:
+        """
+        Extend a channel's presence without touching the member map.
+
+        Returns:
+            bool: True if the channel had expired and was registered again
+        """
+        ttl = settings.PRESENCE_TTL
+        member_key = PresenceService._member_key(room_key, channel_name)
+        if cache.touch(member_key, ttl):
+            cache.touch(PresenceService._room_key(room_key), ttl * 2)
+            return False
+        return PresenceService.mark_online(room_key, user_id, channel_name)
+
+    @staticmethod
+    def mark_offline(room_key, user_id: int, channel_name: str) -> bool:
+        """
+        Remove a channel's presence from a room.
+
+        Returns:
+            bool: True if the user has no remaining connections in the room
+        """
+        cache.delete(PresenceService._member_key(room_key, channel_name))
+
+        def mutate(members):
+            members.pop(channel_name, None)
+
+        before, after = PresenceService._update_room(room_key, mutate)
+        return user_id not in after
+
+    @staticmethod
+    def get_online_user_ids(room_key) -> list[int]:
+        """Get ids of users currently online in a room"""
+        members = cache.get(PresenceService._room_key(room_key)) or {}
+        alive = PresenceService._alive(room_key, members)
+        return sorted(PresenceService._online_ids(alive))
+
+    @staticmethod
+    async def aget_online_user_ids(room_key) -> list[int]:
+        """Async version of get_online_user_ids"""
+        return await sync_to_async(
+            PresenceService.get_online_user_ids, thread_sensitive=False
+        )(room_key)
+
+    @staticmethod
+    def is_online(user_id: int) -> bool:
+        """Check whether a user has any live notification connection"""
+        online = PresenceService.get_online_user_ids(
+            PresenceService.GLOBAL_ROOM
+        )
+        return user_id in online
+
+    # --- Consumer hooks ---
+
+    @staticmethod
+    async def _aupdate(mark, room_key, user_id, channel_name) -> bool:
+        """
+        Run a presence update off the event loop.
+
+        Cache calls don't need Django's shared sync thread, so they don't
+        queue behind database work. A busy lock skips the update; the
+        next heartbeat or the TTL puts the entry right.
+        """
+        try:
+            return await sync_to_async(mark, thread_sensitive=False)(
+                room_key, user_id, channel_name
+            )
+        except TimeoutError:
+            return False
+
+    @staticmethod
+    async def connect(room_key, user_id, channel_name, group_name=None):
+        """Track a new connection and announce the user if newly online"""
+        _buffers.local_connections += 1
+        came_online = await PresenceService._aupdate(
+            PresenceService.mark_online, room_key, user_id, channel_name
+        )
+        if came_online and group_name:
+            PresenceService._queue_diff(group_name, user_id, True)
+        PresenceService._ensure_flusher()
+
+    @staticmethod
+    async def heartbeat(room_key, user_id, channel_name, chat_room_id=None):
+        """Refresh a connection's TTL and buffer its last_seen_at"""
+        await PresenceService._aupdate(
+            PresenceService.refresh, room_key, user_id, channel_name
+        )
+        if chat_room_id is not None:
+            PresenceService.record_last_seen(chat_room_id, user_id)
+        metrics.increment("presence.heartbeats")
+
+    @staticmethod
+    async def disconnect(
+        room_key, user_id, channel_name, group_name=None, chat_room_id=None
+    ):
+        """Drop a connection, announcing the user if now offline"""
+        _buffers.local_connections = max(0, _buffers.local_connections - 1)
+        went_offline = await PresenceService._aupdate(
+            PresenceService.mark_offline, room_key, user_id, channel_name
+        )
+        if chat_room_id is not None:
+            PresenceService.record_last_seen(chat_room_id, user_id)
+        if went_offline and group_name:
+            PresenceService._queue_diff(group_name, user_id, False)
+
+        if _buffers.local_connections == 0:
+            # Nothing left to keep the background tasks alive for
+            if _buffers.flush_task and not _buffers.flush_task.done():
+                _buffers.flush_task.cancel()
+            await PresenceService._flush_all_diffs()
+            await database_sync_to_async(PresenceService.flush_last_seen)()
+
+    # --- Coalesced diffs ---
+
+    @staticmethod
+    def _queue_diff(group_name: str, user_id: int, is_online: bool):
+        with _buffers.lock:
+            pending = _buffers.diffs.setdefault(group_name, {})
+            if pending.get(user_id) is (not is_online):
+                # Joined and left (or the reverse) within one window
+                del pending[user_id]
+                metrics.increment("presence.diffs_coalesced")
+            else:
+                pending[user_id] = is_online
+
+        task = _buffers.diff_tasks.get(group_name)
+        if task is None or task.done():
+            _buffers.diff_tasks[group_name] = asyncio.ensure_future(
+                PresenceService._flush_diff_later(group_name)
+            )
+
+    @staticmethod
+    async def _flush_diff_later(group_name: str):
+        await asyncio.sleep(settings.PRESENCE_DIFF_WINDOW)
+        await PresenceService._flush_diff(group_name)
+
+    @staticmethod
+    async def _flush_diff(group_name: str):
+        with _buffers.lock:
+            pending = _buffers.diffs.pop(group_name, {})
+        if not pending:
+            return
+
+        online = sorted(uid for uid, on in pending.items() if on)
+        offline = sorted(uid for uid, on in pending.items() if not on)
+        await get_channel_layer().group_send(
+            group_name,
+            {
+                "type": "presence_diff",
+                "group": group_name,
+                "online": online,
+                "offline": offline,
+            },
+        )
+        metrics.increment("presence.diffs_sent")
+
+    @staticmethod
+    async def _flush_all_diffs():
+        current = asyncio.current_task()
+        for group_name, task in list(_buffers.diff_tasks.items()):
+            if task is not current and not task.done():
+                task.cancel()
+            await PresenceService._flush_diff(group_name)
+        _buffers.diff_tasks.clear()
+
+    # --- Batched last_seen_at ---
+
+    @staticmethod
+    def record_last_seen(chat_room_id: int, user_id: int, seen_at=None):
+        """Buffer a last_seen_at write for the next bulk flush"""
+        with _buffers.lock:
+            _buffers.last_seen[(int(chat_room_id), user_id)] = (
+                seen_at or timezone.now()
+            )
+            pending = len(_buffers.last_seen)
+        metrics.set_gauge("presence.last_seen_pending", pending)
+
+    @staticmethod
+    def flush_last_seen(batch_size: int = 500) -> int:
+        """
+        Write buffered last_seen_at values with one UPDATE per batch.
+
+        Returns:
+            int: Number of participant rows updated
+        """
+        with _buffers.lock:
+            items = list(_buffers.last_seen.items())
+
+        updated = 0
+        for start in range(0, len(items), batch_size):
+            batch = items[start : start + batch_size]
+            condition = Q()
+            whens = []
+            for (room_id, user_id), seen_at in batch:
+                condition |= Q(chat_room_id=room_id, user_id=user_id)
+                whens.append(
+                    When(
+                        chat_room_id=room_id,
+                        user_id=user_id,
+                        then=Value(seen_at),
+                    )
+                )
+            updated += ChatParticipant.objects.filter(condition).update(
+                last_seen_at=Case(*whens, output_field=DateTimeField())
+            )
+
+            # Unbuffer only what was written; a failed batch stays for the
+            # next flush, and values recorded meanwhile aren't dropped
+            with _buffers.lock:
+                for key, seen_at in batch:
+                    if _buffers.last_seen.get(key) == seen_at:
+                        del _buffers.last_seen[key]
+                pending = len(_buffers.last_seen)
+            metrics.set_gauge("presence.last_seen_pending", pending)
+
+        if updated:
+            metrics.increment("presence.last_seen_rows_flushed", updated)
+        return updated
+
+    @staticmethod
+    def _ensure_flusher():
+        task = _buffers.flush_task
+        if task is None or task.done():
+            _buffers.flush_task = asyncio.ensure_future(
+                PresenceService._flush_loop()
+            )
+
+    @staticmethod
+    async def _flush_loop():
+        interval = settings.PRESENCE_FLUSH_INTERVAL
+        while _buffers.local_connections > 0:
+            await asyncio.sleep(interval)
+            try:
+                await database_sync_to_async(PresenceService.flush_last_seen)()
+            except Exception:
+                # The values stay buffered for the next attempt
+                metrics.increment("presence.last_seen_flush_errors")
@@ -0,0 +1,186 @@
+import json
+import os
+import time
+
+from django.conf import settings
+
+from elearning import metrics
+from elearning.models import File
+
+
+class StorageGCService:
+    """
+    Mark-and-sweep garbage collection for private course storage.
+
+    The storage tree is walked one directory at a time with ``os.scandir``
+    in a fixed (sorted, depth-first) order. For each directory the live
+    paths are streamed from ``File`` rows under that prefix, so memory is
+    bounded by the largest directory rather than the whole tree. Files no
+    row references and older than ``STORAGE_GC_GRACE_SECONDS`` are
+    deleted.
+
+    A sweep can stop after a file budget; the last finished directory is
+    saved to ``STORAGE_GC_CHECKPOINT_FILE`` and the next sweep continues
+    after it. A sweep that reaches the end of the tree clears the
+    checkpoint, so the next one starts a new pass.
+    """
+
+    @staticmethod
+    def _storage():
+        return File._meta.get_field("file").storage
+
+    # --- Checkpoint ---
+
+    @staticmethod
+    def load_checkpoint():
+        """Get the directory (as path parts) the last sweep finished at"""
+        try:
+            with open(settings.STORAGE_GC_CHECKPOINT_FILE) as f:
+                return tuple(json.load(f)["after"])
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def save_checkpoint(parts):
+        path = settings.STORAGE_GC_CHECKPOINT_FILE
+        if parts is None:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"after": list(parts), "saved_at": time.time()}, f)
+        os.replace(tmp_path, path)
+
+    # --- Mark ---
+
+    @staticmethod
+    def walk(root, start_after=None):
+        """
+        Yield ``(parts, file_entries)`` for every directory under ``root``
+        in sorted depth-first order, skipping directories up to and
+        including ``start_after``. Dotfiles are ignored.
+        """
+        stack = [()]
+        while stack:
+            parts = stack.pop()
+            try:
+                with os.scandir(os.path.join(root, *parts)) as it:
+                    entries = sorted(
+                        (e for e in it if not e.name.startswith(".")),
+                        key=lambda e: e.name,
+                    )
+            except FileNotFoundError:
+                continue
+
+            for entry in reversed(entries):
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                child = parts + (entry.name,)
+                # Whole subtrees before the checkpoint are already swept
+                if (
+                    start_after is not None
+                    and child < start_after
+                    and start_after[: len(child)] != child
+                ):
+                    continue
+                stack.append(child)
+
+            if start_after is None or parts > start_after:
+                yield parts, [
+                    e for e in entries if e.is_file(follow_symlinks=False)
+                ]
+
+    @staticmethod
+    def live_names(prefix: str) -> set:
+        """Names of files referenced by File rows directly under prefix"""
+        names = (
+            File.objects.filter(file__startswith=prefix)
+            .values_list("file", flat=True)
+            .iterator(chunk_size=2000)
+        )
+        return {name for name in names if "/" not in name[len(prefix) :]}
+
+    # --- Sweep ---
+
+    @staticmethod
+    def sweep(
+        dry_run=False, grace_seconds=None, max_files=None, on_orphan=None
+    ) -> dict:
+        """
+        Sweep unreferenced files from private storage.
+
+        Args:
+            dry_run: Report what would be deleted without deleting or
+                moving the checkpoint
+            grace_seconds: Minimum age of a file before it can be swept
+            max_files: Stop at the first directory boundary after this
+                many files have been scanned
+            on_orphan: Optional callable receiving (name, size, deleted)
+
+        Returns:
+            Dict of counters, with ``complete`` set if the pass finished
+        """
+        if grace_seconds is None:
+            grace_seconds = settings.STORAGE_GC_GRACE_SECONDS
+        cutoff = time.time() - grace_seconds
+        storage = StorageGCService._storage()
+        start_after = StorageGCService.load_checkpoint()
+
+        stats = {
+            "directories": 0,
+            "scanned": 0,
+            "live": 0,
+            "recent": 0,
+            "orphaned": 0,
+            "orphaned_bytes": 0,
+            "deleted": 0,
+            "complete": True,
+        }
+        finished = start_after
+        for parts, entries in StorageGCService.walk(
+            storage.location, start_after
+        ):
+            # Stop only once there is another directory left to sweep
+            if max_files is not None and stats["scanned"] >= max_files:
+                stats["complete"] = False
+                break
+
+            prefix = "".join(f"{part}/" for part in parts)
+            live = StorageGCService.live_names(prefix) if entries else set()
+
+            for entry in entries:
+                stats["scanned"] += 1
+                name = prefix + entry.name
+                if name in live:
+                    stats["live"] += 1
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                if stat.st_mtime > cutoff:
+                    stats["recent"] += 1
+                    continue
+
+                stats["orphaned"] += 1
+                stats["orphaned_bytes"] += stat.st_size
+                if not dry_run:
+                    storage.delete(name)
+                    stats["deleted"] += 1
+                if on_orphan:
+                    on_orphan(name, stat.st_size, not dry_run)
+
+            stats["directories"] += 1
+            finished = parts
+
+        if not dry_run:
+            StorageGCService.save_checkpoint(
+                None if stats["complete"] else finished
+            )
+        if stats["deleted"]:
+            metrics.increment("storage_gc.files_deleted", stats["deleted"])
+            metrics.increment(
+                "storage_gc.bytes_deleted", stats["orphaned_bytes"]
+            )
+        return stats
@@ -1,6 +1,32 @@
-from elearning.models import User
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from elearning.cache import CacheNamespace
+from elearning.models import Course, Enrollment, User
 from elearning.exceptions import ServiceError
 from elearning.permissions import UserPolicy
+from elearning.services.deletion_service import DeletionService
+
+# Per-user profile counts, dropped whenever a row feeding them changes
+USER_STATS_CACHE = CacheNamespace(
+    "user_stats",
+    ttl=300,
+    depends_on={
+        User: lambda user: [user.pk],
+        # A reassigned course changes both teachers' counts
+        Course: lambda course: {
+            course.teacher_id,
+            getattr(course, "_loaded_teacher_id", None),
+        },
+        Enrollment: lambda enrollment: [enrollment.user_id],
+    },
+)
+
+# Users loaded for session/token authentication, keyed by pk
+USER_AUTH_CACHE = CacheNamespace(
+    "auth_user",
+    ttl=900,
+    depends_on={User: lambda user: [user.pk]},
+)
 
 
 class UserService:
@@ -23,7 +49,7 @@ class UserService:
             ServiceError: If user not found
         """
         try:
-            return User.objects.get(username=username)
+            return User.objects.get(username=username, is_active=True)
         except User.DoesNotExist:
             raise ServiceError.not_found(f"User '{username}' not found")
 
@@ -51,7 +77,7 @@ class UserService:
     def get_user_with_permission_check(user_id: int, requesting_user: User):
         """Get user with permission check"""
         try:
-            user = User.objects.get(id=user_id)
+            user = User.objects.get(id=user_id, is_active=True)
             # Check if requesting user can view this profile
             UserPolicy.check_can_view_profile(
                 requesting_user, user, raise_exception=True
@@ -74,6 +100,8 @@ class UserService:
                 setattr(user, field, value)
 
         user.save()
+        # Write through so the next authenticated request sees the change
+        UserService.cache_auth_user(user)
         return user
 
     @staticmethod
@@ -84,27 +112,113 @@ class UserService:
             requesting_user, target_user, raise_exception=True
         )
 
-        # Delete the user
-        target_user.delete()
+        # Deactivate the user now; a worker deletes everything they own
+        DeletionService.schedule_user_deletion(
+            target_user, requested_by=requesting_user
+        )
+        USER_AUTH_CACHE.invalidate(target_user.pk)
+
+    @staticmethod
+    def get_auth_user(user_id):
+        """
+        Load a user for authentication through the shared cache.
+
+        Entries are dropped whenever the user is saved or deleted, so a
+        steady-state authenticated request needs no user query.
+        """
+        return USER_AUTH_CACHE.get_or_set(
+            (int(user_id),),
+            lambda: User.objects.filter(pk=user_id).first(),
+        )
+
+    @staticmethod
+    def cache_auth_user(user: User):
+        """Store a freshly loaded or updated user for authentication"""
+        USER_AUTH_CACHE.set((user.pk,), user)
+
+    @staticmethod
+    def _count_subquery(queryset, field: str):
+        """Correlated COUNT over ``queryset`` grouped by ``field``"""
+        counts = (
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    @staticmethod
+    def annotate_computed_fields(queryset):
+        """
+        Annotate a user queryset with the counts used by serializers.
+
+        Counts are correlated subqueries, so loading one user costs a single
+        query no matter how many users or courses exist.
+        """
+        return queryset.annotate(
+            _courses_taught_count=UserService._count_subquery(
+                Course.objects.all(), "teacher"
+            ),
+            _courses_enrolled_count=UserService._count_subquery(
+                Enrollment.objects.filter(
+                    is_active=True, course__deleted_at__isnull=True
+                ),
+                "user",
+            ),
+        )
+
+    @staticmethod
+    def get_user_with_computed_fields(username: str):
+        """
+        Get a single user by username with computed fields populated.
+
+        Args:
+            username: Username string
+
+        Returns:
+            User instance with computed fields
+
+        Raises:
+            ServiceError: If user not found
+        """
+        # Deactivated users are hidden until their deletion job runs
+        try:
+            user = User.objects.get(username=username, is_active=True)
+        except User.DoesNotExist:
+            raise ServiceError.not_found(f"User '{username}' not found")
+
+        # Counts are read through the per-user cache
+        return UserService.populate_user_computed_fields(user)
+
+    @staticmethod
+    @USER_STATS_CACHE.cached(key=lambda user_id: user_id)
+    def get_user_counts(user_id: int) -> dict:
+        """Get (cached) course counts for a user"""
+        queryset = User.objects.filter(pk=user_id)
+        counts = (
+            UserService.annotate_computed_fields(queryset)
+            .values("_courses_taught_count", "_courses_enrolled_count")
+            .first()
+        ) or {}
+        return {
+            "courses_taught_count": counts.get("_courses_taught_count", 0),
+            "courses_enrolled_count": counts.get(
+                "_courses_enrolled_count", 0
+            ),
+        }
 
     @staticmethod
     def populate_user_computed_fields(user: User):
         """Populate computed fields for user serialization"""
-        # Get course counts
-        user._courses_taught_count = user.courses_taught.count()
-        user._courses_enrolled_count = user.enrollments.filter(
-            is_active=True
-        ).count()
-
+        counts = UserService.get_user_counts(user.pk)
+        user._courses_taught_count = counts["courses_taught_count"]
+        user._courses_enrolled_count = counts["courses_enrolled_count"]
         return user
 
     @staticmethod
     def get_users_with_computed_fields():
-        """Get users with computed fields populated"""
-        users = User.objects.all()
-
-        # Populate computed fields for each user
-        for user in users:
-            UserService.populate_user_computed_fields(user)
-
-        return users
+        """Get a lazy user queryset with computed fields annotated"""
+        return UserService.annotate_computed_fields(
+            User.objects.filter(is_active=True)
+        )
@@ -1,6 +1,5 @@
 from django.db.models.signals import post_save, pre_delete, post_delete
 from django.dispatch import receiver
-from django.core.files.storage import default_storage
 from .models import (
     Enrollment,
     ChatRoom,
@@ -9,6 +8,7 @@ from .models import (
     StudentRestriction,
 )
 from elearning.services.courses import CourseStudentRestrictionService
+from elearning.upsert import upsert
 
 
 @receiver(post_save, sender=Enrollment)
@@ -23,15 +23,12 @@ def sync_user_course_chat(sender, instance, created, **kwargs):
 
     if instance.is_active:
         # User is enrolled and active - add/activate them in course chat
-        participant, created = ChatParticipant.objects.get_or_create(
-            chat_room=chatroom,
-            user=instance.user,
-            defaults={"role": "participant", "is_active": True},
+        upsert(
+            ChatParticipant,
+            match={"chat_room": chatroom, "user": instance.user},
+            values={"role": "participant", "is_active": True},
+            update_fields=["is_active"],
         )
-        # If participant exists but is inactive, reactivate them
-        if not created and not participant.is_active:
-            participant.is_active = True
-            participant.save(update_fields=["is_active"])
     else:
         # User is not enrolled or enrollment is inactive - deactivate them in
         # course chat
@@ -65,8 +62,9 @@ def delete_file_on_model_delete(sender, instance, **kwargs):
     """
     if instance.file:
         try:
-            # Delete the physical file using Django's storage backend
-            default_storage.delete(instance.file.name)
+            # Delete through the field's own (private) storage; anything
+            # missed here is swept by the gc_private_storage command
+            instance.file.storage.delete(instance.file.name)
         except Exception as e:
             print(f"Error deleting file {instance.file.name}: {e}")
             pass
@@ -0,0 +1,142 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from elearning.models import (
+    ArchivedChatMessage,
+    ChatMessage,
+    ChatParticipant,
+    ChatRoom,
+    User,
+)
+from elearning.tests.test_base import BaseAPITestCase, debug_on_failure
+from rest_framework import status
+
+
+class ChatArchiveTest(BaseAPITestCase):
+    """Test archiving cold messages and reading history across tiers"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="testpass",
+            role="student",
+        )
+        self.chat_room = ChatRoom.objects.create(
+            name="Test Chat Room",
+            created_by=self.user,
+            chat_type="group",
+            is_public=True,
+        )
+        self.participant = ChatParticipant.objects.create(
+            user=self.user, chat_room=self.chat_room
+        )
+
+        # 15 messages a year old, then 10 from the last few hours
+        now = timezone.now()
+        self.messages = ChatMessage.objects.bulk_create(
+            ChatMessage(
+                chat_room=self.chat_room,
+                sender=self.user,
+                content=f"Message {i}",
+            )
+            for i in range(25)
+        )
+        for i, message in enumerate(self.messages):
+            if i < 15:
+                age = timedelta(days=365 - i)
+            else:
+                age = timedelta(hours=25 - i)
+            ChatMessage.objects.filter(pk=message.pk).update(
+                created_at=now - age, updated_at=now - age
+            )
+
+        self.participant.last_read_message = self.messages[3]
+        self.participant.save()
+
+    @debug_on_failure
+    def test_archives_old_messages_in_batches(self):
+        out = StringIO()
+        call_command(
+            "archive_chat_messages",
+            older_than_days=30,
+            batch_size=4,
+            verbosity=2,
+            stdout=out,
+        )
+
+        # The read marker's message stays hot
+        self.assertEqual(ArchivedChatMessage.objects.count(), 14)
+        self.assertEqual(
+            set(ChatMessage.objects.values_list("pk", flat=True)),
+            {self.messages[3].pk} | {m.pk for m in self.messages[15:]},
+        )
+        self.assertEqual(out.getvalue().count("archived 4 messages"), 3)
+        self.assertIn("Archived 14 messages", out.getvalue())
+
+        archived = ArchivedChatMessage.objects.get(pk=self.messages[0].pk)
+        self.assertEqual(archived.content, "Message 0")
+        self.assertEqual(archived.sender, self.user)
+
+        # Nothing left to move
+        call_command("archive_chat_messages", older_than_days=30, stdout=out)
+        self.assertIn("Archived 0 messages", out.getvalue())
+
+    @debug_on_failure
+    def test_history_pages_across_hot_and_archived(self):
+        call_command(
+            "archive_chat_messages", older_than_days=30, stdout=StringIO()
+        )
+        self.client.force_authenticate(user=self.user)
+
+        url = f"/api/chats/{self.chat_room.id}/messages/"
+        contents = []
+        while url:
+            response = self.log_response(self.client.get(url))
+            self.assertStatusCode(response, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 25)
+            contents += [m["content"] for m in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(
+            contents, [f"Message {i}" for i in reversed(range(25))]
+        )
+        self.assertEqual(
+            response.data["results"][-1]["sender"]["username"], "testuser"
+        )
+
+    @debug_on_failure
+    def test_async_list_matches_sync_list(self):
+        call_command(
+            "archive_chat_messages", older_than_days=30, stdout=StringIO()
+        )
+        self.client.force_login(self.user)
+
+        for page in (1, 3):
+            sync_response = self.client.get(
+                f"/api/chats/{self.chat_room.id}/messages/?page={page}"
+            )
+            response = self.log_response(
+                self.client.get(
+                    f"/api/async/chats/{self.chat_room.id}/messages/"
+                    f"?page={page}"
+                )
+            )
+            self.assertStatusCode(response, status.HTTP_200_OK)
+            # Page links differ only by the async path prefix
+            for field in ("count", "results"):
+                self.assertEqual(
+                    response.json()[field], sync_response.json()[field]
+                )
+            self.assertEqual(response.json()["count"], 25)
+
+    @debug_on_failure
+    def test_room_deletion_removes_archived_messages(self):
+        call_command(
+            "archive_chat_messages", older_than_days=30, stdout=StringIO()
+        )
+        self.chat_room.delete()
+        self.assertFalse(ArchivedChatMessage.objects.exists())
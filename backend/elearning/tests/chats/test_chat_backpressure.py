@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+
+from elearning import metrics
+from elearning.consumers.outbound import OutboundQueueMixin
+from elearning.tests.test_base import debug_on_failure
+
+
+class _SlowClient(OutboundQueueMixin):
+    """Consumer stand-in whose sends block until the gate opens"""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.sent = []
+        self.close_code = None
+
+    async def send(self, text_data=None):
+        await self.gate.wait()
+        self.sent.append(json.loads(text_data))
+
+    async def close(self, code=None):
+        self.close_code = code
+
+    async def flush(self):
+        self.gate.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+
+@override_settings(WEBSOCKET_OUTBOUND_QUEUE_SIZE=3)
+class OutboundQueueTestCase(SimpleTestCase):
+    def setUp(self):
+        metrics.reset()
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_coalesced_frames_keep_only_the_latest(self):
+        client = _SlowClient()
+        await client.enqueue({"type": "first"})
+        await asyncio.sleep(0)  # writer takes the first frame and blocks
+        for state in ("typing", "idle", "typing"):
+            await client.enqueue(
+                {"type": "ephemeral", "state": state},
+                policy=client.COALESCE,
+                key=("typing", 1),
+            )
+        await client.flush()
+
+        self.assertEqual(
+            client.sent,
+            [{"type": "first"}, {"type": "ephemeral", "state": "typing"}],
+        )
+        self.assertEqual(metrics.get_counter("websocket.frames_coalesced"), 2)
+        await client.stop_outbound()
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_full_queue_drops_oldest_droppable_frame(self):
+        client = _SlowClient()
+        await client.enqueue({"n": 0})
+        await asyncio.sleep(0)
+        await client.enqueue({"n": 1})
+        await client.enqueue({"n": 2, "seq": 1}, policy=client.RESUME)
+        await client.enqueue({"n": 3})
+        await client.enqueue({"n": 4, "seq": 2}, policy=client.RESUME)
+        await client.flush()
+
+        self.assertEqual([frame["n"] for frame in client.sent], [0, 2, 3, 4])
+        self.assertEqual(metrics.get_counter("websocket.frames_dropped"), 1)
+        self.assertIsNone(client.close_code)
+        await client.stop_outbound()
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_overflow_of_resumable_frames_disconnects(self):
+        client = _SlowClient()
+        client.gate.set()
+        await client.enqueue({"seq": 1}, policy=client.RESUME)
+        await asyncio.sleep(0)
+        client.gate.clear()
+
+        await client.enqueue({"seq": 2}, policy=client.RESUME)
+        await asyncio.sleep(0)  # writer blocks sending seq 2
+        for seq in range(3, 7):
+            await client.enqueue({"seq": seq}, policy=client.RESUME)
+        await client.flush()
+
+        # The in-flight frame wasn't confirmed sent when the queue overflowed
+        self.assertEqual(
+            client.sent[-2:],
+            [{"seq": 2}, {"type": "slow_consumer", "last_seq": 1}],
+        )
+        self.assertEqual(client.close_code, client.SLOW_CONSUMER_CLOSE_CODE)
+        self.assertEqual(metrics.get_counter("websocket.slow_disconnects"), 1)
+        self.assertEqual(metrics.get_counter("websocket.slow_clients"), 1)
+        await client.stop_outbound()
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_queued_gauge_counts_every_consumer_class(self):
+        class _OtherClient(_SlowClient):
+            pass
+
+        first, second = _SlowClient(), _OtherClient()
+        await first.enqueue({"n": 0})
+        await second.enqueue({"n": 1})
+        await second.enqueue({"n": 2})
+
+        gauges = metrics.snapshot()["gauges"]
+        self.assertEqual(gauges["websocket.outbound_queued"], 3)
+        await first.stop_outbound()
+        await second.stop_outbound()
+        gauges = metrics.snapshot()["gauges"]
+        self.assertEqual(gauges["websocket.outbound_queued"], 0)
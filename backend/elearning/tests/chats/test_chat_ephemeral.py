@@ -0,0 +1,155 @@
+import time
+from unittest import mock
+
+from channels.testing import WebsocketCommunicator
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import override_settings
+from elearning.models import ChatRoom, User
+from elearning.services.chats import ChatEphemeralService
+from elearning_project.asgi import test_application
+from elearning.tests.test_base import BaseTestCase, debug_on_failure
+
+
+@override_settings(PRESENCE_DIFF_WINDOW=60)
+class ChatEphemeralEventsTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        ChatEphemeralService._states.clear()
+        self.user = User.objects.create_user(
+            username="typist",
+            email="typist@example.com",
+            password="testpass",
+        )
+        self.other_user = User.objects.create_user(
+            username="reader",
+            email="reader@example.com",
+            password="testpass",
+        )
+        self.chat = ChatRoom.objects.create(
+            name="Public Chat",
+            created_by=self.user,
+            chat_type="group",
+            is_public=True,
+        )
+
+    async def connect(self, user):
+        comm = WebsocketCommunicator(
+            test_application, f"/ws/chat/{self.chat.id}/"
+        )
+        comm.scope["user"] = user
+        connected, _ = await comm.connect()
+        self.assertTrue(connected)
+        await comm.receive_json_from()  # presence_state
+        return comm
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_typing_is_relayed_and_debounced(self):
+        sender = await self.connect(self.user)
+        receiver = await self.connect(self.other_user)
+
+        await sender.send_json_to({"type": "typing", "is_typing": True})
+        event = await receiver.receive_json_from()
+        self.assertEqual(event["type"], "ephemeral")
+        self.assertEqual(event["event"], "typing")
+        self.assertEqual(event["user_id"], self.user.id)
+        self.assertTrue(event["data"]["is_typing"])
+
+        # Same state again within the debounce window is suppressed
+        await sender.send_json_to({"type": "typing", "is_typing": True})
+        self.assertTrue(await receiver.receive_nothing())
+        # The sender never receives its own signal
+        self.assertTrue(await sender.receive_nothing())
+
+        await receiver.disconnect()
+        await sender.disconnect()
+
+    @debug_on_failure
+    @override_settings(EPHEMERAL_BURST=2, EPHEMERAL_RATE=0.001)
+    @async_to_sync
+    async def test_rate_limit_per_user_per_room(self):
+        results = [
+            await ChatEphemeralService.publish(
+                self.chat.id, self.user.id, "read_receipt", {"message_id": i}
+            )
+            for i in range(4)
+        ]
+        self.assertEqual(results, [True, True, False, False])
+
+    @debug_on_failure
+    @override_settings(EPHEMERAL_BURST=1, EPHEMERAL_RATE=0.001)
+    @async_to_sync
+    async def test_dropped_state_is_not_debounced(self):
+        publish = ChatEphemeralService.publish
+        self.assertTrue(
+            await publish(self.chat.id, self.user.id, "typing", {})
+        )
+        # Rate limited, so receivers never saw typing stop
+        stop = {"is_typing": False}
+        self.assertFalse(
+            await publish(self.chat.id, self.user.id, "typing", stop)
+        )
+
+        # Refill the limiter; the unsent state isn't debounced
+        for state in ChatEphemeralService._states.values():
+            state.bucket.tokens = 1.0
+        self.assertTrue(
+            await publish(self.chat.id, self.user.id, "typing", stop)
+        )
+
+    @debug_on_failure
+    @override_settings(EPHEMERAL_BURST=1, EPHEMERAL_RATE=0.001)
+    @async_to_sync
+    async def test_limits_are_per_connection(self):
+        publish = ChatEphemeralService.publish
+        for channel in ("tab-1", "tab-2"):
+            self.assertTrue(
+                await publish(self.chat.id, self.user.id, "ping", {}, channel)
+            )
+        self.assertFalse(
+            await publish(self.chat.id, self.user.id, "ping", {}, "tab-2")
+        )
+
+        # Closing one tab leaves the other's limiter alone
+        ChatEphemeralService.forget(self.chat.id, "tab-1")
+        self.assertFalse(
+            await publish(self.chat.id, self.user.id, "ping", {}, "tab-2")
+        )
+        self.assertTrue(
+            await publish(self.chat.id, self.user.id, "ping", {}, "tab-1")
+        )
+
+    @debug_on_failure
+    @override_settings(EPHEMERAL_DEBOUNCE=1, EPHEMERAL_BURST=1)
+    @async_to_sync
+    async def test_idle_state_is_evicted(self):
+        await ChatEphemeralService.publish(
+            self.chat.id, self.user.id, "ping", {}, "tab-1"
+        )
+        self.assertIn((self.chat.id, "tab-1"), ChatEphemeralService._states)
+
+        later = time.monotonic() + 60
+        with mock.patch(
+            "elearning.services.chats.chat_ephemeral_service.time.monotonic",
+            return_value=later,
+        ):
+            await ChatEphemeralService.publish(
+                self.chat.id, self.user.id, "ping", {}, "tab-2"
+            )
+        self.assertEqual(
+            list(ChatEphemeralService._states), [(self.chat.id, "tab-2")]
+        )
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_invalid_events_are_ignored(self):
+        sent = await ChatEphemeralService.publish(
+            self.chat.id, self.user.id, "read_receipt", {"message_id": "x"}
+        )
+        self.assertFalse(sent)
+        sent = await ChatEphemeralService.publish(
+            self.chat.id, self.user.id, "delete_everything", {}
+        )
+        self.assertFalse(sent)
@@ -1,5 +1,7 @@
+from datetime import timedelta
 from unittest.mock import patch
-from elearning.models import ChatParticipant, ChatRoom, User
+from django.utils import timezone
+from elearning.models import ChatMessage, ChatParticipant, ChatRoom, User
 from elearning.tests.test_base import BaseAPITestCase, debug_on_failure
 from rest_framework import status
 
@@ -93,6 +95,34 @@ class ChatMessageViewsTestCase(BaseAPITestCase):
         resp = self.client.get(f"/api/chats/{private_chat.id}/messages/")
         self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
 
+    @debug_on_failure
+    def test_async_list_checks_access(self, mock_broadcast):
+        """The async message list applies the same access rules"""
+        private_chat = ChatRoom.objects.create(
+            name="Private Chat",
+            created_by=self.user,
+            chat_type="group",
+            is_public=False,
+        )
+        ChatParticipant.objects.create(user=self.user, chat_room=private_chat)
+        ChatMessage.objects.create(
+            chat_room=private_chat, sender=self.user, content="Private msg"
+        )
+        url = f"/api/async/chats/{private_chat.id}/messages/"
+
+        self.client.force_login(self.teacher)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_login(self.user)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            resp.json(),
+            self.client.get(f"/api/chats/{private_chat.id}/messages/").json(),
+        )
+        self.assertEqual(resp.json()["results"][0]["content"], "Private msg")
+
     @debug_on_failure
     def test_public_chat_allows_unauthenticated_read(self, mock_broadcast):
         """Anyone can read messages in public chats"""
@@ -106,3 +136,34 @@ class ChatMessageViewsTestCase(BaseAPITestCase):
         resp = self.client.get(f"/api/chats/{self.chat_room.id}/messages/")
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(resp.data["results"][0]["content"], "Public msg")
+
+    @debug_on_failure
+    def test_updated_since_returns_delta(self, mock_broadcast):
+        """updated_since only returns messages changed after the marker"""
+        old = ChatMessage.objects.create(
+            chat_room=self.chat_room, sender=self.user, content="Old"
+        )
+        ChatMessage.objects.filter(id=old.id).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        marker = timezone.now() - timedelta(minutes=5)
+        ChatMessage.objects.create(
+            chat_room=self.chat_room, sender=self.user, content="New"
+        )
+
+        self.client.force_authenticate(user=self.user)
+        resp = self.log_response(
+            self.client.get(
+                f"/api/chats/{self.chat_room.id}/messages/",
+                {"updated_since": marker.isoformat()},
+            )
+        )
+        self.assertStatusCode(resp, status.HTTP_200_OK)
+        self.assertEqual(resp.data["count"], 1)
+        self.assertEqual(resp.data["results"][0]["content"], "New")
+
+        resp = self.client.get(
+            f"/api/chats/{self.chat_room.id}/messages/",
+            {"updated_since": "yesterday"},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,3 +1,4 @@
+from django.db.models.signals import post_save
 from rest_framework import status
 from elearning.models import User, ChatParticipant
 from elearning.tests.test_base import BaseAPITestCase, debug_on_failure
@@ -84,6 +85,42 @@ class ChatParticipantViewsTestCase(BaseAPITestCase):
         )  # teacher + student2 + student
         self.assertTrue(participants.get(user=self.student).is_active)
 
+    @debug_on_failure
+    def test_rejoin_keeps_role_and_is_idempotent(self):
+        """Joining again reactivates the same row without changing role"""
+        participant = ChatParticipant.objects.create(
+            chat_room_id=self.chat_room_id,
+            user=self.student,
+            role="admin",
+            is_active=False,
+        )
+        saved = []
+
+        def record_role(sender, instance, created, **kwargs):
+            saved.append((instance.role, created))
+
+        post_save.connect(record_role, sender=ChatParticipant)
+        try:
+            for _ in range(2):
+                response = self._add_participant(
+                    None, acting_user=self.student
+                )
+                # The response and receivers see the stored row
+                self.assertEqual(response.data["role"], "admin")
+        finally:
+            post_save.disconnect(record_role, sender=ChatParticipant)
+        self.assertEqual(saved, [("admin", False), ("admin", False)])
+
+        participant.refresh_from_db()
+        self.assertTrue(participant.is_active)
+        self.assertEqual(participant.role, "admin")
+        self.assertEqual(
+            ChatParticipant.objects.filter(
+                chat_room_id=self.chat_room_id, user=self.student
+            ).count(),
+            1,
+        )
+
     @debug_on_failure
     def test_update_participant_role(self):
         """Test updating a participant's role in a chat room"""
@@ -0,0 +1,168 @@
+from unittest import mock
+
+from channels.testing import WebsocketCommunicator
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import override_settings
+from elearning.models import ChatRoom, User, ChatParticipant
+from elearning.services.presence_service import PresenceService
+from elearning_project.asgi import test_application
+from elearning.tests.test_base import BaseTestCase, debug_on_failure
+
+
+@override_settings(PRESENCE_DIFF_WINDOW=0.01)
+class ChatPresenceTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="participant",
+            email="participant@example.com",
+            password="testpass",
+            role="student",
+        )
+        self.other_user = User.objects.create_user(
+            username="other",
+            email="other@example.com",
+            password="testpass",
+            role="student",
+        )
+        self.chat = ChatRoom.objects.create(
+            name="Public Chat",
+            created_by=self.user,
+            chat_type="group",
+            is_public=True,
+        )
+        self.participant = ChatParticipant.objects.create(
+            user=self.user, chat_room=self.chat
+        )
+        self.other_participant = ChatParticipant.objects.create(
+            user=self.other_user, chat_room=self.chat
+        )
+
+    def communicator(self, user):
+        comm = WebsocketCommunicator(
+            test_application, f"/ws/chat/{self.chat.id}/"
+        )
+        comm.scope["user"] = user
+        return comm
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_presence_state_heartbeat_and_diff(self):
+        comm1 = self.communicator(self.user)
+        connected, _ = await comm1.connect()
+        self.assertTrue(connected)
+        state = await comm1.receive_json_from()
+        self.assertEqual(state["type"], "presence_state")
+        self.assertEqual(state["online"], [self.user.id])
+
+        comm2 = self.communicator(self.other_user)
+        await comm2.connect()
+        state = await comm2.receive_json_from()
+        self.assertEqual(
+            sorted(state["online"]), sorted([self.user.id, self.other_user.id])
+        )
+
+        # First client receives a coalesced diff for both joins
+        diff = await comm1.receive_json_from()
+        self.assertEqual(diff["type"], "presence")
+        self.assertIn(self.other_user.id, diff["online"])
+
+        # Frames that aren't JSON objects are ignored
+        for frame in ("1", '"x"', "[]"):
+            await comm1.send_to(text_data=frame)
+        await comm1.send_json_to({"type": "heartbeat"})
+        ack = await comm1.receive_json_from()
+        self.assertEqual(ack["type"], "heartbeat_ack")
+
+        await comm2.disconnect()
+        await comm1.disconnect()
+
+    @debug_on_failure
+    def test_disconnect_flushes_last_seen(self):
+        @async_to_sync
+        async def connect_and_leave():
+            comm = self.communicator(self.user)
+            await comm.connect()
+            await comm.receive_json_from()
+            await comm.disconnect()
+
+        connect_and_leave()
+        self.participant.refresh_from_db()
+        self.assertIsNotNone(self.participant.last_seen_at)
+        self.assertEqual(PresenceService.get_online_user_ids(self.chat.id), [])
+
+    @debug_on_failure
+    def test_last_seen_flush_is_a_single_update(self):
+        PresenceService.record_last_seen(self.chat.id, self.user.id)
+        PresenceService.record_last_seen(self.chat.id, self.other_user.id)
+
+        with self.assertNumQueries(1):
+            updated = PresenceService.flush_last_seen()
+
+        self.assertEqual(updated, 2)
+        self.other_participant.refresh_from_db()
+        self.assertIsNotNone(self.other_participant.last_seen_at)
+
+    @override_settings(PRESENCE_LOCK_WAIT=0.05)
+    @debug_on_failure
+    def test_busy_lock_fails_update_without_writing(self):
+        PresenceService.mark_online(self.chat.id, self.user.id, "channel-1")
+        lock_key = f"{PresenceService._room_key(self.chat.id)}:lock"
+        cache.set(lock_key, 1, timeout=30)
+
+        with self.assertRaises(TimeoutError):
+            PresenceService.mark_online(
+                self.chat.id, self.other_user.id, "channel-2"
+            )
+        # The lock holder's view wasn't overwritten, nor the lock dropped
+        self.assertEqual(
+            PresenceService.get_online_user_ids(self.chat.id), [self.user.id]
+        )
+        self.assertEqual(cache.get(lock_key), 1)
+
+    @debug_on_failure
+    def test_heartbeat_leaves_member_map_alone(self):
+        PresenceService.mark_online(self.chat.id, self.user.id, "channel-1")
+        PresenceService.mark_online(
+            self.chat.id, self.other_user.id, "channel-2"
+        )
+
+        with mock.patch.object(PresenceService, "_update_room") as update:
+            came_back = PresenceService.refresh(
+                self.chat.id, self.user.id, "channel-1"
+            )
+        self.assertFalse(came_back)
+        update.assert_not_called()
+
+        # A channel whose key expired drops out, and its next heartbeat
+        # registers it again
+        cache.delete(PresenceService._member_key(self.chat.id, "channel-1"))
+        self.assertEqual(
+            PresenceService.get_online_user_ids(self.chat.id),
+            [self.other_user.id],
+        )
+        self.assertTrue(
+            PresenceService.refresh(self.chat.id, self.user.id, "channel-1")
+        )
+        self.assertEqual(
+            PresenceService.get_online_user_ids(self.chat.id),
+            sorted([self.user.id, self.other_user.id]),
+        )
+
+    @debug_on_failure
+    def test_failed_flush_keeps_last_seen_buffered(self):
+        PresenceService.record_last_seen(self.chat.id, self.user.id)
+
+        with mock.patch.object(
+            ChatParticipant.objects, "filter", side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                PresenceService.flush_last_seen()
+
+        self.assertEqual(PresenceService.flush_last_seen(), 1)
+        self.participant.refresh_from_db()
+        self.assertIsNotNone(self.participant.last_seen_at)
+        self.assertEqual(PresenceService.flush_last_seen(), 0)
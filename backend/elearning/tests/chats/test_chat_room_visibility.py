@@ -0,0 +1,112 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.utils import timezone
+from elearning.models import ChatParticipant, ChatRoom, Course, User
+from elearning.services.chats import ChatService
+from elearning.tests.test_base import BaseTestCase, debug_on_failure
+
+
+class ChatRoomVisibilityQueryTest(BaseTestCase):
+    """Test the visible-room query on a large synthetic dataset"""
+
+    ROOMS = 2000
+    USERS = 300
+    ROOMS_PER_USER = 40
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            username="teacher", password="testpass123", role="teacher"
+        )
+        self.students = User.objects.bulk_create(
+            User(username=f"student{i}", email=f"s{i}@example.com")
+            for i in range(self.USERS)
+        )
+        courses = Course.objects.bulk_create(
+            Course(title=f"Course {i}", description="-", teacher=self.teacher)
+            for i in range(10)
+        )
+        self.rooms = ChatRoom.objects.bulk_create(
+            ChatRoom(
+                name=f"Room {i}",
+                chat_type="course" if i < len(courses) else "group",
+                course=courses[i] if i < len(courses) else None,
+                created_by=self.teacher,
+                is_public=i % 50 == 0,
+            )
+            for i in range(self.ROOMS)
+        )
+        ChatParticipant.objects.bulk_create(
+            ChatParticipant(
+                chat_room=self.rooms[(i * 7 + j * 13) % self.ROOMS],
+                user=student,
+                # Every fifth membership was left
+                is_active=j % 5 != 0,
+            )
+            for i, student in enumerate(self.students)
+            for j in range(self.ROOMS_PER_USER)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def _expected_ids(self, user):
+        return set(
+            ChatRoom.objects.filter(is_public=True).values_list(
+                "pk", flat=True
+            )
+        ) | set(
+            ChatParticipant.objects.filter(
+                user=user, is_active=True
+            ).values_list("chat_room_id", flat=True)
+        ) | set(
+            ChatRoom.objects.filter(course__teacher=user).values_list(
+                "pk", flat=True
+            )
+        )
+
+    @debug_on_failure
+    def test_visible_rooms_match_each_branch(self):
+        """Public, joined and taught rooms are returned once each"""
+        student = self.students[3]
+        rooms = list(ChatService.get_chat_rooms(student))
+
+        self.assertEqual(len(rooms), len({room.pk for room in rooms}))
+        self.assertEqual(
+            {room.pk for room in rooms}, self._expected_ids(student)
+        )
+        self.assertEqual(
+            set(
+                ChatService.get_chat_rooms(self.teacher).values_list(
+                    "pk", flat=True
+                )
+            ),
+            self._expected_ids(self.teacher),
+        )
+
+    @debug_on_failure
+    def test_deleted_rooms_are_not_visible(self):
+        """Rooms queued for deletion drop out of every branch"""
+        ChatRoom.objects.filter(pk=self.rooms[0].pk).update(
+            deleted_at=timezone.now()
+        )
+        visible = ChatService.get_chat_rooms(self.teacher).values_list(
+            "pk", flat=True
+        )
+        self.assertNotIn(self.rooms[0].pk, set(visible))
+
+    @skipUnless(connection.vendor == "sqlite", "Checks SQLite plan output")
+    @debug_on_failure
+    def test_visible_rooms_plan_uses_indexes(self):
+        """Every branch is an index lookup and no DISTINCT sort is needed"""
+        plan = ChatService.get_chat_rooms(self.students[3]).explain()
+
+        self.assertIn("chat_rooms_public_idx", plan)
+        self.assertIn(
+            "COVERING INDEX chat_partic_user_id_233562_idx (user_id=?)", plan
+        )
+        self.assertIn("courses_teacher_id", plan)
+        self.assertNotIn("FOR DISTINCT", plan)
+        # No branch falls back to reading a whole table
+        for line in plan.splitlines():
+            if " SCAN " in line:
+                self.assertIn("USING INDEX", line)
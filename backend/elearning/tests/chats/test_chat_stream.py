@@ -0,0 +1,154 @@
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import override_settings
+from elearning.models import ChatRoom, User, ChatParticipant
+from elearning.services.chats import ChatWebSocketService
+from elearning_project.asgi import test_application
+from elearning.tests.test_base import BaseTestCase, debug_on_failure
+
+
+@override_settings(PRESENCE_DIFF_WINDOW=0.01)
+class StreamConsumerTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="participant",
+            email="participant@example.com",
+            password="testpass",
+            role="student",
+        )
+        self.other_user = User.objects.create_user(
+            username="other",
+            email="other@example.com",
+            password="testpass",
+            role="student",
+        )
+        self.public_chat = ChatRoom.objects.create(
+            name="Public Chat",
+            created_by=self.user,
+            chat_type="group",
+            is_public=True,
+        )
+        self.private_chat = ChatRoom.objects.create(
+            name="Private Chat",
+            created_by=self.other_user,
+            chat_type="group",
+            is_public=False,
+        )
+        ChatParticipant.objects.create(
+            user=self.other_user, chat_room=self.private_chat
+        )
+
+    async def connect(self, user):
+        comm = WebsocketCommunicator(test_application, "/ws/stream/")
+        comm.scope["user"] = user
+        connected, _ = await comm.connect()
+        self.assertTrue(connected)
+        established = await comm.receive_json_from()
+        self.assertEqual(established["type"], "connection.established")
+        return comm
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_unauthenticated_connection_is_rejected(self):
+        comm = WebsocketCommunicator(test_application, "/ws/stream/")
+        comm.scope["user"] = AnonymousUser()
+        connected, code = await comm.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4001)
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_subscriptions_are_checked_per_stream(self):
+        comm = await self.connect(self.user)
+
+        stream = f"chat:{self.public_chat.id}"
+        await comm.send_json_to({"type": "subscribe", "stream": stream})
+        response = await comm.receive_json_from()
+        self.assertEqual(response["type"], "subscribed")
+        self.assertEqual(response["stream"], stream)
+        self.assertEqual(response["online"], [self.user.id])
+
+        private = f"chat:{self.private_chat.id}"
+        await comm.send_json_to({"type": "subscribe", "stream": private})
+        response = await comm.receive_json_from()
+        self.assertEqual(response["type"], "error")
+        self.assertEqual(response["code"], 403)
+
+        await comm.send_json_to({"type": "subscribe", "stream": "chat:0"})
+        response = await comm.receive_json_from()
+        self.assertEqual(response["code"], 404)
+
+        for name in ("other", "chat:\u00b2", f"chat:0{self.public_chat.id}"):
+            await comm.send_json_to({"type": "subscribe", "stream": name})
+            response = await comm.receive_json_from()
+            self.assertEqual(response["code"], 400)
+            self.assertEqual(response["message"], "Unknown stream")
+
+        # The socket survives malformed names
+        await comm.send_json_to({"type": "heartbeat"})
+        response = await comm.receive_json_from()
+        self.assertEqual(response["type"], "heartbeat_ack")
+        await comm.disconnect()
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_events_are_tagged_with_their_stream(self):
+        comm = await self.connect(self.user)
+        stream = f"chat:{self.public_chat.id}"
+        for name in (stream, "notifications"):
+            await comm.send_json_to({"type": "subscribe", "stream": name})
+            await comm.receive_json_from()
+
+        await sync_to_async(ChatWebSocketService.broadcast_message)(
+            {"id": 1, "chat_room": self.public_chat.id, "content": "hi"},
+            "message_created",
+        )
+        event = await comm.receive_json_from()
+        self.assertEqual(event["type"], "message_created")
+        self.assertEqual(event["stream"], stream)
+        self.assertEqual(event["message"]["content"], "hi")
+
+        await get_channel_layer().group_send(
+            f"notifications_{self.user.id}",
+            {"type": "notification.message", "message": {"id": 7}},
+        )
+        event = await comm.receive_json_from()
+        self.assertEqual(event["type"], "notification")
+        self.assertEqual(event["stream"], "notifications")
+        self.assertEqual(event["notification"], {"id": 7})
+
+        await comm.send_json_to({"type": "unsubscribe", "stream": stream})
+        response = await comm.receive_json_from()
+        self.assertEqual(response["type"], "unsubscribed")
+        await sync_to_async(ChatWebSocketService.broadcast_message)(
+            {"id": 2, "chat_room": self.public_chat.id, "content": "bye"},
+            "message_created",
+        )
+        self.assertTrue(await comm.receive_nothing())
+        await comm.disconnect()
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_resume_requires_subscription(self):
+        comm = await self.connect(self.user)
+        stream = f"chat:{self.public_chat.id}"
+        await comm.send_json_to(
+            {"type": "resume", "stream": stream, "last_seq": 0}
+        )
+        response = await comm.receive_json_from()
+        self.assertEqual(response["type"], "error")
+
+        await comm.send_json_to({"type": "subscribe", "stream": stream})
+        await comm.receive_json_from()
+        await comm.send_json_to(
+            {"type": "resume", "stream": stream, "last_seq": 0}
+        )
+        response = await comm.receive_json_from()
+        self.assertEqual(response["type"], "resume_complete")
+        self.assertEqual(response["stream"], stream)
+        await comm.disconnect()
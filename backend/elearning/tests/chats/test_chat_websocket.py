@@ -1,10 +1,28 @@
+import asyncio
+from unittest import mock
+
+from channels.layers import get_channel_layer
 from channels.testing import WebsocketCommunicator
-from asgiref.sync import async_to_sync
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.test import override_settings
+from elearning.consumers.relay import RoomRelay, relay
 from elearning.models import ChatRoom, User, ChatParticipant
+from elearning.services.chats import ChatService, ChatWebSocketService
 from elearning_project.asgi import test_application
 from elearning.tests.test_base import BaseTestCase, debug_on_failure
 
 
+class _RelayMember:
+    """Stands in for a consumer attached to a relayed room"""
+
+    def __init__(self):
+        self.received = asyncio.Queue()
+
+    async def chat_event(self, message):
+        await self.received.put(message)
+
+
 class ChatWebSocketTestCase(BaseTestCase):
     def setUp(self):
         super().setUp()
@@ -86,3 +104,176 @@ class ChatWebSocketTestCase(BaseTestCase):
         connected2, _ = await comm2.connect()
         self.assertFalse(connected2)  # should be rejected (4003)
         await comm2.disconnect()
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_handshake_close_codes(self):
+        """Missing rooms close with 4004, forbidden rooms with 4003"""
+        comm = WebsocketCommunicator(test_application, "/ws/chat/999999/")
+        comm.scope["user"] = self.participant
+        connected, code = await comm.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4004)
+
+        comm = WebsocketCommunicator(
+            test_application, f"/ws/chat/{self.private_chat.id}/"
+        )
+        comm.scope["user"] = self.other_user
+        connected, code = await comm.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4003)
+
+    @debug_on_failure
+    def test_handshake_room_lookup_is_one_query(self):
+        """The room and the access check are loaded together"""
+        lookup = async_to_sync(ChatService.aget_chat_with_permission_check)
+        with self.assertNumQueries(1):
+            room = lookup(self.private_chat.id, self.participant)
+        self.assertEqual(room.id, self.private_chat.id)
+
+    @debug_on_failure
+    @override_settings(CHAT_RELAY_ENABLED=True)
+    @async_to_sync
+    async def test_relay_fans_out_to_local_consumers(self):
+        """Room events reach every local consumer through one relay"""
+        room_id = self.public_chat.id
+        group_name = f"chat_{room_id}"
+        comms = []
+        for user in (self.participant, self.other_user):
+            comm = WebsocketCommunicator(
+                test_application, f"/ws/chat/{room_id}/"
+            )
+            comm.scope["user"] = user
+            connected, _ = await comm.connect()
+            self.assertTrue(connected)
+            await comm.receive_json_from()  # presence_state
+            comms.append(comm)
+        self.assertEqual(relay.member_count(group_name), 2)
+
+        await sync_to_async(ChatWebSocketService.broadcast_message)(
+            {"id": 1, "chat_room": room_id, "content": "hello"},
+            "message_created",
+        )
+        for comm in comms:
+            event = await comm.receive_json_from()
+            while event["type"] == "presence":
+                event = await comm.receive_json_from()
+            self.assertEqual(event["message"]["content"], "hello")
+
+        for comm in comms:
+            await comm.disconnect()
+        self.assertEqual(relay.member_count(group_name), 0)
+        self.assertNotIn(group_name, relay.rooms)
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_relay_pump_survives_receive_errors(self):
+        """A failed receive is retried instead of ending the room's pump"""
+        room_relay = RoomRelay()
+        room_relay.RETRY_DELAY = 0
+        channel_layer = get_channel_layer()
+        receive = channel_layer.receive
+        failures = [ConnectionError("layer down")]
+
+        async def flaky_receive(channel):
+            if failures:
+                raise failures.pop()
+            return await receive(channel)
+
+        consumer = _RelayMember()
+        with mock.patch.object(channel_layer, "receive", flaky_receive):
+            await room_relay.join("relay_test", consumer)
+            await channel_layer.group_send(
+                "relay_test", {"type": "chat.event", "n": 1}
+            )
+            message = await asyncio.wait_for(consumer.received.get(), 1)
+        self.assertEqual(message["n"], 1)
+
+        await room_relay.leave("relay_test", consumer)
+        self.assertNotIn("relay_test", room_relay.rooms)
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_relay_open_failure_unregisters_room(self):
+        """A room whose group join failed isn't reused by the next join"""
+        room_relay = RoomRelay()
+        channel_layer = get_channel_layer()
+        with mock.patch.object(
+            channel_layer, "group_add", side_effect=ConnectionError
+        ):
+            with self.assertRaises(ConnectionError):
+                await room_relay.join("relay_test", _RelayMember())
+        self.assertNotIn("relay_test", room_relay.rooms)
+
+        consumer = _RelayMember()
+        await room_relay.join("relay_test", consumer)
+        self.assertEqual(room_relay.member_count("relay_test"), 1)
+        await channel_layer.group_send(
+            "relay_test", {"type": "chat.event", "n": 2}
+        )
+        message = await asyncio.wait_for(consumer.received.get(), 1)
+        self.assertEqual(message["n"], 2)
+        await room_relay.leave("relay_test", consumer)
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_resume_replays_missed_events(self):
+        """Reconnecting clients get events after their last seq replayed"""
+        room_id = self.public_chat.id
+        await sync_to_async(cache.clear)()
+        for i in range(3):
+            await sync_to_async(ChatWebSocketService.broadcast_message)(
+                {"id": i, "chat_room": room_id, "content": f"m{i}"},
+                "message_created",
+            )
+
+        comm = WebsocketCommunicator(test_application, f"/ws/chat/{room_id}/")
+        comm.scope["user"] = self.participant
+        connected, _ = await comm.connect()
+        self.assertTrue(connected)
+        await comm.receive_json_from()  # presence_state
+
+        await comm.send_json_to({"type": "resume", "last_seq": 1})
+        replayed = [await comm.receive_json_from() for _ in range(2)]
+        self.assertEqual([e["seq"] for e in replayed], [2, 3])
+        self.assertEqual(replayed[0]["message"]["content"], "m1")
+        done = await comm.receive_json_from()
+        self.assertEqual(done["type"], "resume_complete")
+        self.assertEqual(done["seq"], 3)
+        await comm.disconnect()
+
+    @debug_on_failure
+    @override_settings(CHAT_EVENT_LOG_SIZE=1)
+    @async_to_sync
+    async def test_resume_with_large_gap_requires_resync(self):
+        """Gaps bigger than the replay log fall back to REST"""
+        room_id = self.public_chat.id
+        await sync_to_async(cache.clear)()
+        for i in range(3):
+            await sync_to_async(ChatWebSocketService.broadcast_message)(
+                {"id": i, "chat_room": room_id, "content": f"m{i}"},
+                "message_created",
+            )
+
+        comm = WebsocketCommunicator(test_application, f"/ws/chat/{room_id}/")
+        comm.scope["user"] = self.participant
+        await comm.connect()
+        await comm.receive_json_from()  # presence_state
+
+        await comm.send_json_to({"type": "resume", "last_seq": 0})
+        response = await comm.receive_json_from()
+        self.assertEqual(response["type"], "resync_required")
+        self.assertEqual(response["seq"], 3)
+        await comm.disconnect()
+
+    @debug_on_failure
+    def test_resume_after_sequence_reset_requires_resync(self):
+        """A client ahead of the room's counter can't be replayed to"""
+        room_id = self.public_chat.id
+        cache.clear()
+        ChatWebSocketService.broadcast_message(
+            {"id": 1, "chat_room": room_id, "content": "m1"},
+            "message_created",
+        )
+        self.assertIsNone(ChatWebSocketService.get_events_since(room_id, 5))
+        self.assertEqual(ChatWebSocketService.get_events_since(room_id, 1), [])
@@ -1,7 +1,8 @@
 from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
 from django.utils import timezone
 from rest_framework import status
-from elearning.models import Course, Enrollment
+from elearning.models import ChatParticipant, ChatRoom, Course, Enrollment
 from elearning.tests.test_base import BaseAPITestCase, debug_on_failure
 
 User = get_user_model()
@@ -42,16 +43,66 @@ class CourseEnrollmentViewsTest(BaseAPITestCase):
     # ------------------- ENROLL -------------------
     @debug_on_failure
     def test_student_can_enroll_in_published_course(self):
+        created_flags = []
+
+        def record_created(sender, instance, created, **kwargs):
+            created_flags.append(created)
+
         self.client.force_authenticate(user=self.student)
-        resp = self.log_response(
-            self.client.post(f"/api/courses/{self.course.id}/enrollments/", {})
-        )
+        post_save.connect(record_created, sender=Enrollment)
+        try:
+            resp = self.log_response(
+                self.client.post(
+                    f"/api/courses/{self.course.id}/enrollments/", {}
+                )
+            )
+        finally:
+            post_save.disconnect(record_created, sender=Enrollment)
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(created_flags, [True])
 
         enrollment = Enrollment.objects.get(id=resp.data["id"])
         self.assertEqual(enrollment.course, self.course)
         self.assertEqual(enrollment.user, self.student)
 
+    @debug_on_failure
+    def test_reenrolling_reactivates_existing_enrollment(self):
+        """Enrolling again after leaving reuses the row and course chat"""
+        chat_room = ChatRoom.objects.create(
+            name="Course chat",
+            chat_type="course",
+            course=self.course,
+            created_by=self.teacher,
+        )
+        enrollment = Enrollment.objects.create(
+            user=self.student,
+            course=self.course,
+            is_active=False,
+            unenrolled_at=timezone.now(),
+        )
+        self.client.force_authenticate(user=self.student)
+        resp = self.log_response(
+            self.client.post(f"/api/courses/{self.course.id}/enrollments/", {})
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["id"], enrollment.id)
+
+        enrollment.refresh_from_db()
+        self.assertTrue(enrollment.is_active)
+        self.assertIsNone(enrollment.unenrolled_at)
+        self.assertEqual(Enrollment.objects.count(), 1)
+        self.assertTrue(
+            ChatParticipant.objects.filter(
+                chat_room=chat_room, user=self.student, is_active=True
+            ).exists()
+        )
+
+        # A retry of the same request is rejected, not a constraint error
+        resp = self.client.post(
+            f"/api/courses/{self.course.id}/enrollments/", {}
+        )
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT)
+
     @debug_on_failure
     def test_student_cannot_enroll_in_unpublished_course(self):
         self.client.force_authenticate(user=self.student)
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from django.utils import timezone
 from rest_framework import status
 from elearning.models import Course, CourseFeedback, User, Enrollment
@@ -83,6 +85,24 @@ class CourseFeedbackViewsTestCase(BaseAPITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
 
+    @debug_on_failure
+    def test_concurrent_duplicate_feedback_is_rejected(self):
+        """A duplicate that gets past the policy check keeps the first"""
+        self.client.force_authenticate(user=self.student1)
+        with patch(
+            "elearning.services.courses.course_feedback_service."
+            "CourseFeedbackPolicy.check_can_leave_feedback",
+            return_value=True,
+        ):
+            response = self.client.post(
+                self.feedback_list_url,
+                {"rating": 1, "text": "Racing duplicate feedback"},
+            )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        self.feedback.refresh_from_db()
+        self.assertEqual(self.feedback.rating, 4)
+
     @debug_on_failure
     def test_owner_can_update_and_delete_feedback(self):
         self.client.force_authenticate(user=self.student1)
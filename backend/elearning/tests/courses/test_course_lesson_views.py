@@ -1,3 +1,6 @@
+import time
+from unittest.mock import patch
+
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework import status
 from elearning.models import Course, CourseLesson, Enrollment, User, File
@@ -201,6 +204,87 @@ class CourseLessonViewSetTestCase(BaseAPITestCase):
         )
         self.assertEqual(resp_student.status_code, status.HTTP_200_OK)
 
+    @debug_on_failure
+    def test_lesson_detail_returns_file_metadata_only(self):
+        file = SimpleUploadedFile(
+            "notes.txt", b"lesson notes", content_type="text/plain"
+        )
+        lesson = CourseLesson.objects.create(
+            course=self.course,
+            title="Lesson",
+            description="x",
+            content="x",
+            published_at=timezone.now(),
+            file=File.objects.create(file=file, uploaded_by=self.teacher),
+        )
+        url = f"/api/courses/{self.course.id}/lessons/{lesson.id}/"
+
+        resp = self.log_response(self.client.get(url))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        file_data = resp.data["file"]
+        self.assertIsNone(file_data["file_content"])
+        self.assertEqual(file_data["size"], len(b"lesson notes"))
+        self.assertEqual(file_data["mime_type"], "text/plain")
+        self.assertIn("/api/files/", file_data["download_url"])
+
+        # Small previewable files can be inlined on request
+        resp = self.log_response(
+            self.client.get(f"{url}?include_content=true")
+        )
+        self.assertEqual(resp.data["file"]["file_content"], "bGVzc29uIG5vdGVz")
+
+        with self.settings(LESSON_INLINE_CONTENT_MAX_BYTES=4):
+            resp = self.client.get(f"{url}?include_content=true")
+        self.assertIsNone(resp.data["file"]["file_content"])
+
+        # Preview URL serves the file inline with its mime type
+        resp = self.client.get(resp.data["file"]["preview_url"])
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "text/plain")
+        self.assertTrue(resp["Content-Disposition"].startswith("inline"))
+
+    @debug_on_failure
+    def test_signed_download_url_is_verified_without_db(self):
+        file = SimpleUploadedFile(
+            "doc.pdf", b"filecontent", content_type="application/pdf"
+        )
+        lesson = CourseLesson.objects.create(
+            course=self.course,
+            title="Lesson",
+            description="x",
+            content="x",
+            published_at=timezone.now(),
+            file=File.objects.create(file=file, uploaded_by=self.teacher),
+        )
+        self.client.force_authenticate(user=self.student)
+        resp = self.log_response(
+            self.client.get(
+                f"/api/courses/{self.course.id}/lessons/{lesson.id}/"
+            )
+        )
+        download_url = resp.data["file"]["download_url"]
+
+        # The link itself is the credential: no session and no queries
+        self.client.logout()
+        with self.assertNumQueries(0):
+            resp = self.client.get(download_url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(resp.streaming_content), b"filecontent")
+        self.assertTrue(resp["Content-Disposition"].startswith("attachment"))
+        self.assertIn("max-age=", resp["Cache-Control"])
+
+        # Tampered tokens are rejected
+        resp = self.client.get(download_url.rstrip("/") + "x/")
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+        # Expired tokens are rejected
+        with patch(
+            "elearning.services.courses.course_lesson_service.time.time",
+            return_value=time.time() + 3600,
+        ):
+            resp = self.client.get(download_url)
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
     @debug_on_failure
     def test_download_fails_if_not_enrolled_or_no_file(self):
         lesson = CourseLesson.objects.create(
@@ -9,6 +9,7 @@ from elearning.models import (
     ChatParticipant,
     ChatRoom,
 )
+from elearning.services.courses import CourseStudentRestrictionService
 from elearning.tests.test_base import BaseAPITestCase, debug_on_failure
 
 
@@ -132,6 +133,66 @@ class CourseStudentRestrictionViewsTestCase(BaseAPITestCase):
         self.assertTrue(self.chat_participant2.is_active)
 
 
+    @debug_on_failure
+    def test_global_restriction_effects_use_constant_queries(
+        self, mock_notification
+    ):
+        """Effects are set-based and only touch the courses' own chats"""
+        for i in range(5):
+            course = Course.objects.create(
+                title=f"Extra {i}", teacher=self.teacher1
+            )
+            Enrollment.objects.create(course=course, user=self.student1)
+            room = ChatRoom.objects.create(
+                course=course, chat_type="course", created_by=self.teacher1
+            )
+            ChatParticipant.objects.get_or_create(
+                chat_room=room, user=self.student1
+            )
+        # A non-course room must be left alone
+        group_chat = ChatRoom.objects.create(
+            name="Group", chat_type="group", created_by=self.teacher2
+        )
+        group_participant = ChatParticipant.objects.create(
+            chat_room=group_chat, user=self.student1
+        )
+
+        restriction = StudentRestriction(
+            teacher=self.teacher1, student=self.student1
+        )
+        with self.assertNumQueries(3):
+            CourseStudentRestrictionService.apply_restriction_effects(
+                restriction
+            )
+        self.assertFalse(
+            Enrollment.objects.filter(
+                user=self.student1, is_active=True
+            ).exists()
+        )
+        self.assertEqual(
+            ChatParticipant.objects.filter(
+                user=self.student1, is_active=True
+            ).get(),
+            group_participant,
+        )
+
+        with self.assertNumQueries(3):
+            CourseStudentRestrictionService.remove_restriction_effects(
+                restriction
+            )
+        self.assertEqual(
+            Enrollment.objects.filter(
+                user=self.student1, is_active=True
+            ).count(),
+            7,
+        )
+        self.assertEqual(
+            ChatParticipant.objects.filter(
+                user=self.student1, is_active=True
+            ).count(),
+            8,
+        )
+
     @debug_on_failure
     def test_student_cannot_create_restriction(self, mock_notification):
         """Students cannot create restrictions."""
@@ -1,6 +1,17 @@
+from io import StringIO
+
+from django.core.management import call_command
 from rest_framework import status
 
-from elearning.models import ChatRoom, ChatParticipant, Course, User
+from elearning.models import (
+    ChatMessage,
+    ChatRoom,
+    ChatParticipant,
+    Course,
+    DeletionJob,
+    User,
+)
+from elearning.services import DeletionService
 from elearning.tests.test_base import BaseAPITestCase, debug_on_failure
 
 
@@ -105,6 +116,72 @@ class CourseViewsTestCase(BaseAPITestCase):
         self.assertStatusCode(response, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Course.objects.filter(id=course.id).exists())
 
+    @debug_on_failure
+    def test_course_deletion_is_hidden_then_chunked(self):
+        self.client.force_authenticate(user=self.teacher)
+        response = self.log_response(
+            self.client.post(
+                "/api/courses/",
+                {
+                    "title": "Large Course",
+                    "description": "Desc Longer Than 20 chars",
+                },
+            )
+        )
+        course = Course.objects.get(id=response.data["id"])
+        room = ChatRoom.objects.get(course=course)
+        ChatParticipant.objects.create(chat_room=room, user=self.teacher2)
+        ChatMessage.objects.bulk_create(
+            ChatMessage(chat_room=room, sender=self.teacher, content=f"m{i}")
+            for i in range(5)
+        )
+
+        response = self.log_response(
+            self.client.delete(f"/api/courses/{course.id}/")
+        )
+        self.assertStatusCode(response, status.HTTP_204_NO_CONTENT)
+        # Hidden at once, removed later
+        self.assertFalse(ChatRoom.objects.filter(id=room.id).exists())
+        self.assertTrue(Course.all_objects.filter(id=course.id).exists())
+        response = self.client.get(f"/api/courses/{course.id}/")
+        self.assertStatusCode(response, status.HTTP_404_NOT_FOUND)
+
+        # A failure mid-job keeps the step reached for the next run
+        job = DeletionService.claim_next_job()
+
+        def fail_after_first_chunk(job):
+            raise RuntimeError("worker stopped")
+
+        with self.assertRaises(RuntimeError):
+            DeletionService.run_job(
+                job, chunk_size=2, on_progress=fail_after_first_chunk
+            )
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.progress, {"chat_participants": 2})
+
+        call_command(
+            "run_deletion_jobs",
+            retry_failed=True,
+            chunk_size=2,
+            stdout=StringIO(),
+        )
+        job.refresh_from_db()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(
+            job.progress,
+            {
+                "chat_participants": 2,
+                "chat_messages": 5,
+                "chat_rooms": 1,
+                "courses": 1,
+            },
+        )
+        self.assertFalse(Course.all_objects.filter(id=course.id).exists())
+        self.assertFalse(ChatMessage.objects.exists())
+        self.assertEqual(DeletionJob.objects.count(), 1)
+
     @debug_on_failure
     def test_non_owner_cannot_delete_course(self):
         self.client.force_authenticate(user=self.teacher)
@@ -146,6 +223,26 @@ class CourseViewsTestCase(BaseAPITestCase):
         )
         self.assertStatusCode(response, status.HTTP_403_FORBIDDEN)
 
+    @debug_on_failure
+    def test_async_retrieve_matches_sync(self):
+        course = Course.objects.create(
+            title="Draft Course",
+            description="Desc",
+            teacher=self.teacher,
+            published_at=None,
+        )
+        url = f"/api/async/courses/{course.id}/"
+
+        self.client.force_login(self.teacher2)
+        response = self.log_response(self.client.get(url))
+        self.assertStatusCode(response, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_login(self.teacher)
+        response = self.log_response(self.client.get(url))
+        self.assertStatusCode(response, status.HTTP_200_OK)
+        sync_response = self.client.get(f"/api/courses/{course.id}/")
+        self.assertEqual(response.json(), sync_response.json())
+
     @debug_on_failure
     def test_chatroom_created_with_course(self):
         self.client.force_authenticate(user=self.teacher)
@@ -1,6 +1,34 @@
-from django.contrib.auth import get_user_model
+import base64
+from datetime import timedelta
+from importlib import import_module
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY,
+    HASH_SESSION_KEY,
+    SESSION_KEY,
+    aget_user,
+    get_user,
+    get_user_model,
+)
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
+from elearning.authentication import APITokenAuthMiddleware
+from elearning.models import APIToken
+from elearning.routing import websocket_urlpatterns
+from elearning.services import APITokenService
+from elearning.services.api_token_service import API_TOKEN_CACHE
+from elearning.services.auth_service import AuthService, _HashingPool
 from elearning.tests.test_base import BaseAPITestCase, debug_on_failure
 
 User = get_user_model()
@@ -92,3 +120,303 @@ class AuthenticationTest(BaseAPITestCase):
         )
         self.assertStatusCode(response, status.HTTP_400_BAD_REQUEST)
         self.assertIn("username", response.data)
+
+    @debug_on_failure
+    def test_session_user_is_served_from_cache(self):
+        """Test steady-state session auth does no queries"""
+        cache.clear()
+        User.objects.create_user(
+            username="testuser",
+            email="test@example.com",
+            password="testpass123",
+            role="student",
+        )
+        response = self.log_response(
+            self.client.post(
+                self.login_url,
+                {"email": "test@example.com", "password": "testpass123"},
+            )
+        )
+        self.assertStatusCode(response, status.HTTP_200_OK)
+
+        session_key = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+        request = RequestFactory().get("/")
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore(
+            session_key
+        )
+        # Session and user were both written through on login
+        with self.assertNumQueries(0):
+            user = get_user(request)
+        self.assertEqual(user.email, "test@example.com")
+
+        # request.auser() in async views takes the same cached path
+        with self.assertNumQueries(0):
+            user = async_to_sync(aget_user)(request)
+        self.assertEqual(user.email, "test@example.com")
+
+    @debug_on_failure
+    def test_session_from_model_backend_stays_valid(self):
+        """Test sessions started before the cached backend still work"""
+        user = User.objects.create_user(
+            username="testuser",
+            email="test@example.com",
+            password="testpass123",
+            role="student",
+        )
+        request = RequestFactory().get("/")
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        request.session[SESSION_KEY] = str(user.pk)
+        request.session[BACKEND_SESSION_KEY] = (
+            "django.contrib.auth.backends.ModelBackend"
+        )
+        request.session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+
+        self.assertEqual(get_user(request), user)
+
+
+class APITokenTest(BaseAPITestCase):
+    """Test API token issuance, authentication and revocation"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="apiuser",
+            email="api@example.com",
+            password="testpass123",
+            role="student",
+        )
+
+    def create_token(self, **data):
+        self.client.force_authenticate(user=self.user)
+        response = self.log_response(
+            self.client.post("/api/auth/tokens/", data)
+        )
+        self.assertStatusCode(response, status.HTTP_201_CREATED)
+        self.client.force_authenticate(user=None)
+        return response.data
+
+    @debug_on_failure
+    def test_token_authenticates_and_is_cached(self):
+        data = self.create_token(name="CI")
+        self.assertEqual(data["api_token"]["prefix"], data["token"][:8])
+        stored = APIToken.objects.get(id=data["api_token"]["id"])
+        self.assertNotEqual(stored.token_hash, data["token"])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {data['token']}")
+        response = self.log_response(self.client.get("/api/users/me/"))
+        self.assertStatusCode(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], self.user.id)
+        stored.refresh_from_db()
+        self.assertIsNotNone(stored.last_used_at)
+
+        # Verification is served from memory; only the view queries remain
+        with self.assertNumQueries(0):
+            user, _ = APITokenService.authenticate(data["token"])
+        self.assertEqual(user.id, self.user.id)
+
+        # Each request gets its own instance
+        user._courses_taught_count = 99
+        again, _ = APITokenService.authenticate(data["token"])
+        self.assertIsNot(again, user)
+        self.assertFalse(hasattr(again, "_courses_taught_count"))
+
+        # Deactivation applies without waiting for the local entry
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(APITokenService.authenticate(data["token"]))
+
+    @debug_on_failure
+    def test_revoked_and_expired_tokens_are_rejected(self):
+        data = self.create_token()
+        self.client.force_authenticate(user=self.user)
+        response = self.log_response(
+            self.client.delete(
+                f"/api/auth/tokens/{data['api_token']['id']}/"
+            )
+        )
+        self.assertStatusCode(response, status.HTTP_204_NO_CONTENT)
+        self.client.force_authenticate(user=None)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {data['token']}")
+        response = self.log_response(self.client.get("/api/users/me/"))
+        self.assertStatusCode(response, status.HTTP_401_UNAUTHORIZED)
+
+        token, raw_token = APITokenService.create_token(self.user)
+        APIToken.objects.filter(id=token.id).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        cache.clear()
+        self.assertIsNone(APITokenService.authenticate(raw_token))
+
+    @debug_on_failure
+    def test_unknown_tokens_are_not_cached(self):
+        self.assertIsNone(APITokenService.authenticate("not-a-token"))
+        digest = APITokenService.hash_token("not-a-token")
+        self.assertEqual(API_TOKEN_CACHE.get(digest, default="-"), "-")
+
+    @debug_on_failure
+    def test_basic_auth_is_not_accepted(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Basic "
+            + base64.b64encode(b"apiuser:testpass123").decode()
+        )
+        response = self.log_response(self.client.get("/api/users/me/"))
+        self.assertStatusCode(response, status.HTTP_401_UNAUTHORIZED)
+
+    @debug_on_failure
+    @async_to_sync
+    async def test_websocket_token_auth(self):
+        _, raw_token = await database_sync_to_async(
+            APITokenService.create_token
+        )(self.user)
+        application = APITokenAuthMiddleware(URLRouter(websocket_urlpatterns))
+
+        comm = WebsocketCommunicator(
+            application, f"/ws/notifications/?token={raw_token}"
+        )
+        connected, _ = await comm.connect()
+        self.assertTrue(connected)
+        message = await comm.receive_json_from()
+        self.assertEqual(message["user_id"], self.user.id)
+        await comm.disconnect()
+
+        comm = WebsocketCommunicator(
+            application, "/ws/notifications/?token=invalid"
+        )
+        connected, code = await comm.connect()
+        self.assertFalse(connected)
+
+
+class AsyncAuthTest(BaseAPITestCase):
+    """Test async auth endpoints hashing passwords on the bounded pool"""
+
+    def setUp(self):
+        self.login_url = "/api/auth/async/login/"
+        self.register_url = "/api/auth/async/register/"
+        self.user = User.objects.create_user(
+            username="asyncuser",
+            email="async@example.com",
+            password="testpass123",
+            role="student",
+        )
+
+    @debug_on_failure
+    def test_async_register_and_login(self):
+        response = self.log_response(
+            self.client.post(
+                self.register_url,
+                {
+                    "username": "newuser",
+                    "email": "new@example.com",
+                    "password": "testpass123",
+                    "role": "teacher",
+                },
+                content_type="application/json",
+            )
+        )
+        self.assertStatusCode(response, status.HTTP_201_CREATED)
+        user = User.objects.get(email="new@example.com")
+        self.assertTrue(user.check_password("testpass123"))
+        self.assertIn("_auth_user_id", self.client.session)
+
+        response = self.log_response(
+            self.client.post(
+                self.login_url,
+                {"email": "async@example.com", "password": "wrong"},
+                content_type="application/json",
+            )
+        )
+        self.assertStatusCode(response, status.HTTP_400_BAD_REQUEST)
+
+        response = self.log_response(
+            self.client.post(
+                self.login_url,
+                {"email": "async@example.com", "password": "testpass123"},
+                content_type="application/json",
+            )
+        )
+        self.assertStatusCode(response, status.HTTP_200_OK)
+        self.assertEqual(response.json()["user"]["id"], self.user.id)
+
+    @debug_on_failure
+    def test_legacy_hash_is_upgraded_on_login(self):
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password("testpass123", hasher="pbkdf2_sha256")
+        )
+        response = self.log_response(
+            self.client.post(
+                self.login_url,
+                {"email": "async@example.com", "password": "testpass123"},
+                content_type="application/json",
+            )
+        )
+        self.assertStatusCode(response, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+
+    @debug_on_failure
+    def test_saturated_pool_returns_503(self):
+        with patch.object(_HashingPool, "acquire", return_value=False):
+            response = self.log_response(
+                self.client.post(
+                    self.login_url,
+                    {"email": "async@example.com", "password": "testpass123"},
+                    content_type="application/json",
+                )
+            )
+        self.assertStatusCode(response, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertNotIn("_auth_user_id", self.client.session)
+
+    @debug_on_failure
+    def test_login_errors_match_sync_endpoint(self):
+        for data in (
+            {"email": "async@example.com", "password": "wrong"},
+            {"email": "nobody@example.com", "password": "testpass123"},
+        ):
+            expected = self.client.post(
+                "/api/auth/login/", data, content_type="application/json"
+            )
+            with patch(
+                "elearning.services.auth_service.make_password",
+                wraps=make_password,
+            ) as hashed:
+                response = self.log_response(
+                    self.client.post(
+                        self.login_url, data, content_type="application/json"
+                    )
+                )
+            self.assertStatusCode(response, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.json(), expected.json())
+
+        # Unknown emails still pay for a hash
+        self.assertEqual(response.json(), {"email": ["User does not exist"]})
+        hashed.assert_called_once_with("testpass123")
+
+    @debug_on_failure
+    def test_concurrent_duplicate_registration_returns_400(self):
+        run_hashing = AuthService.run_hashing
+
+        async def register_first(func, *args):
+            # Another request takes the email after validation passed
+            await User.objects.acreate(
+                username="racer", email="race@example.com"
+            )
+            return await run_hashing(func, *args)
+
+        with patch.object(AuthService, "run_hashing", register_first):
+            response = self.log_response(
+                self.client.post(
+                    self.register_url,
+                    {
+                        "username": "newuser",
+                        "email": "race@example.com",
+                        "password": "testpass123",
+                        "role": "student",
+                    },
+                    content_type="application/json",
+                )
+            )
+        self.assertStatusCode(response, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.json())
+        self.assertFalse(User.objects.filter(username="newuser").exists())
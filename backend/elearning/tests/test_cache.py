@@ -0,0 +1,131 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import transaction
+
+from elearning import metrics
+from elearning.cache import CacheNamespace
+from elearning.models import Course, Enrollment, User
+from elearning.services.courses.course_service import (
+    COURSE_STATS_CACHE,
+    CourseService,
+)
+from elearning.tests.test_base import BaseTestCase, debug_on_failure
+
+
+class CacheNamespaceTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        metrics.reset()
+        self.namespace = CacheNamespace("test_ns", ttl=60)
+        self.calls = 0
+
+    def loader(self):
+        self.calls += 1
+        return {"value": self.calls}
+
+    @debug_on_failure
+    def test_get_or_set_computes_once(self):
+        first = self.namespace.get_or_set((1,), self.loader)
+        second = self.namespace.get_or_set((1,), self.loader)
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(metrics.get_counter("cache.test_ns.misses"), 1)
+        self.assertEqual(metrics.get_counter("cache.test_ns.hits"), 1)
+
+    @debug_on_failure
+    def test_invalidate_single_key_and_namespace(self):
+        self.namespace.get_or_set((1,), self.loader)
+        self.namespace.get_or_set((2,), self.loader)
+
+        self.namespace.invalidate(1)
+        self.namespace.get_or_set((1,), self.loader)
+        self.namespace.get_or_set((2,), self.loader)
+        self.assertEqual(self.calls, 3)
+
+        self.namespace.invalidate_all()
+        self.namespace.get_or_set((2,), self.loader)
+        self.assertEqual(self.calls, 4)
+
+    @debug_on_failure
+    def test_locked_key_serves_previous_value(self):
+        self.namespace.get_or_set((1,), self.loader)
+        key = self.namespace.make_key(1)
+        # Force an early refresh while another worker holds the lock
+        value, _, expires_at = cache.get(key)
+        cache.set(key, (value, 1000.0, expires_at), 60)
+        cache.add(f"{key}:lock", "other-worker", 10)
+
+        # Pin XFetch's random draw so the early refresh always triggers
+        with mock.patch("elearning.cache.random.random", return_value=0.5):
+            result = self.namespace.get_or_set((1,), self.loader)
+        self.assertEqual(result, value)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(metrics.get_counter("cache.test_ns.stale_served"), 1)
+
+    @debug_on_failure
+    def test_cached_decorator(self):
+        @self.namespace.cached(key=lambda x: x)
+        def double(x):
+            self.calls += 1
+            return x * 2
+
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(3), 6)
+        self.assertEqual(self.calls, 2)
+
+
+class CourseStatsCacheTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.teacher = User.objects.create_user(
+            username="teacher",
+            email="teacher@example.com",
+            password="testpass",
+            role="teacher",
+        )
+        self.student = User.objects.create_user(
+            username="student",
+            email="student@example.com",
+            password="testpass",
+            role="student",
+        )
+        self.course = Course.objects.create(
+            title="Cached Course",
+            description="Description",
+            teacher=self.teacher,
+        )
+
+    @debug_on_failure
+    def test_stats_are_cached_and_invalidated_by_signals(self):
+        stats = CourseService.get_course_stats(self.course.id)
+        self.assertEqual(stats["enrollment_count"], 0)
+
+        with self.assertNumQueries(0):
+            CourseService.get_course_stats(self.course.id)
+
+        Enrollment.objects.create(course=self.course, user=self.student)
+        stats = CourseService.get_course_stats(self.course.id)
+        self.assertEqual(stats["enrollment_count"], 1)
+        self.assertEqual(stats["total_enrollments"], 1)
+
+    @debug_on_failure
+    def test_entries_refilled_before_commit_are_dropped(self):
+        CourseService.get_course_stats(self.course.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Enrollment.objects.create(
+                    course=self.course, user=self.student
+                )
+                # A concurrent reader refills the key from pre-commit rows
+                COURSE_STATS_CACHE.set(
+                    (self.course.id,), {"enrollment_count": 0}
+                )
+
+        self.assertIsNone(COURSE_STATS_CACHE.get(self.course.id))
+        stats = CourseService.get_course_stats(self.course.id)
+        self.assertEqual(stats["enrollment_count"], 1)
@@ -0,0 +1,84 @@
+import importlib.util
+import os
+import runpy
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.db import connections
+
+from elearning import metrics
+from elearning.db_pool import pool_stats
+from elearning.tests.test_base import BaseTestCase, debug_on_failure
+
+
+class PoolStatsTest(BaseTestCase):
+    """Test pool stats reported through the metrics snapshot"""
+
+    @debug_on_failure
+    def test_unpooled_databases_report_nothing(self):
+        self.assertEqual(pool_stats(), {})
+        self.assertEqual(metrics.snapshot()["db_pools"], {})
+
+    @debug_on_failure
+    def test_pooled_alias_reports_checkouts_waits_and_timeouts(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {
+            "pool_min": 2,
+            "pool_max": 20,
+            "pool_size": 5,
+            "pool_available": 3,
+            "requests_waiting": 0,
+            "requests_num": 120,
+            "requests_queued": 7,
+            "requests_wait_ms": 35,
+            "requests_errors": 1,
+        }
+        with mock.patch.object(
+            type(connections["default"]), "pool", pool, create=True
+        ):
+            stats = metrics.snapshot()["db_pools"]
+
+        self.assertEqual(stats["default"]["checkouts"], 120)
+        self.assertEqual(stats["default"]["waits"], 7)
+        self.assertEqual(stats["default"]["wait_ms"], 35)
+        self.assertEqual(stats["default"]["timeouts"], 1)
+        self.assertEqual(stats["default"]["available"], 3)
+        # Counters psycopg hasn't incremented yet are reported as zero
+        self.assertEqual(stats["default"]["connections_lost"], 0)
+
+
+class PoolSettingsTest(BaseTestCase):
+    """Test the pool options built for PostgreSQL databases"""
+
+    def _postgres_databases(self):
+        with mock.patch.dict(
+            os.environ, {"DATABASE_URL": "postgres://app:pw@db:5432/app"}
+        ):
+            return runpy.run_path(
+                str(settings.BASE_DIR / "elearning_project" / "settings.py")
+            )["DATABASES"]
+
+    @debug_on_failure
+    def test_health_checks_are_left_to_django(self):
+        database = self._postgres_databases()["default"]
+        # Django passes check= to the pool itself when health checks are on
+        self.assertTrue(database["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("check", database["OPTIONS"]["pool"])
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+
+    @debug_on_failure
+    @skipUnless(
+        importlib.util.find_spec("psycopg_pool"), "Needs psycopg_pool"
+    )
+    def test_pool_is_built_from_settings(self):
+        from django.db.backends.postgresql.base import DatabaseWrapper
+
+        database = self._postgres_databases()["default"]
+        database["OPTIONS"]["pool"]["min_size"] = 0
+        wrapper = DatabaseWrapper(
+            {**connections["default"].settings_dict, **database},
+            alias="pool_test",
+        )
+        pool = wrapper.pool
+        self.addCleanup(wrapper.close_pool)
+        self.assertIsNotNone(pool._check)
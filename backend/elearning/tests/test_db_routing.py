@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.conf import settings
+from django.db import connections
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from elearning.db_routing import ReplicaRouter, use_primary, use_replica
+from elearning.models import Status, User
+from .test_base import BaseAPITestCase, BaseTestCase, debug_on_failure
+
+
+class ReplicaRouterTest(BaseTestCase):
+    """Test routing decisions of the replica router"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    @debug_on_failure
+    def test_reads_use_replica_only_inside_block(self):
+        with mock.patch(
+            "elearning.db_routing.replica_alias", return_value="replica"
+        ):
+            self.assertIsNone(self.router.db_for_read(Status))
+            with use_replica():
+                self.assertEqual(self.router.db_for_read(Status), "replica")
+                self.assertEqual(self.router.db_for_write(Status), "default")
+                with use_primary():
+                    self.assertIsNone(self.router.db_for_read(Status))
+            self.assertIsNone(self.router.db_for_read(Status))
+
+    @debug_on_failure
+    def test_without_replica_reads_stay_on_default(self):
+        self.assertNotIn(settings.DATABASE_REPLICA_ALIAS, settings.DATABASES)
+        with use_replica():
+            self.assertIsNone(self.router.db_for_read(Status))
+
+
+class ReplicaReadViewTest(BaseAPITestCase):
+    """Test replica opt-in viewsets and read-your-writes stickiness"""
+
+    @classmethod
+    def setUpClass(cls):
+        # A replica alias mirroring the test database, as configured with
+        # TEST={"MIRROR": "default"}. It shares the default connection so
+        # it sees rows written inside each test's transaction, and is
+        # added here rather than in settings so other tests keep reading
+        # from default
+        default = connections["default"].settings_dict
+        settings.DATABASES["replica"] = {
+            **default,
+            "TEST": {**default["TEST"], "MIRROR": "default"},
+        }
+        connections["replica"] = connections["default"]
+        cls.databases = {"default", "replica"}
+        cls.addClassCleanup(cls._remove_replica)
+        super().setUpClass()
+
+    @classmethod
+    def _remove_replica(cls):
+        del connections["replica"]
+        del settings.DATABASES["replica"]
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser",
+            email="test@example.com",
+            password="testpass123",
+            role="student",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("elearning:status-list")
+
+        # Record where each read is routed
+        self.routed = []
+        db_for_read = ReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            alias = db_for_read(router, model, **hints)
+            self.routed.append(alias)
+            return alias
+
+        patcher = mock.patch.object(ReplicaRouter, "db_for_read", record)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @debug_on_failure
+    def test_safe_requests_read_from_replica(self):
+        response = self.log_response(self.client.get(self.url))
+        self.assertStatusCode(response, status.HTTP_200_OK)
+        self.assertIn("replica", self.routed)
+        self.assertNotIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+
+    @debug_on_failure
+    def test_write_pins_client_to_primary(self):
+        response = self.log_response(
+            self.client.post(self.url, {"content": "Fresh status"})
+        )
+        self.assertStatusCode(response, status.HTTP_201_CREATED)
+        self.assertIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+
+        # The client sends the cookie back and reads its own write
+        self.routed.clear()
+        response = self.log_response(self.client.get(self.url))
+        self.assertStatusCode(response, status.HTTP_200_OK)
+        self.assertTrue(self.routed)
+        self.assertNotIn("replica", self.routed)
+        self.assertEqual(
+            response.data["results"][0]["content"], "Fresh status"
+        )
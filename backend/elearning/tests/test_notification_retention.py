@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from elearning import metrics
+from elearning.models import Notification, User
+from elearning.services import NotificationService
+from .test_base import BaseTestCase, debug_on_failure
+
+
+class NotificationRetentionTest(BaseTestCase):
+    """Test the notification retention policy and batched pruning"""
+
+    def setUp(self):
+        metrics.reset()
+        self.heavy = User.objects.create_user(
+            username="heavy", email="heavy@example.com", password="pass"
+        )
+        self.light = User.objects.create_user(
+            username="light", email="light@example.com", password="pass"
+        )
+        self.now = timezone.now()
+
+    def _notify(self, user, days_ago, is_read=True):
+        notification = Notification.objects.create(
+            user=user,
+            title=f"{days_ago} days ago",
+            message="-",
+            action_url="/",
+            is_read=is_read,
+        )
+        Notification.objects.filter(pk=notification.pk).update(
+            created_at=self.now - timedelta(days=days_ago)
+        )
+        return notification
+
+    @debug_on_failure
+    def test_expired_notifications_pruned_unless_unread(self):
+        old_read = self._notify(self.light, 120)
+        old_unread = self._notify(self.light, 120, is_read=False)
+        recent = self._notify(self.light, 5)
+
+        stats = NotificationService.prune_notifications(
+            max_age_days=90, batch_size=1
+        )
+
+        self.assertEqual(stats, {"expired": 1, "over_limit": 0})
+        remaining = set(Notification.objects.values_list("pk", flat=True))
+        self.assertEqual(remaining, {old_unread.pk, recent.pk})
+        self.assertNotIn(old_read.pk, remaining)
+        self.assertEqual(
+            metrics.get_counter("notifications.pruned_expired"), 1
+        )
+
+    @debug_on_failure
+    def test_per_user_limit_keeps_newest(self):
+        heavy = [self._notify(self.heavy, day) for day in range(10)]
+        unread = self._notify(self.heavy, 30, is_read=False)
+        light = [self._notify(self.light, day) for day in range(3)]
+
+        stats = NotificationService.prune_notifications(
+            max_age_days=None, max_per_user=4, batch_size=2
+        )
+
+        # The six oldest read notifications go; unread ones stay
+        self.assertEqual(stats, {"expired": 0, "over_limit": 6})
+        self.assertEqual(
+            set(
+                Notification.objects.filter(user=self.heavy).values_list(
+                    "pk", flat=True
+                )
+            ),
+            {n.pk for n in heavy[:4]} | {unread.pk},
+        )
+        self.assertEqual(
+            Notification.objects.filter(user=self.light).count(), len(light)
+        )
+
+    @debug_on_failure
+    def test_zero_per_user_limit_prunes_all_read(self):
+        self._notify(self.heavy, 1)
+        unread = self._notify(self.heavy, 2, is_read=False)
+
+        stats = NotificationService.prune_notifications(
+            max_age_days=None, max_per_user=0
+        )
+
+        self.assertEqual(stats, {"expired": 0, "over_limit": 1})
+        self.assertEqual(
+            list(Notification.objects.values_list("pk", flat=True)),
+            [unread.pk],
+        )
+
+    @debug_on_failure
+    def test_command_reports_pruned_rows(self):
+        for day in range(3):
+            self._notify(self.heavy, 100 + day, is_read=False)
+
+        out = StringIO()
+        call_command(
+            "prune_notifications",
+            max_age_days=90,
+            include_unread=True,
+            stdout=out,
+        )
+
+        self.assertIn("Pruned 3 notifications", out.getvalue())
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(
+            metrics.snapshot()["gauges"]["notifications.pruned_last_run"], 3
+        )
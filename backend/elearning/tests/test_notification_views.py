@@ -68,6 +68,22 @@ class NotificationViewSetTest(BaseAPITestCase):
         self.assertIn(self.notification2.id, notification_ids)
         self.assertNotIn(self.notification3.id, notification_ids)
 
+    @debug_on_failure
+    def test_async_list_matches_sync_list(self):
+        """Test the async notification list returns the same page"""
+        response = self.log_response(
+            self.client.get("/api/async/notifications/")
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_login(self.user1)
+        sync_response = self.client.get(self.list_url)
+        response = self.log_response(
+            self.client.get("/api/async/notifications/")
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), sync_response.json())
+
     @debug_on_failure
     def test_mark_notification_as_read(self):
         """Test marking a single notification as read"""
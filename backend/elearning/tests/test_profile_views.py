@@ -1,6 +1,20 @@
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APIClient
+from elearning.models import (
+    ChatMessage,
+    ChatParticipant,
+    ChatRoom,
+    Course,
+    Enrollment,
+    Notification,
+)
+from elearning.services import DeletionService, UserService
+from elearning.services.courses.course_service import (
+    COURSE_STATS_CACHE,
+    CourseService,
+)
+from elearning.services.user_service import USER_STATS_CACHE
 from elearning.tests.test_base import BaseAPITestCase, debug_on_failure
 
 
@@ -120,3 +134,119 @@ class UserProfileTest(BaseAPITestCase):
         self.assertStatusCode(response, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["last_name"], "Smith")
+
+    @debug_on_failure
+    def test_profile_retrieval_query_count_is_constant(self):
+        """Profile retrieval does not scale with the number of users"""
+        for i in range(5):
+            User.objects.create_user(
+                username=f"filler{i}",
+                email=f"filler{i}@example.com",
+                password="testpass123",
+            )
+        Course.objects.create(
+            title="Course", description="Description", teacher=self.other_user
+        )
+
+        # The user, then their counts on a cold stats cache
+        with self.assertNumQueries(2):
+            response = self.log_response(self.client.get(self.other_user_url))
+        self.assertStatusCode(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["courses_taught_count"], 1)
+        self.assertEqual(response.data["courses_enrolled_count"], 0)
+
+        with self.assertNumQueries(1):
+            response = self.log_response(self.client.get(self.other_user_url))
+        self.assertEqual(response.data["courses_taught_count"], 1)
+
+        with self.assertNumQueries(1):
+            response = self.log_response(self.client.get(self.profile_url))
+        self.assertStatusCode(response, status.HTTP_200_OK)
+
+    @debug_on_failure
+    def test_reassigned_course_drops_both_teachers_counts(self):
+        course = Course.objects.create(
+            title="Course", description="Description", teacher=self.other_user
+        )
+        new_teacher = User.objects.create_user(
+            username="newteacher",
+            email="newteacher@example.com",
+            password="testpass123",
+            role="teacher",
+        )
+        for user in (self.other_user, new_teacher):
+            UserService.get_user_counts(user.pk)
+
+        course = Course.objects.get(pk=course.pk)
+        course.teacher = new_teacher
+        course.save()
+
+        self.assertIsNone(USER_STATS_CACHE.get(self.other_user.pk))
+        self.assertIsNone(USER_STATS_CACHE.get(new_teacher.pk))
+        self.assertEqual(
+            UserService.get_user_counts(self.other_user.pk)[
+                "courses_taught_count"
+            ],
+            0,
+        )
+
+    @debug_on_failure
+    def test_deleted_user_is_hidden_then_removed(self):
+        course = Course.objects.create(
+            title="Teacher Course",
+            description="Description",
+            teacher=self.other_user,
+        )
+        room = ChatRoom.objects.create(
+            name="Group", chat_type="group", created_by=self.user
+        )
+        Enrollment.objects.create(course=course, user=self.user)
+        ChatParticipant.objects.create(chat_room=room, user=self.other_user)
+        course_room = ChatRoom.objects.create(
+            course=course, chat_type="course", created_by=self.other_user
+        )
+        message = ChatMessage.objects.create(
+            chat_room=course_room, sender=self.user, content="hi"
+        )
+        Notification.objects.create(
+            user=self.user, title="t", message="m", action_url="/"
+        )
+
+        UserService.delete_user(self.user, self.user)
+        response = self.log_response(self.client.get(self.users_list_url))
+        usernames = [u["username"] for u in response.data["results"]]
+        self.assertEqual(usernames, ["otheruser"])
+
+        job = DeletionService.claim_next_job()
+        DeletionService.run_job(job, chunk_size=1)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(ChatRoom.all_objects.filter(pk=room.pk).exists())
+        # Messages in rooms the user didn't own survive without a sender
+        message.refresh_from_db()
+        self.assertIsNone(message.sender)
+        self.assertTrue(Course.objects.filter(pk=course.pk).exists())
+
+    @debug_on_failure
+    def test_deleting_teacher_drops_cached_course_stats(self):
+        course = Course.objects.create(
+            title="Teacher Course",
+            description="Description",
+            teacher=self.other_user,
+        )
+        Enrollment.objects.create(course=course, user=self.user)
+        CourseService.get_course_stats(course.pk)
+        UserService.get_user_counts(self.user.pk)
+        self.assertIsNotNone(COURSE_STATS_CACHE.get(course.pk))
+        self.assertIsNotNone(USER_STATS_CACHE.get(self.user.pk))
+
+        DeletionService.schedule_user_deletion(self.other_user)
+
+        self.assertIsNone(COURSE_STATS_CACHE.get(course.pk))
+        # The student's enrolled count skips the now hidden course
+        self.assertIsNone(USER_STATS_CACHE.get(self.user.pk))
+        self.assertEqual(
+            UserService.get_user_counts(self.user.pk)[
+                "courses_enrolled_count"
+            ],
+            0,
+        )
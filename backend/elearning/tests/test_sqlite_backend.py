@@ -0,0 +1,93 @@
+import os
+import tempfile
+import threading
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connections
+
+from elearning.tests.test_base import BaseTestCase, debug_on_failure
+
+IS_SQLITE = connections["default"].vendor == "sqlite"
+
+
+@skipUnless(IS_SQLITE, "SQLite concurrency mode")
+class SQLiteConcurrencyTest(BaseTestCase):
+    """Test the SQLite backend's pragmas and write serialization"""
+
+    def _connection(self, path):
+        settings_dict = {
+            **connections["default"].settings_dict,
+            "NAME": path,
+        }
+        return type(connections["default"])(settings_dict, alias="tmp")
+
+    @debug_on_failure
+    def test_pragmas_applied_on_connect(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            wrapper = self._connection(os.path.join(tmp, "db.sqlite3"))
+            with wrapper.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                self.assertEqual(cursor.fetchone()[0], "wal")
+                cursor.execute("PRAGMA synchronous")
+                # NORMAL
+                self.assertEqual(cursor.fetchone()[0], 1)
+            self.assertEqual(wrapper.transaction_mode, "IMMEDIATE")
+            wrapper.close()
+
+    @debug_on_failure
+    def test_autocommit_write_waits_for_open_transaction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "db.sqlite3")
+            first = self._connection(path)
+            with first.cursor() as cursor:
+                cursor.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+
+            first.set_autocommit(
+                False, force_begin_transaction_with_broken_autocommit=True
+            )
+            self.assertTrue(first.holds_writer_lock)
+
+            events = []
+
+            def write():
+                second = self._connection(path)
+                with second.cursor() as cursor:
+                    # Reads don't queue behind the writer
+                    cursor.execute("SELECT COUNT(*) FROM t")
+                    events.append("read")
+                    cursor.execute("INSERT INTO t DEFAULT VALUES")
+                    events.append("write")
+                second.close()
+
+            thread = threading.Thread(target=write)
+            thread.start()
+            thread.join(timeout=0.3)
+            self.assertEqual(events, ["read"])
+
+            with first.cursor() as cursor:
+                cursor.execute("INSERT INTO t DEFAULT VALUES")
+            first.commit()
+            first.set_autocommit(True)
+            self.assertFalse(first.holds_writer_lock)
+            thread.join()
+            self.assertEqual(events, ["read", "write"])
+            first.close()
+
+    @debug_on_failure
+    @skipUnless(
+        os.environ.get("RUN_BENCHMARKS"),
+        "Timing dependent; set RUN_BENCHMARKS=1 to run",
+    )
+    def test_concurrent_writers_hit_no_lock_errors(self):
+        out = StringIO()
+        call_command(
+            "benchmark_sqlite_writes",
+            writers=8,
+            readers=2,
+            rate=200,
+            seconds=1,
+            stdout=out,
+        )
+        self.assertRegex(out.getvalue(), r"(?m)^0 lock errors")
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.test import override_settings
+
+from elearning.models import File
+from elearning.services import StorageGCService
+from elearning.tests.test_base import BaseTestCase, debug_on_failure
+
+
+User = get_user_model()
+
+
+class StorageGCTest(BaseTestCase):
+    """Test sweeping unreferenced files from private storage"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.storage = FileSystemStorage(location=self.tmp.name)
+        patcher = mock.patch.object(
+            StorageGCService, "_storage", return_value=self.storage
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        settings_override = override_settings(
+            STORAGE_GC_CHECKPOINT_FILE=os.path.join(
+                self.tmp.name, ".gc_checkpoint.json"
+            )
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.teacher = User.objects.create_user(
+            username="teacher", password="testpass123", role="teacher"
+        )
+        self.live = self._write("course_materials/a/live.txt", age=7200)
+        File.objects.create(
+            file=self.live, original_name="live.txt", uploaded_by=self.teacher
+        )
+        self.old = self._write("course_materials/a/old.txt", age=7200)
+        self.recent = self._write("course_materials/a/recent.txt", age=0)
+        self.other = self._write("course_materials/b/old.txt", age=7200)
+
+    def _write(self, name, age):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(name)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return name
+
+    @debug_on_failure
+    def test_dry_run_reports_without_deleting(self):
+        """A dry run lists orphans past the grace period and keeps them"""
+        orphans = []
+        stats = StorageGCService.sweep(
+            dry_run=True,
+            grace_seconds=3600,
+            on_orphan=lambda name, size, deleted: orphans.append(name),
+        )
+
+        self.assertEqual(sorted(orphans), [self.old, self.other])
+        self.assertEqual(stats["scanned"], 4)
+        self.assertEqual(stats["live"], 1)
+        self.assertEqual(stats["recent"], 1)
+        self.assertEqual(stats["deleted"], 0)
+        for name in (self.live, self.old, self.recent, self.other):
+            self.assertTrue(self.storage.exists(name))
+
+    @debug_on_failure
+    def test_sweep_deletes_only_old_orphans(self):
+        """Referenced and recent files survive a sweep"""
+        stats = StorageGCService.sweep(grace_seconds=3600)
+
+        self.assertEqual(stats["deleted"], 2)
+        self.assertTrue(stats["complete"])
+        self.assertTrue(self.storage.exists(self.live))
+        self.assertTrue(self.storage.exists(self.recent))
+        self.assertFalse(self.storage.exists(self.old))
+        self.assertFalse(self.storage.exists(self.other))
+
+    @debug_on_failure
+    def test_sweep_resumes_from_checkpoint(self):
+        """A sweep cut short by max_files continues where it stopped"""
+        first = StorageGCService.sweep(grace_seconds=3600, max_files=1)
+
+        self.assertFalse(first["complete"])
+        self.assertEqual(first["scanned"], 3)
+        self.assertEqual(
+            StorageGCService.load_checkpoint(), ("course_materials", "a")
+        )
+        self.assertTrue(self.storage.exists(self.other))
+
+        second = StorageGCService.sweep(grace_seconds=3600, max_files=1)
+
+        self.assertTrue(second["complete"])
+        self.assertEqual(second["scanned"], 1)
+        self.assertFalse(self.storage.exists(self.other))
+        self.assertIsNone(StorageGCService.load_checkpoint())
@@ -0,0 +1,154 @@
+"""
+Single-statement upserts for the eLearning platform.
+
+Hot write paths (enrolling, joining chats) used to read the row first
+and then create or save it. That costs several round trips
+and, under concurrent requests, lets two callers both see "no row" and
+collide on the unique constraint. ``upsert`` instead writes with
+``INSERT ... ON CONFLICT (...) ... RETURNING`` (SQLite 3.35+ and
+PostgreSQL), so repeating the call is harmless.
+
+Example:
+    >>> participant = upsert(
+    ...     ChatParticipant,
+    ...     match={"chat_room": room, "user": user},
+    ...     values={"role": "participant", "is_active": True},
+    ...     update_fields=["is_active"],
+    ... )
+"""
+
+from typing import Iterable, Optional
+
+from django.db import connections, router
+from django.db.models.signals import post_save
+
+
+def _convert(row, fields, table, connection):
+    """Turn raw column values into Python values, as a query would"""
+    values = []
+    for field, value in zip(fields, row):
+        col = field.get_col(table)
+        converters = connection.ops.get_db_converters(
+            col
+        ) + col.get_db_converters(connection)
+        for converter in converters:
+            value = converter(value, col, connection)
+        values.append(value)
+    return values
+
+
+def upsert(
+    model,
+    match: dict,
+    values: dict,
+    update_fields: Optional[Iterable[str]] = None,
+):
+    """
+    Insert a row, or update the existing row with the same ``match``.
+
+    Args:
+        model: Model class; ``match`` must cover one of its unique
+            constraints
+        match: Field values identifying the row
+        values: Field values for a new row
+        update_fields: Fields overwritten on an existing row (default:
+            every key of ``values``)
+
+    Returns:
+        The model instance as stored. An existing row keeps its own
+        values for fields outside ``match`` and ``update_fields``; the
+        statement returns them with ``RETURNING``.
+
+    ``post_save`` is sent afterwards, with the stored values, so cache
+    invalidation and other receivers still run. On PostgreSQL one
+    statement both writes and reports whether the row was inserted.
+    Other backends first try ``INSERT ... ON CONFLICT DO NOTHING`` and
+    only update when that inserted nothing.
+    """
+    update_fields = list(values if update_fields is None else update_fields)
+    using = router.db_for_write(model)
+    connection = connections[using]
+    opts = model._meta
+    qn = connection.ops.quote_name
+    table = opts.db_table
+
+    instance = model(**match, **values)
+    fields = [
+        field
+        for field in opts.concrete_fields
+        if field is not opts.auto_field or instance.pk is not None
+    ]
+    params = [
+        field.get_db_prep_save(field.pre_save(instance, True), connection)
+        for field in fields
+    ]
+    updated = [opts.get_field(name) for name in update_fields]
+    returned = opts.concrete_fields
+
+    insert_sql = "INSERT INTO %s (%s) VALUES (%s) ON CONFLICT (%s)" % (
+        qn(table),
+        ", ".join(qn(field.column) for field in fields),
+        ", ".join(["%s"] * len(fields)),
+        ", ".join(qn(opts.get_field(name).column) for name in match),
+    )
+    returning_sql = "RETURNING %s" % ", ".join(
+        qn(field.column) for field in returned
+    )
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # xmax is 0 only on a row version this statement inserted
+            cursor.execute(
+                "%s DO UPDATE SET %s %s, xmax = 0"
+                % (
+                    insert_sql,
+                    ", ".join(
+                        "%s = EXCLUDED.%s" % (qn(f.column), qn(f.column))
+                        for f in updated
+                    ),
+                    returning_sql,
+                ),
+                params,
+            )
+            *row, created = cursor.fetchone()
+        else:
+            update_sql = "UPDATE %s SET %s WHERE %s %s" % (
+                qn(table),
+                ", ".join("%s = %%s" % qn(f.column) for f in updated),
+                " AND ".join(
+                    "%s = %%s" % qn(opts.get_field(name).column)
+                    for name in match
+                ),
+                returning_sql,
+            )
+            update_params = [params[fields.index(f)] for f in updated] + [
+                params[fields.index(opts.get_field(name))] for name in match
+            ]
+            row = None
+            while row is None:
+                cursor.execute(
+                    "%s DO NOTHING %s" % (insert_sql, returning_sql), params
+                )
+                row = cursor.fetchone()
+                created = row is not None
+                if not created:
+                    # Retried if the row is deleted between the statements
+                    cursor.execute(update_sql, update_params)
+                    row = cursor.fetchone()
+
+    for field, value in zip(
+        returned, _convert(row, returned, table, connection)
+    ):
+        setattr(instance, field.attname, value)
+    instance._state.adding = False
+    instance._state.db = using
+
+    post_save.send(
+        sender=model,
+        instance=instance,
+        created=created,
+        update_fields=None if created else frozenset(update_fields),
+        raw=False,
+        using=using,
+    )
+    return instance
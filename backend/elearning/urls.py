@@ -34,6 +34,7 @@ router.register(
     courses.CourseStudentRestrictionViewSet, 
     basename="restriction"
 )
+router.register(r"metrics", views.MetricsViewSet, basename="metrics")
 
 # =============================================================================
 # NESTED ROUTERS - Course-specific endpoints
@@ -67,7 +68,31 @@ chats_router.register(
 # URL PATTERNS - Include all router URLs
 # =============================================================================
 urlpatterns = [
+    # Async auth endpoints hashing passwords off the event loop
+    path("auth/async/login/", views.async_login, name="async-login"),
+    path("auth/async/register/", views.async_register, name="async-register"),
+    # Async-native read endpoints mirroring the hottest DRF reads
+    path(
+        "async/chats/<int:chat_room_id>/messages/",
+        views.async_chat_messages,
+        name="async-chat-messages",
+    ),
+    path(
+        "async/notifications/",
+        views.async_notifications,
+        name="async-notifications",
+    ),
+    path(
+        "async/courses/<int:course_id>/",
+        views.async_course_detail,
+        name="async-course-detail",
+    ),
     path("", include(router.urls)),  # Main API endpoints
     path("", include(courses_router.urls)),  # Course-related nested endpoints
     path("", include(chats_router.urls)),  # Chat-related nested endpoints
+    path(
+        "files/<str:token>/",
+        views.signed_file_download,
+        name="signed-file-download",
+    ),
 ]
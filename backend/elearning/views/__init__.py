@@ -3,10 +3,25 @@ from .auth_views import AuthViewSet
 from .status_views import StatusViewSet
 from .user_views import UserViewSet
 from .notification_views import NotificationViewSet
+from .metrics_views import MetricsViewSet
+from .file_views import signed_file_download
+from .async_auth_views import async_login, async_register
+from .async_views import (
+    async_chat_messages,
+    async_notifications,
+    async_course_detail,
+)
 
 __all__ = [
     "AuthViewSet",
     "StatusViewSet",
     "UserViewSet",
     "NotificationViewSet",
+    "MetricsViewSet",
+    "signed_file_download",
+    "async_login",
+    "async_register",
+    "async_chat_messages",
+    "async_notifications",
+    "async_course_detail",
 ]
@@ -0,0 +1,121 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from elearning.exceptions import ServiceError
+from elearning.serializers import (
+    UserReadOnlySerializer,
+    UserRegistrationSerializer,
+)
+from elearning.services import AuthService
+
+
+def _request_data(request) -> dict:
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError:
+            raise ServiceError.bad_request("Invalid JSON body")
+    return request.POST.dict()
+
+
+def _error_response(error: ServiceError, field=None) -> JsonResponse:
+    # Credential and uniqueness errors are field errors on the DRF views
+    if field is None or error.status_code not in (400, 409):
+        return JsonResponse(
+            {"detail": error.message}, status=error.status_code
+        )
+    return JsonResponse({field: [error.message]}, status=error.status_code)
+
+
+# Like the DRF auth endpoints, these accept unauthenticated POSTs without a
+# CSRF token
+@csrf_exempt
+@require_POST
+async def async_login(request):
+    """
+    Async login endpoint
+
+    Same contract as ``/api/auth/login/``, but password verification runs on
+    the bounded hashing pool instead of the request thread.
+
+    **Response:**
+    - 200: Login successful, returns user data
+    - 400: Invalid credentials, with the same error fields as the sync
+      endpoint
+    - 503: Hashing pool saturated or timed out; retry later
+    """
+    try:
+        data = _request_data(request)
+    except ServiceError as e:
+        return _error_response(e)
+
+    email = data.get("email")
+    password = data.get("password")
+    if not email or not password:
+        return JsonResponse(
+            {"non_field_errors": ["Must include email and password"]},
+            status=400,
+        )
+
+    try:
+        user = await AuthService.aauthenticate(email, password)
+        await AuthService.alogin(request, user)
+    except ServiceError as e:
+        field = "email" if e.code == "unknown_email" else "non_field_errors"
+        return _error_response(e, field)
+
+    return JsonResponse(
+        {
+            "message": "Login successful",
+            "user": UserReadOnlySerializer(user).data,
+        }
+    )
+
+
+@csrf_exempt
+@require_POST
+async def async_register(request):
+    """
+    Async registration endpoint
+
+    Same contract as ``/api/auth/register/``, with the password hashed on
+    the bounded hashing pool.
+
+    **Response:**
+    - 201: User registered successfully, returns user data
+    - 400: Invalid data, including a username or email taken by a
+      concurrent registration
+    - 503: Hashing pool saturated or timed out; retry later
+    """
+    try:
+        data = _request_data(request)
+    except ServiceError as e:
+        return _error_response(e)
+
+    serializer = UserRegistrationSerializer(data=data)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=400)
+
+    try:
+        user = await AuthService.aregister(serializer.validated_data)
+        await AuthService.alogin(request, user)
+    except ServiceError as e:
+        if e.status_code == 409:
+            # Lost a race with a concurrent registration; validating again
+            # reports the taken field the way the sync endpoint does
+            serializer = UserRegistrationSerializer(data=data)
+            if not await sync_to_async(serializer.is_valid)():
+                return JsonResponse(serializer.errors, status=400)
+        return _error_response(e, "non_field_errors")
+
+    return JsonResponse(
+        {
+            "message": "User registered successfully",
+            "user": UserReadOnlySerializer(user).data,
+        },
+        status=201,
+    )
@@ -0,0 +1,148 @@
+"""
+Async-native read endpoints.
+
+Hot read paths served on Django's async ORM, so under an ASGI server they
+don't hop through the sync thread pool like the DRF viewsets do. Responses
+match the corresponding DRF endpoints.
+"""
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from elearning.authentication import aget_request_user
+from elearning.exceptions import ServiceError
+from elearning.serializers import NotificationReadOnlySerializer
+from elearning.serializers.chats import ChatMessageReadOnlySerializer
+from elearning.serializers.courses import CourseReadOnlySerializer
+from elearning.services import NotificationService
+from elearning.services.chats import ChatMessagesService
+from elearning.services.chats.chat_messages_service import ChatHistory
+from elearning.services.courses import CourseService
+
+
+def _error_response(error: ServiceError) -> JsonResponse:
+    return JsonResponse({"detail": error.message}, status=error.status_code)
+
+
+def _not_authenticated() -> JsonResponse:
+    return JsonResponse(
+        {"detail": "Authentication credentials were not provided."},
+        status=401,
+    )
+
+
+async def _apaginate(request, queryset, serializer_class) -> dict:
+    """
+    Page a queryset or ChatHistory like DRF's PageNumberPagination,
+    asynchronously
+    """
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        page = 0
+    count = await queryset.acount()
+    last_page = max(1, -(-count // page_size))
+    if page < 1 or page > last_page:
+        raise ServiceError.not_found("Invalid page.")
+
+    offset = (page - 1) * page_size
+    if isinstance(queryset, ChatHistory):
+        items = await queryset.aslice(offset, offset + page_size)
+    else:
+        items = [obj async for obj in queryset[offset : offset + page_size]]
+
+    url = request.build_absolute_uri()
+    next_url = None
+    if page < last_page:
+        next_url = replace_query_param(url, "page", page + 1)
+    previous_url = None
+    if page > 1:
+        previous_url = (
+            remove_query_param(url, "page")
+            if page == 2
+            else replace_query_param(url, "page", page - 1)
+        )
+    return {
+        "count": count,
+        "next": next_url,
+        "previous": previous_url,
+        "results": serializer_class(items, many=True).data,
+    }
+
+
+@require_GET
+async def async_chat_messages(request, chat_room_id):
+    """
+    Async chat message list
+
+    Same contract as ``GET /api/chats/{chat_room_pk}/messages/``, including
+    the ``updated_since`` delta filter.
+    """
+    user = await aget_request_user(request)
+    try:
+        updated_since = None
+        raw_since = request.GET.get("updated_since")
+        if raw_since:
+            updated_since = parse_datetime(raw_since)
+            if updated_since is None:
+                raise ServiceError.bad_request(
+                    "updated_since must be an ISO 8601 datetime"
+                )
+
+        messages = await ChatMessagesService(
+            chat_room_id
+        ).aget_chat_messages(
+            user, updated_since=updated_since, include_archived=True
+        )
+        data = await _apaginate(
+            request, messages, ChatMessageReadOnlySerializer
+        )
+    except ServiceError as e:
+        return _error_response(e)
+    return JsonResponse(data)
+
+
+@require_GET
+async def async_notifications(request):
+    """
+    Async notification list
+
+    Same contract as ``GET /api/notifications/``.
+    """
+    user = await aget_request_user(request)
+    if not user.is_authenticated:
+        return _not_authenticated()
+
+    try:
+        # Building the queryset does not query; _apaginate evaluates it
+        notifications = NotificationService.get_user_notifications(user)
+        data = await _apaginate(
+            request, notifications, NotificationReadOnlySerializer
+        )
+    except ServiceError as e:
+        return _error_response(e)
+    return JsonResponse(data)
+
+
+@require_GET
+async def async_course_detail(request, course_id):
+    """
+    Async course detail
+
+    Same contract as ``GET /api/courses/{id}/``.
+    """
+    user = await aget_request_user(request)
+    try:
+        course = await CourseService.aget_course_with_permission_check(
+            course_id, user
+        )
+        course = await CourseService.apopulate_course_computed_fields(
+            course, user
+        )
+    except ServiceError as e:
+        return _error_response(e)
+    return JsonResponse(CourseReadOnlySerializer(course).data)
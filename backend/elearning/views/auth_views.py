@@ -15,7 +15,11 @@ from elearning.serializers.user_serializers import UserReadOnlySerializer
 from elearning.serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
+    APITokenReadOnlySerializer,
+    APITokenCreateSerializer,
 )
+from elearning.authentication import SESSION_BACKEND
+from elearning.services import APITokenService, UserService
 from django.middleware.csrf import get_token
 from django.views.decorators.cache import never_cache
 from django.utils.decorators import method_decorator
@@ -37,11 +41,15 @@ class AuthViewSet(viewsets.GenericViewSet):
             return UserRegistrationSerializer
         elif self.action == "login":
             return UserLoginSerializer
+        elif self.action == "tokens":
+            if self.request.method == "POST":
+                return APITokenCreateSerializer
+            return APITokenReadOnlySerializer
         return UserReadOnlySerializer
 
     def get_serializer(self, *args, **kwargs):
         """Override to handle logout action without serializer"""
-        if self.action == "logout":
+        if self.action in ["logout", "revoke_token"]:
             return None
         return super().get_serializer(*args, **kwargs)
 
@@ -101,7 +109,8 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        login(request, user)
+        login(request, user, backend=SESSION_BACKEND)
+        UserService.cache_auth_user(user)
         return Response(
             {
                 "message": "User registered successfully",
@@ -164,7 +173,9 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
-        login(request, user)
+        login(request, user, backend=SESSION_BACKEND)
+        # login() saves last_login, which evicts the cached user; refill it
+        UserService.cache_auth_user(user)
         return Response(
             {
                 "message": "Login successful",
@@ -210,6 +221,7 @@ class AuthViewSet(viewsets.GenericViewSet):
         }
         ```
         """
+        # Flushes the session from both the cache and the DB
         logout(request)
         return Response(
             {"message": "Logout successful"}, status=status.HTTP_200_OK
@@ -281,3 +293,93 @@ class AuthViewSet(viewsets.GenericViewSet):
             },
             status=status.HTTP_200_OK,
         )
+
+    @extend_schema(
+        methods=["GET"],
+        responses={200: APITokenReadOnlySerializer(many=True)},
+    )
+    @extend_schema(
+        methods=["POST"],
+        request=APITokenCreateSerializer,
+        responses={
+            201: inline_serializer(
+                name="APITokenCreateResponse",
+                fields={
+                    "token": serializers.CharField(
+                        help_text="Plain token, only shown once"
+                    ),
+                    "api_token": APITokenReadOnlySerializer(),
+                },
+            ),
+        },
+        examples=[
+            OpenApiExample(
+                "Success Response",
+                value={
+                    "token": "q3Jx0b2Wn8...",
+                    "api_token": {
+                        "id": 1,
+                        "name": "CI",
+                        "prefix": "q3Jx0b2W",
+                        "created_at": "2025-01-01T00:00:00Z",
+                        "expires_at": None,
+                        "last_used_at": None,
+                    },
+                },
+                response_only=True,
+                status_codes=["201"],
+            ),
+        ],
+    )
+    @action(detail=False, methods=["get", "post"])
+    def tokens(self, request):
+        """
+        API tokens endpoint
+
+        Lists the current user's active API tokens or creates a new one.
+        Tokens are sent as ``Authorization: Bearer <token>``, or as
+        ``?token=<token>`` when opening a websocket.
+
+        **Request Body (POST):**
+        - name: Optional label for the token
+        - expires_in_days: Optional lifetime in days
+
+        **Response:**
+        - 200: List of tokens (GET)
+        - 201: Token created, the plain token is only returned once (POST)
+        """
+        if request.method == "GET":
+            tokens = APITokenService.get_user_tokens(request.user)
+            return Response(APITokenReadOnlySerializer(tokens, many=True).data)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token, raw_token = APITokenService.create_token(
+            request.user, **serializer.validated_data
+        )
+        return Response(
+            {
+                "token": raw_token,
+                "api_token": APITokenReadOnlySerializer(token).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(responses={204: None})
+    @action(
+        detail=False,
+        methods=["delete"],
+        url_path=r"tokens/(?P<token_id>\d+)",
+    )
+    def revoke_token(self, request, token_id=None):
+        """
+        Revoke API token endpoint
+
+        Revokes one of the current user's API tokens.
+
+        **Response:**
+        - 204: Token revoked
+        - 404: Token not found
+        """
+        APITokenService.revoke_token(request.user, int(token_id))
+        return Response(status=status.HTTP_204_NO_CONTENT)
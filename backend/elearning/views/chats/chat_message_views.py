@@ -9,13 +9,16 @@ from drf_spectacular.utils import (
 )
 from drf_spectacular.types import OpenApiTypes
 from rest_framework import serializers
+from django.utils.dateparse import parse_datetime
 
+from elearning.exceptions import ServiceError
 from elearning.serializers.chats import (
     ChatMessageReadOnlySerializer,
     ChatMessageWriteSerializer,
 )
 from elearning.services.chats.chat_messages_service import ChatMessagesService
 from elearning.permissions.chats import ChatMessagePermission
+from elearning.db_routing import ReplicaReadMixin
 from elearning.models import ChatMessage
 from elearning.services.chats import (
     ChatWebSocketService,
@@ -25,6 +28,17 @@ from elearning.services.chats import (
 @extend_schema(
     tags=["Chat Messages"],
     parameters=[
+        OpenApiParameter(
+            name="updated_since",
+            type=OpenApiTypes.DATETIME,
+            location=OpenApiParameter.QUERY,
+            required=False,
+            description=(
+                "Only return messages created or edited since this time. "
+                "Deleted messages are not reported; after a websocket "
+                "resync_required, reload the list without this filter"
+            ),
+        ),
         OpenApiParameter(
             name="chat_room_pk",
             type=OpenApiTypes.INT,
@@ -39,7 +53,7 @@ from elearning.services.chats import (
         ),
     ],
 )
-class ChatMessageViewSet(viewsets.ModelViewSet):
+class ChatMessageViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for chat messages with automatic pagination and filtering.
     Inherits from ModelViewSet to get all CRUD operations and pagination
@@ -60,11 +74,30 @@ class ChatMessageViewSet(viewsets.ModelViewSet):
 
         chat_room_id = self.kwargs["chat_room_pk"]
 
+        # Delta query for edits and new messages; it can't report
+        # deletions, so websocket resyncs reload the full list instead
+        updated_since = None
+        raw_since = self.request.query_params.get("updated_since")
+        if self.action == "list" and raw_since:
+            updated_since = parse_datetime(raw_since)
+            if updated_since is None:
+                raise ServiceError.bad_request(
+                    "updated_since must be an ISO 8601 datetime"
+                )
+
         # Check permissions and get messages via service
         # Service will raise ServiceError if permission denied,
         # which DRF handles
+        # History pages continue into archived messages; a custom
+        # ?ordering= needs a queryset, so it only sees hot ones
+        include_archived = (
+            self.action == "list"
+            and "ordering" not in self.request.query_params
+        )
         messages = ChatMessagesService(chat_room_id).get_chat_messages(
-            self.request.user
+            self.request.user,
+            updated_since=updated_since,
+            include_archived=include_archived,
         )
         return messages
 
@@ -80,6 +80,20 @@ class CourseLessonViewSet(viewsets.ModelViewSet):
             return CourseLessonWriteSerializer
         return CourseLessonReadOnlySerializer
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="include_content",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Inline small previewable files as base64 in "
+                    "file.file_content"
+                ),
+            ),
+        ],
+    )
     def retrieve(self, request, *args, **kwargs):
         """Override retrieve to use service for permission checking"""
         lesson_id = kwargs.get("pk")
@@ -184,6 +198,18 @@ class CourseLessonViewSet(viewsets.ModelViewSet):
         CourseLessonService.delete_lesson_with_file(instance, user)
 
     @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="inline",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Set to 1 to serve previewable files inline with their "
+                    "mime type instead of as an attachment"
+                ),
+            ),
+        ],
         responses={
             200: inline_serializer(
                 name="FileDownloadResponse",
@@ -210,13 +236,19 @@ class CourseLessonViewSet(viewsets.ModelViewSet):
             int(lesson_id), request.user
         )
 
-        # Return file for download
-        file_path = file_obj.file.path
-        filename = file_obj.original_name
+        # Previewable files may be displayed inline (iframe/img previews)
+        inline = (
+            request.query_params.get("inline") == "1"
+            and file_obj.is_previewable
+        )
+        content_type = (
+            file_obj.mime_type if inline else "application/octet-stream"
+        )
 
-        # Let FileResponse handle the file opening/closing
-        response = FileResponse(
-            open(file_path, "rb"), content_type="application/octet-stream"
+        # Let FileResponse stream the file and handle opening/closing
+        return FileResponse(
+            file_obj.file.open("rb"),
+            content_type=content_type,
+            as_attachment=not inline,
+            filename=file_obj.original_name,
         )
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
@@ -10,6 +10,7 @@ from drf_spectacular.utils import (
 from drf_spectacular.types import OpenApiTypes
 from rest_framework import serializers
 
+from elearning.db_routing import ReplicaReadMixin
 from elearning.models import Course
 from elearning.permissions.courses.course_permissions import CoursePermission
 from elearning.serializers.courses import (
@@ -57,7 +58,7 @@ class CourseFilter(filters.FilterSet):
         ),
     ],
 )
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """ViewSet for course operations"""
 
     # Enable built-in filtering, search, ordering
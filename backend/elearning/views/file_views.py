@@ -0,0 +1,42 @@
+import time
+
+from django.http import FileResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from elearning.exceptions import ServiceError
+from elearning.models import File
+from elearning.services.courses import CourseLessonService
+
+
+@require_GET
+def signed_file_download(request, token):
+    """
+    Serve a lesson file from a signed download token.
+
+    The token is minted by the lesson detail endpoint after its permission
+    check, so this view only verifies the signature and never touches the
+    session or the database. Responses may be cached until the token
+    expires.
+    """
+    try:
+        payload = CourseLessonService.resolve_file_download_token(token)
+    except ServiceError as e:
+        return JsonResponse({"detail": e.message}, status=e.status_code)
+
+    storage = File._meta.get_field("file").storage
+    try:
+        handle = storage.open(payload["p"], "rb")
+    except FileNotFoundError:
+        return JsonResponse({"detail": "File not found"}, status=404)
+
+    # Previewable files may be displayed inline (iframe/img previews)
+    inline = request.GET.get("inline") == "1" and payload["v"]
+    response = FileResponse(
+        handle,
+        content_type=payload["m"] if inline else "application/octet-stream",
+        as_attachment=not inline,
+        filename=payload["n"],
+    )
+    max_age = max(0, payload["e"] - int(time.time()))
+    response["Cache-Control"] = f"public, max-age={max_age}, immutable"
+    return response
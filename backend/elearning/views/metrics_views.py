@@ -0,0 +1,44 @@
+from rest_framework import viewsets
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import serializers
+
+from elearning import metrics
+
+
+@extend_schema(tags=["Metrics"])
+class MetricsViewSet(viewsets.ViewSet):
+    """
+    ViewSet exposing in-process metrics of the worker serving the request.
+    Only staff users can read metrics.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        responses={
+            200: inline_serializer(
+                name="MetricsResponse",
+                fields={
+                    "counters": serializers.DictField(
+                        child=serializers.IntegerField()
+                    ),
+                    "gauges": serializers.DictField(
+                        child=serializers.FloatField()
+                    ),
+                },
+            ),
+        },
+    )
+    def list(self, request):
+        """
+        Get metrics snapshot
+
+        Returns counters, gauges and registered collector stats.
+
+        **Response:**
+        - 200: Metrics snapshot
+        - 403: Not a staff user
+        """
+        return Response(metrics.snapshot())
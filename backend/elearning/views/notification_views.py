@@ -9,6 +9,7 @@ from drf_spectacular.utils import (
 from drf_spectacular.types import OpenApiTypes
 from rest_framework import serializers
 
+from elearning.db_routing import ReplicaReadMixin
 from elearning.models import Notification
 from elearning.permissions import NotificationPermission
 from elearning.serializers import NotificationReadOnlySerializer
@@ -26,7 +27,7 @@ from elearning.services.notification_service import NotificationService
         ),
     ],
 )
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for user notifications.
     Users can only view their own notifications.
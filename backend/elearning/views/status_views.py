@@ -7,6 +7,7 @@ from drf_spectacular.utils import (
 from drf_spectacular.types import OpenApiTypes
 from rest_framework.response import Response
 
+from elearning.db_routing import ReplicaReadMixin
 from elearning.models import Status
 from elearning.permissions import StatusPermission
 from elearning.serializers import (
@@ -51,7 +52,7 @@ class StatusFilter(filters.FilterSet):
         ),
     ],
 )
-class StatusViewSet(viewsets.ModelViewSet):
+class StatusViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for status updates
 
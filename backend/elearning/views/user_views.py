@@ -153,9 +153,8 @@ class UserViewSet(ModelViewSet):
         - 404: User not found
         """
         username = kwargs.get("pk")
-        user = UserService.get_user_by_username(username)
-
-        # Populate computed fields before serialization
-        user = UserService.populate_user_computed_fields(user)
+        # One user lookup; the counts come from USER_STATS_CACHE, which
+        # costs a version read and queries only on a miss
+        user = UserService.get_user_with_computed_fields(username)
         serializer = self.get_serializer(user)
         return Response(serializer.data)
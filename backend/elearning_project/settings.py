@@ -57,6 +57,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",  # CSRF protection
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "elearning.db_routing.ReplicaStickinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -94,6 +95,64 @@ DATABASES = {
     )
 }
 
+# Optional read replica for viewsets using ReplicaReadMixin, e.g. a copy
+# of db.sqlite3 locally or a streaming Postgres standby. Tests run against
+# the primary only.
+DATABASE_REPLICA_ALIAS = "replica"
+if os.environ.get("DATABASE_REPLICA_URL") and not ENVIRONMENT_PREFIX:
+    DATABASES[DATABASE_REPLICA_ALIAS] = dj_database_url.parse(
+        os.environ["DATABASE_REPLICA_URL"], conn_max_age=600
+    )
+DATABASE_ROUTERS = ["elearning.db_routing.ReplicaRouter"]
+# Seconds a client reads from the primary after a write, so it sees its
+# own writes despite replication lag
+REPLICA_STICKY_SECONDS = 5
+REPLICA_STICKY_COOKIE = "db_primary"
+
+# Pooled connections on PostgreSQL (psycopg 3). Persistent connections
+# (CONN_MAX_AGE) don't survive under ASGI, where each request and each
+# database_sync_to_async call runs in a new context, so connections are
+# checked out of a per-process pool instead. Keep DB_POOL_MAX_SIZE at
+# least ASGI_THREADS so sync threads don't queue for a connection. With
+# CONN_HEALTH_CHECKS Django has the pool check each connection as it is
+# handed out.
+for _database in DATABASES.values():
+    if _database["ENGINE"] == "django.db.backends.postgresql":
+        _database["CONN_MAX_AGE"] = 0
+        _database["CONN_HEALTH_CHECKS"] = True
+        _database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 20)),
+            # Seconds to wait for a free connection before failing
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            "max_idle": 300,
+            "max_lifetime": 1800,
+        }
+
+# SQLite concurrency mode: WAL lets reads run alongside the single writer,
+# writers wait (timeout) instead of failing with "database is locked",
+# BEGIN IMMEDIATE takes the write lock up front so transactions can't
+# deadlock upgrading from a read, and the backend queues this process's
+# writers on one lock
+SQLITE_INIT_COMMAND = ";".join(
+    [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA cache_size=-20000",
+    ]
+)
+for _database in DATABASES.values():
+    if _database["ENGINE"] == "django.db.backends.sqlite3":
+        _database["ENGINE"] = "elearning.backends.sqlite3"
+        _database.setdefault("OPTIONS", {}).update(
+            {
+                "init_command": SQLITE_INIT_COMMAND,
+                "timeout": 20,
+                "transaction_mode": "IMMEDIATE",
+            }
+        )
+
 # -----------------------------
 # Password validation
 # -----------------------------
@@ -139,6 +198,31 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 PRIVATE_MEDIA_ROOT = BASE_DIR / f"{ENVIRONMENT_PREFIX}private_media"
+# Largest previewable file that may be inlined as base64 on request
+LESSON_INLINE_CONTENT_MAX_BYTES = 256 * 1024
+# Lifetime in seconds of signed lesson file download links
+FILE_DOWNLOAD_TOKEN_TTL = 300
+# Unreferenced private files younger than this are never swept, so
+# uploads whose File row isn't committed yet survive
+STORAGE_GC_GRACE_SECONDS = 24 * 3600
+STORAGE_GC_CHECKPOINT_FILE = PRIVATE_MEDIA_ROOT / ".gc_checkpoint.json"
+# Chat messages older than this move to the archive table; history reads
+# page across both
+CHAT_ARCHIVE_AFTER_DAYS = int(os.environ.get("CHAT_ARCHIVE_AFTER_DAYS", 180))
+CHAT_ARCHIVE_BATCH_SIZE = 1000
+# Notification retention, enforced by prune_notifications. An empty
+# environment value sets a limit to None, which disables that rule. Unread
+# notifications are kept unless NOTIFICATION_KEEP_UNREAD is off
+NOTIFICATION_MAX_AGE_DAYS = os.environ.get("NOTIFICATION_MAX_AGE_DAYS", "90")
+NOTIFICATION_MAX_AGE_DAYS = (
+    int(NOTIFICATION_MAX_AGE_DAYS) if NOTIFICATION_MAX_AGE_DAYS else None
+)
+NOTIFICATION_MAX_PER_USER = os.environ.get("NOTIFICATION_MAX_PER_USER", "500")
+NOTIFICATION_MAX_PER_USER = (
+    int(NOTIFICATION_MAX_PER_USER) if NOTIFICATION_MAX_PER_USER else None
+)
+NOTIFICATION_KEEP_UNREAD = True
+NOTIFICATION_PRUNE_BATCH_SIZE = 1000
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -167,12 +251,70 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Presence tracking (seconds)
+PRESENCE_TTL = 60
+PRESENCE_DIFF_WINDOW = 1.0
+PRESENCE_FLUSH_INTERVAL = 30
+PRESENCE_LOCK_WAIT = 3.0  # before a presence update is given up
+
+# Ephemeral chat events (typing, read receipts, pings)
+EPHEMERAL_RATE = 2.0  # events per second per user per room
+EPHEMERAL_BURST = 5
+EPHEMERAL_DEBOUNCE = 3.0  # seconds an identical state is suppressed
+EPHEMERAL_MAX_IN_FLIGHT = 100
+
+# Chat event replay log for websocket resume
+CHAT_EVENT_LOG_SIZE = 200  # max events replayed per resume
+CHAT_EVENT_LOG_TTL = 600  # seconds an event stays replayable
+
+# Multiplexed websocket (ws/stream/)
+STREAM_MAX_SUBSCRIPTIONS = 100  # per connection
+
+# Fan chat room events out through one relay channel per worker process
+# per room instead of one channel layer message per member
+CHAT_RELAY_ENABLED = False
+
+# Background deletion of courses, chat rooms and users
+DELETION_CHUNK_SIZE = 500  # rows per transaction
+DELETION_JOB_LEASE = 300  # seconds before a stalled job can be reclaimed
+
+# Per-connection websocket outbound queue
+WEBSOCKET_OUTBOUND_QUEUE_SIZE = 256  # frames
+WEBSOCKET_SLOW_SEND_SECONDS = 1.0  # sends slower than this are counted
+
+# API tokens: per-worker cache of verified tokens
+API_TOKEN_LOCAL_CACHE_TTL = 30  # seconds a revoked token may still work
+API_TOKEN_LOCAL_CACHE_SIZE = 1024
+
+# -----------------------------
+# Cache
+# -----------------------------
+# Shares the Redis instance used by the channel layer so every worker sees
+# the same cache; tests use a process-local stand-in.
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "elearning-tests",
+        }
+        if "test" in sys.argv
+        else {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get(
+                "REDIS_URL", "redis://127.0.0.1:6379"
+            ),
+            "KEY_PREFIX": f"{ENVIRONMENT_PREFIX}elearning",
+            "TIMEOUT": 300,
+        }
+    ),
+}
+
 # -----------------------------
 # REST Framework
 # -----------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.BasicAuthentication",
+        "elearning.authentication.APITokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PAGINATION_CLASS": (
@@ -213,6 +355,28 @@ CRISPY_TEMPLATE_PACK = "tailwind"
 # -----------------------------
 AUTH_USER_MODEL = "elearning.User"
 
+# scrypt is preferred; older PBKDF2 hashes are upgraded on next login
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
+# Bounded pool used by the async auth endpoints for password hashing
+PASSWORD_HASH_WORKERS = 4
+PASSWORD_HASH_QUEUE = 16  # calls allowed to wait for a worker
+PASSWORD_HASH_TIMEOUT = 5  # seconds
+
+# Session users are loaded through the shared cache instead of the DB.
+# ModelBackend stays listed so sessions started before the cached backend
+# was introduced remain valid
+AUTHENTICATION_BACKENDS = [
+    "elearning.authentication.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
 # -----------------------------
 # CORS & CSRF
 # -----------------------------
@@ -236,6 +400,9 @@ CSRF_COOKIE_SECURE = not DEBUG  # Use secure cookies in production
 CSRF_COOKIE_DOMAIN = None  # Let Django set the domain automatically
 CSRF_COOKIE_PATH = "/"  # Available on all paths
 
+# Sessions are read from the shared cache and written through to the DB
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
 # Session Cookie Settings
 # Lax for dev, None for prod
 SESSION_COOKIE_SAMESITE = "Lax" if DEBUG else "None"
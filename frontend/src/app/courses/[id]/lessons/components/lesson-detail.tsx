@@ -30,6 +30,13 @@ export function LessonDetail({ lesson, courseId, isTeacher = false }: LessonDeta
     }
   };
 
+  // Inline content is only present when explicitly requested, otherwise
+  // the preview is streamed from the lesson download endpoint
+  const getPreviewSrc = (mimeType: string) =>
+    lesson.file?.file_content
+      ? `data:${mimeType};base64,${lesson.file.file_content}`
+      : lesson.file?.preview_url;
+
   const handlePublishLesson = async () => {
     try {
       setIsLoading(true);
@@ -227,7 +234,7 @@ export function LessonDetail({ lesson, courseId, isTeacher = false }: LessonDeta
                 <div className="p-4">
                   {lesson.file.original_name.toLowerCase().includes(".pdf") ? (
                     <iframe
-                      src={`data:application/pdf;base64,${lesson.file.file_content}`}
+                      src={getPreviewSrc("application/pdf")}
                       className="w-full h-96 border-0"
                       title={`Preview of ${lesson.file.original_name}`}
                     />
@@ -235,13 +242,13 @@ export function LessonDetail({ lesson, courseId, isTeacher = false }: LessonDeta
                       .toLowerCase()
                       .match(/\.(jpg|jpeg|png|gif|webp)$/i) ? (
                     <img
-                      src={`data:image/jpeg;base64,${lesson.file.file_content}`}
+                      src={getPreviewSrc(lesson.file.mime_type ?? "image/jpeg")}
                       alt={lesson.file.original_name}
                       className="max-w-full h-auto max-h-96 mx-auto"
                     />
                   ) : lesson.file.original_name.toLowerCase().match(/\.(txt|md|html)$/i) ? (
                     <iframe
-                      src={`data:text/html;base64,${lesson.file.file_content}`}
+                      src={getPreviewSrc("text/plain")}
                       className="w-full h-96 border-0"
                       title={`Preview of ${lesson.file.original_name}`}
                     />
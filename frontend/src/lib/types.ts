@@ -26,8 +26,11 @@ export type File = {
   id: number;
   original_name: string;
   is_previewable: boolean;
+  mime_type?: string;
+  size?: number | null;
   download_url?: string;
-  file_content?: string;
+  preview_url?: string | null;
+  file_content?: string | null;
 };
 
 export type CourseLesson = {